@@ -0,0 +1,84 @@
+# ---
+# Purpose: Account sessions - one KIS account's connection, rate limit and local history
+# Contents: discover_secret_files (secretN.json written by create_secret.py), AccountSession, adopt_legacy_history
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import re
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from pl_engine import PLEngine
+from transaction_store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+_SECRET_FILE_PATTERN = re.compile(r"^secret(\d*)\.json$")
+
+
+def discover_secret_files(directory: Union[str, Path] = ".") -> List[Path]:
+    """
+    Secret files in a directory: secret1.json, secret2.json, ... by numeric index,
+    or the legacy single-account secret.json when no numbered file exists
+    """
+    numbered = []
+    legacy = None
+    for path in Path(directory).glob("secret*.json"):
+        match = _SECRET_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        if match.group(1):
+            numbered.append((int(match.group(1)), path))
+        else:
+            legacy = path
+    if numbered:
+        return [path for _, path in sorted(numbered)]
+    return [legacy] if legacy else []
+
+
+class AccountSession:
+    """
+    Everything tied to one account: its PyKis session, a FetchEngine (KIS rate limits are per app key),
+    its own transaction store and P&L series, and the last good positions/balance it returned
+    """
+
+    def __init__(self, secret_path: Union[str, Path], data_dir: Path, fetch_workers: int = 4):
+        self.secret_path = Path(secret_path)
+        self.label = self.secret_path.stem
+        self.kis: Optional[Any] = None
+        self.connected = False
+        self.account_number: Optional[str] = None
+
+        self.fetcher = FetchEngine(max_workers=fetch_workers)
+        self.transactions = TransactionStore(Path(data_dir) / self.label / "transactions.sqlite")
+        self.pl_engine = PLEngine(Path(data_dir) / self.label / "pl.sqlite")
+
+        # Last good results; a failed refresh keeps serving these in the consolidated view
+        self.positions: Optional[pd.DataFrame] = None
+        self.balance: Optional[Dict[str, float]] = None
+
+    def __repr__(self) -> str:
+        return f"AccountSession({self.label!r}, connected={self.connected})"
+
+    def shutdown(self):
+        """Release worker threads"""
+        self.fetcher.shutdown()
+
+
+def adopt_legacy_history(data_dir: Path, label: str):
+    """
+    Move single-account history (data_dir/transactions.sqlite, data_dir/pl.sqlite) into an account's
+    directory - before multi-account support only one secret file was ever loaded.
+    Call before that account's AccountSession opens its stores.
+    """
+    target = Path(data_dir) / label
+    for name in ("transactions.sqlite", "pl.sqlite"):
+        legacy = Path(data_dir) / name
+        if legacy.exists() and not (target / name).exists():
+            target.mkdir(parents=True, exist_ok=True)
+            legacy.rename(target / name)
+            logger.info(f"Moved {legacy} to {target / name}")
@@ -0,0 +1,385 @@
+# ---
+# Purpose: Bar store - local per-symbol OHLCV history (daily and 1-minute) as memory-mapped record files
+# Contents: Bars (read-only NumPy arrays), BarSeries (one symbol/interval: record file + JSON meta, append in place,
+#           rewrite-and-swap for backfills), BarStore (series registry, range queries, gap fill),
+#           BarSource/KisBarSource
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import os
+import json
+import shutil
+import threading
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fetch_engine import fetch_all, missing_spans, settled_end
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+TIME_DTYPE = np.dtype('datetime64[s]')  # market-local wall time; daily bars at midnight
+RECORD_DTYPE = np.dtype([('time', TIME_DTYPE)] + [(name, np.float64) for name in BAR_FIELDS])
+
+# Interval -> how far back from now a stored bar may still change (and is fetched again)
+INTERVALS = {
+    'day': timedelta(days=1),  # US sessions close after midnight KST
+    '1m': timedelta(minutes=1),
+}
+# Interval -> time between consecutive bars
+STEPS = {
+    'day': timedelta(days=1),
+    '1m': timedelta(minutes=1),
+}
+
+INITIAL_CAPACITY = 256
+META_NAME = "meta.json"
+
+
+@dataclass(frozen=True)
+class Bars:
+    """
+    Bars of one symbol in a time range; read-only arrays copied out of the series' record file
+    """
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy into a frame (Time, Open, High, Low, Close, Volume)"""
+        return pd.DataFrame({'Time': self.time, **{name.title(): getattr(self, name) for name in BAR_FIELDS}})
+
+
+@dataclass(frozen=True)
+class _SeriesState:
+    """Published state of a series; readers take the reference once, so length and generation always agree"""
+    generation: int
+    length: int
+    capacity: int  # rows in the generation's record file
+    covered: Optional[Tuple[np.datetime64, np.datetime64]]  # span already fetched, gaps included
+
+
+class BarSeries:
+    """
+    Bars of one symbol at one interval, sorted by time, in one record file per generation. Appending newer
+    bars writes past the published length and then publishes the new length, so readers never see a partial
+    append; anything else (backfilling older bars, growing the file) writes a new generation and swaps to it.
+    Overwriting still-settling bars at the end is done in place. The file is only mapped while a read or
+    merge runs, so idle series hold no file descriptors.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    # Files
+    def _records_path(self, generation: int) -> Path:
+        return self.directory / f"bars.{generation}.bin"
+
+    def _map(self, generation: int, capacity: int, mode: str) -> np.memmap:
+        """Map a generation's records; the map (and its descriptor) is released with the last reference"""
+        return np.memmap(self._records_path(generation), dtype=RECORD_DTYPE, mode=mode, shape=(capacity,))
+
+    def _load(self) -> _SeriesState:
+        meta_path = self.directory / META_NAME
+        if not meta_path.exists():
+            return _SeriesState(generation=0, length=0, capacity=0, covered=None)
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        covered = tuple(np.datetime64(value, 's') for value in meta['covered']) if meta.get('covered') else None
+        state = _SeriesState(generation=meta['generation'], length=meta['length'], capacity=meta['capacity'],
+                             covered=covered)
+        self._remove_other_generations(state.generation)
+        return state
+
+    def _write_meta(self, state: _SeriesState):
+        meta = {
+            'generation': state.generation, 'length': state.length, 'capacity': state.capacity,
+            'covered': [str(value) for value in state.covered] if state.covered else None,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f"{META_NAME}.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.directory / META_NAME)
+
+    def _remove_other_generations(self, generation: int):
+        current = self._records_path(generation).name
+        for path in self.directory.glob("*.bin"):
+            if path.name != current:
+                try:
+                    path.unlink()
+                except OSError as e:  # still mapped elsewhere (Windows); removed on a later load
+                    logger.debug(f"Could not remove old bar file {path}: {e}")
+
+    # Reading
+    @property
+    def covered(self) -> Optional[Tuple[np.datetime64, np.datetime64]]:
+        return self._state.covered
+
+    def read(self, start=None, end=None) -> Bars:
+        """Bars with start <= time <= end (either bound optional), copied out of the record file"""
+        while True:
+            state = self._state
+            if state.length == 0:
+                rows = np.empty(0, dtype=RECORD_DTYPE)
+                break
+            try:
+                records = self._map(state.generation, state.capacity, 'r')[:state.length]
+            except FileNotFoundError:
+                if self._state is state:
+                    raise
+                continue  # a merge swapped generations and removed this one; read the new one
+            times = records['time']
+            low = 0 if start is None else int(np.searchsorted(times, np.datetime64(start, 's'), side='left'))
+            high = state.length if end is None else int(np.searchsorted(times, np.datetime64(end, 's'), side='right'))
+            rows = np.array(records[low:high])
+            break
+        rows.flags.writeable = False
+        return Bars(**{name: rows[name] for name in RECORD_DTYPE.names})
+
+    # Writing
+    def merge(self, bars: pd.DataFrame, start, end) -> int:
+        """
+        Merge fetched bars (Time, Open, High, Low, Close, Volume) and mark start..end covered (nothing when
+        end < start); returns the number of bars added or changed
+        """
+        incoming = bars.sort_values('Time').drop_duplicates('Time', keep='last')
+        times = pd.to_datetime(incoming['Time']).to_numpy().astype(TIME_DTYPE)
+        values = {name: incoming[name.title()].to_numpy(dtype=np.float64) for name in BAR_FIELDS}
+        span = (np.datetime64(start, 's'), np.datetime64(end, 's')) if end >= start else None
+
+        with self._lock:
+            state = self._state
+            if span is None or state.covered is None:
+                covered = state.covered or span
+            else:
+                covered = (min(state.covered[0], span[0]), max(state.covered[1], span[1]))
+            records = self._map(state.generation, state.capacity, 'r+') if state.capacity else None
+            existing_times = records['time'][:state.length] if state.length else np.empty(0, dtype=TIME_DTYPE)
+            overlap = int(np.searchsorted(times, existing_times[-1], side='right')) if state.length else 0
+
+            if len(times) == 0:
+                changed, new_state = 0, state
+            elif state.length == 0 or times[0] > existing_times[-1] or self._is_tail_update(existing_times, times[:overlap]):
+                changed, new_state, records = self._write_tail(state, records, times, values, overlap)
+            else:
+                changed, new_state, records = self._rewrite(state, records, existing_times, times, values)
+
+            new_state = _SeriesState(new_state.generation, new_state.length, new_state.capacity, covered)
+            if records is not None:
+                records.flush()
+            self._write_meta(new_state)
+            self._state = new_state
+            if new_state.generation != state.generation:
+                self._remove_other_generations(new_state.generation)
+        return changed
+
+    @staticmethod
+    def _is_tail_update(existing_times: np.ndarray, overlapping: np.ndarray) -> bool:
+        """True if the incoming bars that aren't newer than the stored ones are exactly the last stored bars"""
+        return len(overlapping) <= len(existing_times) and np.array_equal(
+            existing_times[len(existing_times) - len(overlapping):], overlapping)
+
+    def _write_tail(self, state: _SeriesState, records: Optional[np.memmap], times: np.ndarray,
+                    values: Dict[str, np.ndarray], overlap: int) -> Tuple[int, _SeriesState, np.memmap]:
+        """Overwrite the last `overlap` bars in place and append the rest past the published length"""
+        added = len(times) - overlap
+        if state.length + added > state.capacity:
+            state, records = self._grow(state, records, max(INITIAL_CAPACITY, 2 * (state.length + added)))
+        position = state.length - overlap
+        changed = added
+        if overlap:
+            current = np.column_stack([records[name][position:state.length] for name in BAR_FIELDS])
+            fresh = np.column_stack([values[name][:overlap] for name in BAR_FIELDS])
+            changed += int((current != fresh).any(axis=1).sum())
+        records['time'][position:position + len(times)] = times
+        for name in BAR_FIELDS:
+            records[name][position:position + len(times)] = values[name]
+        return changed, _SeriesState(state.generation, state.length + added, state.capacity, state.covered), records
+
+    def _grow(self, state: _SeriesState, records: Optional[np.memmap],
+              capacity: int) -> Tuple[_SeriesState, np.memmap]:
+        """Copy the series into a new, larger generation"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = state.generation + 1
+        grown = self._map(generation, capacity, 'w+')
+        if state.length:
+            grown[:state.length] = records[:state.length]
+        return _SeriesState(generation, state.length, capacity, state.covered), grown
+
+    def _rewrite(self, state: _SeriesState, records: np.memmap, existing_times: np.ndarray, times: np.ndarray,
+                 values: Dict[str, np.ndarray]) -> Tuple[int, _SeriesState, np.memmap]:
+        """Merge bars falling before or between stored ones into a new generation (incoming bars win)"""
+        merged = pd.DataFrame({name: records[name][:state.length] for name in BAR_FIELDS},
+                              index=pd.Index(existing_times, name='time'))
+        fresh = pd.DataFrame(values, index=pd.Index(times, name='time'))
+        before = merged.reindex(fresh.index)
+        changed = int((before.to_numpy() != fresh.to_numpy()).any(axis=1).sum())
+        merged = fresh.combine_first(merged).sort_index()
+
+        capacity = max(INITIAL_CAPACITY, 2 * len(merged))
+        new_state, grown = self._grow(_SeriesState(state.generation, 0, capacity, state.covered), None, capacity)
+        grown['time'][:len(merged)] = merged.index.to_numpy().astype(TIME_DTYPE)
+        for name in BAR_FIELDS:
+            grown[name][:len(merged)] = merged[name].to_numpy()
+        return changed, _SeriesState(new_state.generation, len(merged), capacity, state.covered), grown
+
+
+class BarSource(ABC):
+    """
+    Where bars come from; fetch() returns a frame of (Time, Open, High, Low, Close, Volume) for start..end
+    """
+
+    def available(self) -> bool:
+        """Whether fetch() can be called right now"""
+        return True
+
+    @abstractmethod
+    def fetch(self, symbol: str, interval: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Bars of one symbol and interval"""
+
+
+class KisBarSource(BarSource):
+    """
+    Bars through PyKis chart APIs: daily bars for any range, 1-minute bars for the current session only
+    (KIS serves no older minute history); fetch() calls the API directly and the store runs it through
+    the given FetchEngine (rate limit, retries)
+    """
+
+    def __init__(self, kis: Callable[[], Optional[Any]], fetcher: Any, market: str = "KRX",
+                 on_request: Optional[Callable[[], None]] = None):
+        self._kis = kis  # returns the connected PyKis session, or None
+        self.fetcher = fetcher
+        self.market = market
+        self._on_request = on_request
+
+    def available(self) -> bool:
+        return self._kis() is not None
+
+    def fetch(self, symbol: str, interval: str, start: datetime, end: datetime) -> pd.DataFrame:
+        stock = self._kis().stock(symbol, market=self.market)
+        if self._on_request:
+            self._on_request()
+        if interval == 'day':
+            chart = stock.chart(start=start.date(), end=end.date())
+        else:
+            chart = stock.chart(period=1)
+        bars = chart.bars
+        frame = pd.DataFrame({
+            # Bar times are in the listing market's time zone; store its wall time
+            'Time': pd.to_datetime([bar.time.replace(tzinfo=None) for bar in bars]),
+            **{name.title(): np.array([float(getattr(bar, name)) for bar in bars], dtype=np.float64)
+               for name in BAR_FIELDS},
+        })
+        if interval == 'day':
+            frame['Time'] = frame['Time'].dt.normalize()
+        return frame[(frame['Time'] >= pd.Timestamp(start)) & (frame['Time'] <= pd.Timestamp(end))]
+
+
+class BarStore:
+    """
+    Per-symbol bar series under directory/<interval>/<symbol>/; writers (the refresh thread) and readers
+    (dashboard sessions) can run concurrently - reads take no lock and return copies
+    """
+
+    def __init__(self, directory: Path, source: Optional[BarSource] = None):
+        self.directory = Path(directory)
+        self.source = source
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], BarSeries] = {}
+
+    def series(self, symbol: str, interval: str = 'day') -> BarSeries:
+        """The series of one symbol/interval (created empty if missing)"""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown bar interval {interval!r} (expected one of {list(INTERVALS)})")
+        key = (symbol, interval)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.get(key)
+                if series is None:
+                    series = BarSeries(self.directory / interval / symbol)
+                    self._series[key] = series
+        return series
+
+    def read(self, symbol: str, interval: str = 'day', start=None, end=None) -> Bars:
+        """Stored bars of a symbol in start..end as read-only NumPy arrays"""
+        return self.series(symbol, interval).read(start, end)
+
+    def closes(self, symbols: Iterable[str], start, end, interval: str = 'day') -> pd.DataFrame:
+        """Close prices in start..end as a frame indexed by time with one column per symbol"""
+        columns = {}
+        for symbol in symbols:
+            bars = self.read(symbol, interval, start, end)
+            columns[symbol] = pd.Series(bars.close, index=pd.DatetimeIndex(bars.time.astype('datetime64[ns]')))
+        if not columns:
+            return pd.DataFrame(index=pd.DatetimeIndex([]))
+        return pd.DataFrame(columns).sort_index()
+
+    @staticmethod
+    def unsettled_from(interval: str, now: datetime) -> datetime:
+        """Time of the first bar that may still change"""
+        if interval == 'day':
+            now = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return now - INTERVALS[interval]
+
+    def missing_ranges(self, symbol: str, interval: str, start: datetime, end: datetime,
+                       now: datetime) -> List[Tuple[datetime, datetime]]:
+        """Spans of start..end still to fetch (see missing_spans); bars still settling are always refetched"""
+        covered = self.series(symbol, interval).covered
+        if covered is not None:
+            covered = tuple(pd.Timestamp(value).to_pydatetime() for value in covered)
+        return missing_spans(covered, start, end, self.unsettled_from(interval, now), STEPS[interval])
+
+    def fill(self, symbols: Iterable[str], interval: str, start: datetime, end: datetime,
+             now: Optional[datetime] = None) -> int:
+        """Fetch and store the missing spans of start..end for every symbol; returns bars added or changed"""
+        if self.source is None or not self.source.available():
+            return 0
+        now = now or datetime.now()
+        requests = [(symbol, interval, first, last) for symbol in dict.fromkeys(symbols)
+                    for first, last in self.missing_ranges(symbol, interval, start, end, now)]
+        if not requests:
+            return 0
+
+        results = fetch_all(lambda request: self.source.fetch(*request), requests,
+                            getattr(self.source, 'fetcher', None))
+
+        changed = 0
+        for (symbol, interval, first, last), result in results.items():
+            if isinstance(result, Exception):
+                # The span stays missing and is retried on the next fill
+                logger.warning(f"Could not fetch {interval} bars of {symbol} {first}..{last}: {result}")
+                continue
+            # Only settled bars count as covered; the rest is fetched again next time
+            covered_end = settled_end(last, self.unsettled_from(interval, now), STEPS[interval])
+            changed += self.series(symbol, interval).merge(result, first, covered_end)
+        return changed
+
+    def clear(self):
+        """Drop every stored series"""
+        with self._lock:
+            self._series.clear()
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def as_datetime(value) -> datetime:
+    """datetime for a date or datetime bound (dates start at midnight)"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return pd.Timestamp(value).to_pydatetime()
@@ -0,0 +1,269 @@
+# ---
+# Purpose: Benchmark pipeline - daily market/FX closes from KIS charts, cached locally, normalized to % performance
+# Contents: BenchmarkSpec, DEFAULT_BENCHMARKS (ETF proxies), BenchmarkSource/KisChartSource/FixtureSource,
+#           record_fixture, BenchmarkCache (SQLite, append-only bars + fetched-range coverage),
+#           normalize_performance, BenchmarkPipeline
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import sqlite3
+import threading
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from fetch_engine import fetch_all, missing_spans, settled_end
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ['Date', 'Close']
+
+
+@dataclass(frozen=True)
+class BenchmarkSpec:
+    """One benchmark line: the dashboard name and the listed instrument whose daily closes stand in for it"""
+    name: str
+    symbol: str
+    market: str = "KRX"
+
+
+# python-kis charts cover listed stocks and ETFs, not index or FX series, so each benchmark
+# is tracked through a liquid ETF on it
+DEFAULT_BENCHMARKS = (
+    BenchmarkSpec("KOSPI", "226490"),      # KODEX 코스피
+    BenchmarkSpec("KOSPI 200", "069500"),  # KODEX 200
+    BenchmarkSpec("KOSDAQ", "229200"),     # KODEX 코스닥150
+    BenchmarkSpec("S&P 500", "SPY", "AMEX"),
+    BenchmarkSpec("DJIA", "DIA", "AMEX"),
+    BenchmarkSpec("USD/KRW", "261240"),    # KODEX 미국달러선물
+)
+
+# A day's bar may still change until the next day (US sessions close after midnight KST)
+SETTLING_DAYS = 1
+
+
+def unsettled_from(today: date) -> date:
+    """First day whose close may still change"""
+    return today - timedelta(days=SETTLING_DAYS)
+
+
+class BenchmarkSource(ABC):
+    """
+    Where daily closes come from; fetch() returns a frame of (Date, Close) for start..end inclusive
+    """
+
+    def available(self) -> bool:
+        """Whether fetch() can be called right now"""
+        return True
+
+    @abstractmethod
+    def fetch(self, spec: BenchmarkSpec, start: date, end: date) -> pd.DataFrame:
+        """Daily closes of one benchmark"""
+
+
+class KisChartSource(BenchmarkSource):
+    """
+    Daily bars through PyKis chart APIs; fetch() calls the API directly and the pipeline runs it
+    through the given FetchEngine (rate limit, retries)
+    """
+
+    def __init__(self, kis: Callable[[], Optional[Any]], fetcher: Any,
+                 on_request: Optional[Callable[[], None]] = None):
+        self._kis = kis  # returns the connected PyKis session, or None
+        self.fetcher = fetcher
+        self._on_request = on_request
+
+    def available(self) -> bool:
+        return self._kis() is not None
+
+    def fetch(self, spec: BenchmarkSpec, start: date, end: date) -> pd.DataFrame:
+        stock = self._kis().stock(spec.symbol, market=spec.market)
+        if self._on_request:
+            self._on_request()
+        chart = stock.chart(start=start, end=end)
+        # Bar times are in the listing market's time zone, so .date() is that market's trading day
+        return pd.DataFrame({
+            'Date': pd.to_datetime([bar.time.date() for bar in chart.bars]),
+            'Close': np.array([float(bar.close) for bar in chart.bars], dtype=float),
+        }, columns=BAR_COLUMNS)
+
+
+class FixtureSource(BenchmarkSource):
+    """
+    Recorded closes from a CSV (Benchmark, Date, Close) written by record_fixture - offline runs and tests
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._bars = pd.read_csv(self.path, parse_dates=['Date'], dtype={'Benchmark': str, 'Close': float})
+
+    def fetch(self, spec: BenchmarkSpec, start: date, end: date) -> pd.DataFrame:
+        bars = self._bars
+        mask = ((bars['Benchmark'] == spec.name)
+                & (bars['Date'] >= pd.Timestamp(start)) & (bars['Date'] <= pd.Timestamp(end)))
+        return bars.loc[mask, BAR_COLUMNS].reset_index(drop=True)
+
+
+def record_fixture(source: BenchmarkSource, path: Union[str, Path], start: date, end: date,
+                   specs: Iterable[BenchmarkSpec] = DEFAULT_BENCHMARKS) -> int:
+    """Fetch start..end for every benchmark from a live source and save it for FixtureSource"""
+    frames = [source.fetch(spec, start, end).assign(Benchmark=spec.name) for spec in specs]
+    recorded = pd.concat(frames, ignore_index=True)[['Benchmark'] + BAR_COLUMNS]
+    recorded.to_csv(path, index=False, date_format='%Y-%m-%d')
+    return len(recorded)
+
+
+class BenchmarkCache:
+    """
+    Append-only daily closes per benchmark, plus the date range already fetched for each -
+    so holidays and weekends (no bar) are not requested again
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        """Create the bars and coverage tables if needed"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bars ("
+                "benchmark TEXT NOT NULL, day TEXT NOT NULL, close REAL NOT NULL, "
+                "PRIMARY KEY (benchmark, day))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS coverage ("
+                "benchmark TEXT PRIMARY KEY, first_day TEXT NOT NULL, last_day TEXT NOT NULL)"
+            )
+
+    def coverage(self, name: str) -> Optional[Tuple[date, date]]:
+        """First and last day already fetched for a benchmark, None if never fetched"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT first_day, last_day FROM coverage WHERE benchmark = ?", (name,)).fetchone()
+        return (date.fromisoformat(row[0]), date.fromisoformat(row[1])) if row else None
+
+    def missing_ranges(self, name: str, start: date, end: date, today: date) -> List[Tuple[date, date]]:
+        """Date ranges of start..end still to fetch (see missing_spans); days still settling are always refetched"""
+        return missing_spans(self.coverage(name), start, end, unsettled_from(today), timedelta(days=1))
+
+    def store(self, name: str, bars: pd.DataFrame, start: date, end: date, today: Optional[date] = None) -> int:
+        """
+        Merge the bars fetched for start..end and mark the settled part of that range covered; returns the
+        number of new or changed closes. The range must touch the covered one (as missing_ranges returns them).
+        """
+        rows = [(name, day.strftime('%Y-%m-%d'), float(close))
+                for day, close in zip(pd.to_datetime(bars['Date']), bars['Close'])]
+        with self._lock, self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO bars (benchmark, day, close) VALUES (?, ?, ?) "
+                "ON CONFLICT (benchmark, day) DO UPDATE SET close = excluded.close "
+                "WHERE close != excluded.close",
+                rows
+            )
+            changed = conn.total_changes - before
+            end = settled_end(end, unsettled_from(today or date.today()), timedelta(days=1))
+            if end < start:
+                return changed
+            conn.execute(
+                "INSERT INTO coverage (benchmark, first_day, last_day) VALUES (?, ?, ?) "
+                "ON CONFLICT (benchmark) DO UPDATE SET "
+                "first_day = MIN(first_day, excluded.first_day), last_day = MAX(last_day, excluded.last_day)",
+                (name, start.isoformat(), end.isoformat())
+            )
+        return changed
+
+    def closes(self, names: Iterable[str], start: date, end: date) -> pd.DataFrame:
+        """Closes between start and end as a frame indexed by day with one column per benchmark"""
+        names = list(names)
+        if not names:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='day'))
+        with self._connect() as conn:
+            raw = pd.read_sql_query(
+                f"SELECT benchmark, day, close FROM bars WHERE benchmark IN ({', '.join('?' * len(names))}) "
+                "AND day >= ? AND day <= ?",
+                conn, params=[*names, start.isoformat(), end.isoformat()]
+            )
+        wide = raw.pivot(index='day', columns='benchmark', values='close')
+        wide.index = pd.to_datetime(wide.index)
+        return wide.reindex(columns=names).sort_index()
+
+
+def normalize_performance(closes: pd.DataFrame) -> pd.DataFrame:
+    """
+    % change of each column since its first close in the frame. Markets trade on different calendars,
+    so a column's gaps carry its last close forward (0% before its first bar in the window).
+    """
+    filled = closes.ffill()
+    if filled.empty:
+        return filled
+    base = filled.bfill().iloc[0]
+    return (filled.div(base) - 1.0).mul(100.0).fillna(0.0)
+
+
+class BenchmarkPipeline:
+    """
+    Keeps the benchmark cache current (fetching only missing days, concurrently) and serves
+    normalized % performance over a window from local data
+    """
+
+    def __init__(self, cache: BenchmarkCache, source: Optional[BenchmarkSource] = None,
+                 specs: Iterable[BenchmarkSpec] = DEFAULT_BENCHMARKS):
+        self.cache = cache
+        self.source = source
+        self.specs = tuple(specs)
+
+    @property
+    def names(self) -> List[str]:
+        return [spec.name for spec in self.specs]
+
+    def update(self, start: date, end: date, today: Optional[date] = None,
+               starts: Optional[Mapping[str, date]] = None) -> int:
+        """
+        Fetch the missing days of start..end for every benchmark (from an earlier start for benchmarks named in
+        `starts`); returns the number of new or changed closes
+        """
+        if self.source is None or not self.source.available():
+            return 0
+        today = today or date.today()
+        starts = starts or {}
+        requests = [(spec, first, last) for spec in self.specs
+                    for first, last in self.cache.missing_ranges(spec.name, min(start, starts.get(spec.name, start)),
+                                                                 end, today)]
+        if not requests:
+            return 0
+
+        results = fetch_all(lambda request: self.source.fetch(*request), requests,
+                            getattr(self.source, 'fetcher', None))
+
+        changed = 0
+        for (spec, first, last), result in results.items():
+            if isinstance(result, Exception):
+                # The benchmark keeps its cached closes; the range stays missing and is retried next time
+                logger.warning(f"Could not fetch {spec.name} ({spec.symbol}) {first}..{last}: {result}")
+                continue
+            changed += self.cache.store(spec.name, result, first, last, today)
+        return changed
+
+    def performance(self, start: date, end: date) -> pd.DataFrame:
+        """
+        Date plus one column per benchmark: % performance since the first cached close in start..end.
+        Days with no cached data at all fall back to business days, all 0%.
+        """
+        closes = self.cache.closes(self.names, start, end)
+        if closes.empty:
+            closes = pd.DataFrame(np.nan, index=pd.bdate_range(start, end), columns=self.names)
+        performance = normalize_performance(closes)
+        performance.insert(0, 'Date', performance.index)
+        return performance.reset_index(drop=True).rename_axis(columns=None)
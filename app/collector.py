@@ -0,0 +1,230 @@
+# ---
+# Purpose: Collector - standalone process that owns the KIS connection and serves snapshots to dashboards
+# Contents: SnapshotPublisher (manifest + per-frame change tokens), CollectorServer (local HTTP read API),
+#           main entry point (python app/collector.py)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import os
+import json
+import signal
+import argparse
+import threading
+import logging
+from dataclasses import fields
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from data_service import DataService, DataSnapshot, enable_copy_on_write
+from snapshot_store import encode_value, frame_to_ipc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class SnapshotPublisher:
+    """
+    Turns the service's current snapshot into a small JSON manifest plus frames fetched separately.
+    Every frame gets a token that only changes when the frame object does, so readers re-download
+    just what changed; serialized frames are cached, so N readers cost one serialization.
+    """
+
+    def __init__(self, service: DataService):
+        self.service = service
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, Tuple[Any, int]] = {}  # frame name -> (frame object, token)
+        self._encoded: Dict[str, Tuple[int, bytes]] = {}  # frame name -> (token, Arrow IPC bytes)
+        self._counter = count(1)
+
+    @staticmethod
+    def _frames(snapshot: DataSnapshot) -> Dict[str, pd.DataFrame]:
+        """Frames of a snapshot by name; mappings of frames (P&L periods) become 'field.key'"""
+        frames = {}
+        for field in fields(snapshot):
+            value = getattr(snapshot, field.name)
+            if isinstance(value, pd.DataFrame):
+                frames[field.name] = value
+            elif field.name == 'pl_data' and value is not None:
+                frames.update({f"{field.name}.{key}": df for key, df in value.items()})
+        return frames
+
+    def _token(self, name: str, df: pd.DataFrame) -> int:
+        """Token of this exact frame object (a new one whenever the object changes); call with the lock held"""
+        known = self._tokens.get(name)
+        if known is None or known[0] is not df:
+            known = (df, next(self._counter))
+            self._tokens[name] = known
+        return known[1]
+
+    def manifest(self) -> Dict[str, Any]:
+        """Version, status, plain values and frame tokens of the current snapshot"""
+        snapshot = self.service.get_snapshot()
+        status = self.service.get_data_status()
+        frames = self._frames(snapshot)
+        with self._lock:
+            tokens = {name: self._token(name, df) for name, df in frames.items()}
+
+        values = {
+            field.name: getattr(snapshot, field.name)
+            for field in fields(snapshot)
+            if field.name not in ('positions', 'transactions', 'benchmark_data', 'price_history', 'team_holdings', 'pl_data')
+        }
+        return {
+            **encode_value(values),
+            'pl_data': None if snapshot.pl_data is None else list(snapshot.pl_data),
+            'frames': tokens,
+            'status': encode_value({field.name: getattr(status, field.name) for field in fields(status)}),
+            'refresh_interval': self.service.get_refresh_interval(),
+        }
+
+    def frame(self, name: str) -> Optional[Tuple[int, bytes]]:
+        """(token, Arrow IPC bytes) of a frame in the current snapshot, None if it doesn't exist"""
+        df = self._frames(self.service.get_snapshot()).get(name)
+        if df is None:
+            return None
+        # Token and bytes come from the same frame object, so a token never labels another frame's bytes
+        with self._lock:
+            token = self._token(name, df)
+            cached = self._encoded.get(name)
+            if cached is not None and cached[0] == token:
+                return cached
+        encoded = (token, frame_to_ipc(df))
+        with self._lock:
+            self._encoded[name] = encoded
+        return encoded
+
+
+class CollectorRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET  /manifest              snapshot version, status, balance/quotes, refresh interval and frame tokens (JSON)
+    GET  /frame/<name>          one frame as an Arrow IPC stream (X-Frame-Token header)
+    GET  /transactions?start=&end=  local transaction history, ISO dates (Arrow IPC stream)
+    GET  /settings, POST /settings  {"refresh_interval": seconds}
+    GET  /stats                 role, REST calls of the last cycle, startup timings
+    POST /refresh?force=1       schedule a refresh (deduplicated)
+    GET  /health
+    """
+    server: "CollectorServer"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload: Any, status: int = 200):
+        self._send(status, json.dumps(payload).encode("utf-8"))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        service = self.server.service
+        try:
+            if url.path == "/manifest":
+                self._send_json(self.server.publisher.manifest())
+            elif url.path.startswith("/frame/"):
+                frame = self.server.publisher.frame(url.path[len("/frame/"):])
+                if frame is None:
+                    self._send_json({"error": "no such frame"}, status=404)
+                else:
+                    self._send(200, frame[1], ARROW_STREAM_TYPE, {"X-Frame-Token": str(frame[0])})
+            elif url.path == "/transactions":
+                query = parse_qs(url.query)
+                start, end = (date.fromisoformat(query[key][0]) if key in query else None for key in ("start", "end"))
+                self._send(200, frame_to_ipc(service.get_transaction_history(start=start, end=end)), ARROW_STREAM_TYPE)
+            elif url.path == "/settings":
+                self._send_json({"refresh_interval": service.get_refresh_interval()})
+            elif url.path == "/stats":
+                self._send_json({
+                    "role": service.get_role(),
+                    "refresh": service.get_refresh_stats(),
+                    "startup": service.get_startup_timings(),
+                })
+            elif url.path == "/health":
+                self._send_json({"ok": True})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+        except Exception as e:
+            logger.error(f"Error serving {self.path}: {e}")
+            self._send_json({"error": str(e)}, status=500)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        service = self.server.service
+        try:
+            if url.path == "/refresh":
+                force = parse_qs(url.query).get("force", ["0"])[0] == "1"
+                service.request_refresh(force=force)
+                self._send_json({"refreshing": True}, status=202)
+            elif url.path == "/settings":
+                length = int(self.headers.get("Content-Length", 0))
+                settings = json.loads(self.rfile.read(length) or b"{}")
+                if "refresh_interval" in settings:
+                    service.set_refresh_interval(float(settings["refresh_interval"]))
+                self._send_json({"refresh_interval": service.get_refresh_interval()})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+        except ValueError as e:  # bad settings value (e.g. interval below the minimum)
+            self._send_json({"error": str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error serving {self.path}: {e}")
+            self._send_json({"error": str(e)}, status=500)
+
+
+class CollectorServer(ThreadingHTTPServer):
+    """
+    Local HTTP read API over one DataService; each request runs on its own thread
+    """
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: DataService):
+        super().__init__(address, CollectorRequestHandler)
+        self.service = service
+        self.publisher = SnapshotPublisher(service)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the KIS data collector and serve snapshots to dashboards")
+    parser.add_argument("--host", default=os.getenv("KSIF_COLLECTOR_HOST", DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=int(os.getenv("KSIF_COLLECTOR_PORT", DEFAULT_PORT)))
+    parser.add_argument("--data-dir", default=None, help="defaults to KSIF_DATA_DIR or .ksif_cache")
+    parser.add_argument("--secret", action="append", default=None,
+                        help="account secret file (repeatable); defaults to every secretN.json")
+    args = parser.parse_args(argv)
+    enable_copy_on_write()
+
+    # Hold the refresher lock too, so an in-process dashboard in shared mode follows instead of polling
+    service = DataService(secret_paths=args.secret, data_dir=args.data_dir, shared=True)
+    server = CollectorServer((args.host, args.port), service)
+    logger.info(f"Collector serving on http://{args.host}:{server.server_port} (role: {service.get_role()})")
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        logger.info("Collector stopped")
+
+
+if __name__ == "__main__":
+    main()
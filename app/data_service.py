@@ -7,13 +7,34 @@
 import os
 import time
 import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterable, List, Mapping, Optional
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import json
 import logging
 
+from account_session import AccountSession, adopt_legacy_history, discover_secret_files
+from bar_store import Bars, BarStore, KisBarSource, as_datetime
+from benchmark_pipeline import BenchmarkCache, BenchmarkPipeline, FixtureSource, KisChartSource
+from fetch_engine import FetchEngine
+from pl_engine import aggregate_daily_pl, build_pl_rollups, profits_to_frame
+from portfolio_returns import PortfolioReturnEngine
+from refresh_scheduler import DEFAULT_BASE_INTERVAL, RefreshScheduler
+from risk_analytics import MARKET_PROXY, RiskEngine, RiskReport
+from service_registry import InterProcessLock, process_registry
+from snapshot_store import SnapshotStore
+from symbol_cache import SymbolCache
+from team_attribution import AttributionEngine, TeamReport, team_report
+from team_mapping import DEFAULT_TEAM, load_team_mapping
+from transaction_index import TransactionIndex
+from transaction_store import TRANSACTION_COLUMNS
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -26,72 +47,619 @@ except ImportError:
     logger.warning("PyKis not available - using mock data only")
     PYKIS_AVAILABLE = False
 
-class DataService:
+# KIS allows 41 real-time registrations per websocket session; keep one spare
+MAX_REALTIME_SUBSCRIPTIONS = 40
+
+# While a dataset stays missing, getters ask for a refresh at most this often (seconds, doubling up to the max)
+REVALIDATE_BACKOFF = 5.0
+REVALIDATE_BACKOFF_MAX = 120.0
+
+# How often a follower process checks the shared snapshot for a newer version (seconds)
+FOLLOWER_POLL_INTERVAL = 2.0
+
+# Consolidated fund view - every row says which account it came from
+POSITION_COLUMNS = ['Symbol', 'Code', 'Quantity', 'Price', 'Market_Value', 'PL', 'PL_Percent', 'Account', 'Team']
+FUND_TRANSACTION_COLUMNS = TRANSACTION_COLUMNS + ['Account']
+
+# Benchmark comparison window (calendar days) and recorded closes to use instead of KIS (offline runs, tests)
+BENCHMARK_WINDOW_DAYS = 30
+# Closes fetched before the first day a portfolio update computes, so it can carry one over a holiday
+PRICE_LOOKBACK_DAYS = 7
+
+# Daily closes of held symbols (and the market, from the benchmark cache) published for risk analytics (calendar days)
+RISK_WINDOW_DAYS = 365
+
+# Rows per page of the transaction history grid
+TRANSACTION_PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class RefreshContext:
+    """
+    Immutable per-cycle view of one account, fetched once and shared by every _refresh_* stage
+    """
+    session: AccountSession
+    account: Any
+    balance: Optional[Any]  # None when the balance dataset isn't due this cycle
+    fetched_at: datetime
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """
+    Immutable, versioned view of every cached dataset; published by reference swap so readers need no lock
+    """
+    version: int = 0
+    created_at: Optional[datetime] = None
+    positions: Optional[pd.DataFrame] = None
+    balance: Optional[Mapping[str, float]] = None
+    quotes: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    transactions: Optional[pd.DataFrame] = None
+    pl_data: Optional[Mapping[str, pd.DataFrame]] = None
+    benchmark_data: Optional[pd.DataFrame] = None
+    price_history: Optional[pd.DataFrame] = None  # Date plus a daily close column per held code and MARKET_PROXY
+    team_holdings: Optional[pd.DataFrame] = None  # attribution ledger per team/account/code (HOLDING_COLUMNS)
+    team_names: Optional[tuple] = None  # teams for filters: configured ones, then any seen in the data
+    account_balances: Optional[Mapping[str, Mapping[str, float]]] = None  # label -> balance behind `balance`
+    # Snapshot version at which each dataset last changed - a cache key that ignores unrelated updates
+    dataset_versions: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+
+
+@dataclass(frozen=True)
+class DataStatus:
+    """
+    Freshness of the data a getter just returned
+    state: 'empty' (nothing loaded yet), 'stale' (older than two refresh intervals, or restored from disk
+    and not yet refreshed) or 'fresh'
+    """
+    state: str
+    version: int
+    last_update: Optional[datetime]
+    refreshing: bool
+    connected: bool  # at least one account connected
+    connection: str = 'disconnected'  # 'connecting', 'connected', 'disconnected' or 'follower' (shared mode)
+    accounts: Mapping[str, bool] = field(default_factory=lambda: MappingProxyType({}))  # label -> connected
+    restored: bool = False  # serving the snapshot saved by a previous process
+
+
+@dataclass(frozen=True)
+class TransactionPage:
+    """
+    One page of a filtered transaction query, newest first
+    """
+    rows: pd.DataFrame
+    total: int  # matching rows across every page
+    page: int  # zero-based, clamped to the last page
+    page_count: int
+
+
+def enable_copy_on_write():
+    """
+    Turn on pandas copy-on-write (the default from pandas 3.0) so getters can hand out shallow copies of
+    snapshot frames: a caller's write copies the touched column instead of reaching the shared buffer.
+    Process-wide, so entry points (dashboard, collector) call it rather than this module on import.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild a frame on NumPy buffers marked non-writable so published data can be shared, not copied"""
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            # Extension dtypes (strings, categoricals) keep their own immutable storage
+            columns[name] = column
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def freeze_value(value: Any) -> Any:
+    """Make payloads read-only before they go into a snapshot (frames and nested dicts)"""
+    if isinstance(value, pd.DataFrame):
+        return freeze_frame(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze_value(v) for k, v in value.items()})
+    return value
+
+
+class SnapshotReader(ABC):
+    """
+    Read side shared by the in-process DataService and readers of a separate collector process:
+    everything is served from self._snapshot, and missing data goes through request_refresh()
+    """
+    _snapshot: DataSnapshot
+    _transaction_index: Optional[TransactionIndex] = None
+    _risk_engine: Optional[RiskEngine] = None
+    _risk_report: Optional[tuple] = None  # (positions frame, report) of the last update
+    _team_report: Optional[tuple] = None  # (positions frame, team holdings frame, report)
+    _revalidations: Optional[Dict[str, tuple]] = None  # dataset -> (last call, next request at, delay)
+    _revalidate_lock = threading.Lock()
+    
+    @abstractmethod
+    def request_refresh(self, force: bool = False) -> Future:
+        """Schedule a background refresh"""
+    
+    @abstractmethod
+    def is_refreshing(self) -> bool:
+        """Check if a refresh is in flight"""
+    
+    def get_snapshot(self) -> DataSnapshot:
+        """Get the current immutable snapshot (one consistent view of every dataset)"""
+        return self._snapshot
+    
+    def get_data_version(self, dataset: Optional[str] = None) -> int:
+        """
+        Get the current snapshot version - changes whenever any dataset is republished.
+        With a dataset name ('positions', 'transactions', ...), the version at which that dataset last changed.
+        """
+        if dataset is not None:
+            return self._snapshot.dataset_versions.get(dataset, 0)
+        return self._snapshot.version
+    
+    # Data getter methods - each reads one snapshot reference, so its view is consistent.
+    # Frames are shallow copies over read-only buffers: no per-call data copy, and callers
+    # adding or overwriting columns only ever touch their own copy.
+    # Getters never block on the API: missing data schedules a shared background refresh and
+    # the caller gets an empty placeholder; get_data_status() tells it how fresh the data is.
+    def _revalidate_missing(self, dataset: str):
+        """
+        Schedule a background refresh for a dataset that isn't loaded yet. While it stays missing
+        (disconnected, failing fetch) further requests back off instead of running a cycle per rerun.
+        """
+        now = time.monotonic()
+        with self._revalidate_lock:
+            if self._revalidations is None:
+                self._revalidations = {}
+            last_call, next_at, delay = self._revalidations.get(dataset, (None, now, REVALIDATE_BACKOFF))
+            if last_call is not None and now - last_call > REVALIDATE_BACKOFF_MAX * 2:
+                next_at, delay = now, REVALIDATE_BACKOFF  # missing again after a while: start over
+            due = now >= next_at
+            if due:
+                next_at, delay = now + delay, min(delay * 2, REVALIDATE_BACKOFF_MAX)
+            self._revalidations[dataset] = (now, next_at, delay)
+        if not due:
+            return
+        if not self.is_refreshing():
+            logger.info(f"No cached {dataset} data, scheduling background refresh...")
+        self.request_refresh()
+    
+    def get_positions_data(self) -> pd.DataFrame:
+        """Get cached positions data"""
+        positions = self._snapshot.positions
+        if positions is None:
+            self._revalidate_missing('positions')
+            # Return empty DataFrame with correct structure
+            return pd.DataFrame(columns=POSITION_COLUMNS)
+        return positions.copy(deep=False)
+    
+    def get_balance_data(self) -> Dict[str, Any]:
+        """Get cached balance data"""
+        balance = self._snapshot.balance
+        if balance is None:
+            self._revalidate_missing('balance')
+            return {
+                'available_cash': 0.0,
+                'total_assets': 0.0,
+                'total_pl': 0.0,
+                'total_pl_percent': 0.0
+            }
+        return dict(balance)
+    
+    def get_pl_data(self, period: str = "Daily") -> pd.DataFrame:
+        """Get cached P&L view for a period (Daily, Weekly, MTD, YTD)"""
+        rollups = self._snapshot.pl_data
+        if rollups is None:
+            self._revalidate_missing('P&L')
+        
+        # Views are precomputed per period, so switching periods is a lookup
+        if rollups is not None and len(rollups.get(period, rollups["Daily"])) > 0:
+            return rollups.get(period, rollups["Daily"]).copy(deep=False)
+        else:
+            # Create minimal P&L data structure
+            days = 7 if period == "Daily" else (30 if period == "MTD" else 365)
+            dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
+            return pd.DataFrame({
+                'Date': dates,
+                'Daily_PL': [0.0] * days,
+                'PL': [0.0] * days
+            })
+    
+    def get_transactions_data(self) -> pd.DataFrame:
+        """Get cached transactions data"""
+        transactions = self._snapshot.transactions
+        if transactions is None:
+            self._revalidate_missing('transactions')
+            return pd.DataFrame(columns=FUND_TRANSACTION_COLUMNS)
+        return transactions.copy(deep=False)
+    
+    def get_transaction_index(self) -> Optional[TransactionIndex]:
+        """Index over the published transactions frame, rebuilt only when a new frame is published"""
+        transactions = self._snapshot.transactions
+        if transactions is None:
+            return None
+        index = self._transaction_index
+        if index is None or index.source is not transactions:
+            index = TransactionIndex(transactions)
+            # A racing reader may build the same index; the last one wins, both are correct
+            self._transaction_index = index
+        return index
+    
+    def query_transactions(self, search: str = "", tx_type: str = "All", team: Optional[str] = None,
+                           start=None, end=None, page: int = 0,
+                           page_size: int = TRANSACTION_PAGE_SIZE) -> TransactionPage:
+        """
+        Filter cached transactions by symbol name/code, type, team and date range (inclusive), and return one page.
+        Filters run on the transaction index; the frame is sliced once, for the requested page.
+        """
+        index = self.get_transaction_index()
+        if index is None:
+            self._revalidate_missing('transactions')
+            return TransactionPage(rows=pd.DataFrame(columns=FUND_TRANSACTION_COLUMNS), total=0, page=0, page_count=1)
+        
+        positions = index.query(search=search, tx_type=None if tx_type == "All" else tx_type,
+                                team=team, start=start, end=end)
+        total = len(positions)
+        page_count = max(1, -(-total // page_size))
+        page = min(max(page, 0), page_count - 1)
+        rows = index.frame.iloc[positions[page * page_size:(page + 1) * page_size]]
+        return TransactionPage(rows=rows.copy(deep=False), total=total, page=page, page_count=page_count)
+    
+    def get_risk_report(self) -> RiskReport:
+        """
+        Weights, volatility, beta, VaR, drawdown and concentration of the cached positions. The engine keeps
+        the published price history as arrays and recomputes only symbols whose price moved since the last call.
+        """
+        snapshot = self._snapshot
+        positions = snapshot.positions
+        if positions is None:
+            self._revalidate_missing('positions')
+        elif snapshot.price_history is None:
+            self._revalidate_missing('price history')
+        engine = self._risk_engine
+        if engine is None:
+            engine = RiskEngine()
+            # A racing reader may create a second engine; the last one wins, both are correct
+            self._risk_engine = engine
+        if engine.history is not snapshot.price_history:
+            engine.set_history(snapshot.price_history)
+            self._risk_report = None
+        cached = self._risk_report
+        if cached is not None and cached[0] is positions:
+            return cached[1]
+        report = engine.update(positions)
+        self._risk_report = (positions, report)
+        return report
+    
+    def get_teams(self) -> List[str]:
+        """Team names for filters (configured teams first); empty until the history has loaded"""
+        return list(self._snapshot.team_names or [])
+    
+    def get_team_report(self) -> TeamReport:
+        """
+        Per-team holdings, realized/unrealized P&L and trade counts: the published attribution ledger valued
+        at the cached positions, recomputed only when either of them changes
+        """
+        snapshot = self._snapshot
+        if snapshot.team_holdings is None:
+            self._revalidate_missing('transactions')
+        cached = self._team_report
+        if cached is not None and cached[0] is snapshot.positions and cached[1] is snapshot.team_holdings:
+            return cached[2]
+        report = team_report(snapshot.team_holdings, snapshot.positions, snapshot.team_names or [], DEFAULT_TEAM)
+        self._team_report = (snapshot.positions, snapshot.team_holdings, report)
+        return report
+    
+    def get_benchmark_data(self) -> pd.DataFrame:
+        """Get cached benchmark data"""
+        benchmark_data = self._snapshot.benchmark_data
+        if benchmark_data is not None:
+            return benchmark_data.copy(deep=False)
+        
+        self._revalidate_missing('benchmark')
+        # Return minimal benchmark structure
+        days = 30
+        dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
+        return pd.DataFrame({
+            'Date': dates,
+            'Portfolio': [0.0] * days,
+            'KOSPI': [0.0] * days,
+            'KOSPI 200': [0.0] * days,
+            'KOSDAQ': [0.0] * days,
+            'S&P 500': [0.0] * days,
+            'DJIA': [0.0] * days,
+            'USD/KRW': [0.0] * days
+        })
+
+
+class DataService(SnapshotReader):
     """
     Persistent data service that manages KIS API connections and provides cached data
     """
     
-    def __init__(self, secret_path: str = "secret1.json", virtual_secret_path: str = None):
-        self.secret_path = secret_path
+    def __init__(self, secret_path: Optional[str] = None, virtual_secret_path: str = None,
+                 data_dir: Optional[str] = None, fetch_workers: Optional[int] = None,
+                 streaming: Optional[bool] = None, refresh_interval: Optional[float] = None,
+                 secret_paths: Optional[List[str]] = None, shared: Optional[bool] = None):
+        # Construction only touches local disk; connecting and the first fetch happen in the background
+        self._started_at = time.perf_counter()
+        self._startup_timings: Dict[str, float] = {}
+        
+        self.secret_paths, self.data_dir = self.resolve_config(secret_path, secret_paths, data_dir)
         self.virtual_secret_path = virtual_secret_path
-        self._kis: Optional[Any] = None
         self._is_connected = False
+        self._connection_state = 'disconnected'  # 'connecting' while accounts are being connected
+        self._role = 'starting'  # 'leader' or 'follower' once shared mode is resolved
         self._last_update = None
-        self._update_interval = 120  # seconds - increased to avoid API rate limits
         self._auto_refresh_enabled = True
         self._update_thread = None
         self._shutdown_event = threading.Event()
         
-        # Data cache
-        self._cached_data = {
-            'positions': None,
-            'balance': None,
-            'quotes': {},
-            'transactions': None,
-            'pl_data': None,
-            'benchmark_data': None
-        }
+        # Per-dataset cadences (base interval drives quotes; slower datasets are multiples of it)
+        self._scheduler = RefreshScheduler(
+            base_interval=refresh_interval or float(os.getenv("KSIF_REFRESH_INTERVAL", DEFAULT_BASE_INTERVAL)),
+            holidays=self._load_krx_holidays()
+        )
+        
+        # REST call counters - current cycle and the last completed cycle
+        self._api_calls_lock = threading.Lock()
+        self._api_calls: Counter = Counter()
+        self._last_cycle_api_calls: Dict[str, int] = {}
+        
+        # Data cache - readers take self._snapshot as-is; writers serialize on the publish lock
+        self._snapshot = DataSnapshot()
+        self._publish_lock = threading.Lock()
+        
+        # Stale-while-revalidate: getters never refresh inline, they schedule one shared background job
+        self._refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kis-refresh")
+        self._refresh_future: Optional[Future] = None
+        self._refresh_request_lock = threading.Lock()
+        self._refresh_run_lock = threading.Lock()
+        
+        # Real-time price streaming - symbol code -> KisEventTicket
+        if streaming is None:
+            streaming = os.getenv("KSIF_STREAMING", "1") != "0"
+        self._streaming_enabled = streaming
+        self._price_tickets: Dict[str, Any] = {}
+        self._price_session: Optional[AccountSession] = None  # session the tickets are subscribed on
+        self._stream_lock = threading.Lock()
+        
+        # One session per account, each with its own rate-limited fetcher and local history;
+        # accounts connect and refresh concurrently so a cycle takes as long as the slowest one
+        started = time.perf_counter()
+        adopt_legacy_history(self.data_dir, self.secret_paths[0].stem)
+        workers = fetch_workers or int(os.getenv("KSIF_FETCH_WORKERS", "4"))
+        self._sessions = [AccountSession(path, self.data_dir, fetch_workers=workers) for path in self.secret_paths]
+        self._account_executor = ThreadPoolExecutor(max_workers=len(self._sessions), thread_name_prefix="kis-account")
+        self._record_startup_phase('sessions', started)
+        
+        # Last published snapshot on disk - a restarted process serves it (marked stale) until the first refresh
+        started = time.perf_counter()
+        self._snapshot_store = SnapshotStore(self.data_dir / "snapshot")
+        self._loaded_version = 0  # saved snapshot version last read from disk
+        self._restored = self._restore_snapshot()
+        self._record_startup_phase('restore', started)
+        
+        # Shared mode (KSIF_SHARED_REFRESH=1): dashboard processes on one machine elect a leader through a
+        # file lock; only the leader talks to KIS and persists snapshots, followers memory-map what it saves
+        if shared is None:
+            shared = os.getenv("KSIF_SHARED_REFRESH", "0") == "1"
+        self._leader_lock = InterProcessLock(self.data_dir / "refresher.lock") if shared else None
+        self._role = 'leader' if self._leader_lock is None or self._leader_lock.acquire() else 'follower'
+        
+        # Team of every trade and holding (teams.json) and the per-team ledger built from attributed fills
+        self._teams = load_team_mapping()
+        self._attribution = AttributionEngine()
+        
+        # Symbol master cache shared by positions and transactions
+        started = time.perf_counter()
+        self._symbols = SymbolCache(self.data_dir / "symbols.sqlite", resolver=self._resolve_symbol_names)
+        self._symbols.add_listener(self._apply_symbol_names)
+        self._preload_symbol_master()
+        self._symbols.start()
+        self._record_startup_phase('symbols', started)
+        
+        # Benchmark closes cached locally; KSIF_BENCHMARK_FIXTURE replays a recorded CSV instead of calling KIS
+        fixture = os.getenv("KSIF_BENCHMARK_FIXTURE")
+        benchmark_source = (FixtureSource(fixture) if fixture else
+                            KisChartSource(lambda: self._kis, self._fetcher,
+                                           on_request=lambda: self._count_api_call('chart')))
+        self._benchmarks = BenchmarkPipeline(BenchmarkCache(self.data_dir / "benchmarks.sqlite"), benchmark_source)
+        # Risk analytics' market line is the benchmark tracked through MARKET_PROXY, cached over the risk window
+        self._market_benchmark = next(spec.name for spec in self._benchmarks.specs if spec.symbol == MARKET_PROXY)
+        # Start of the window the published benchmark frame covers; like the NAV store and the price history
+        # window below, only written by the leader's refresh thread (under _refresh_run_lock)
+        self._benchmark_window = None
         
-        # Initialize connection
-        self.initialize_connection()
+        # Per-symbol OHLCV history (memory-mapped); daily bars of held/traded symbols are filled on the
+        # benchmark cadence and price the "Portfolio" line, other ranges/intervals load on request
+        self._bars = BarStore(self.data_dir / "bars",
+                              KisBarSource(lambda: self._kis, self._fetcher,
+                                           on_request=lambda: self._count_api_call('chart')))
+        self._bar_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kis-bars")
+        self._bar_requests_lock = threading.Lock()
+        self._bar_requests: Dict[tuple, Future] = {}
+        self._portfolio_returns = PortfolioReturnEngine(self.data_dir / "portfolio.sqlite")
         
-        # Start auto-refresh thread
+        # Local history and connection load on the refresh executor; it is single-threaded, so the
+        # auto-refresh worker's first cycle queues behind them and readers see 'refreshing' meanwhile
+        if self._role == 'leader':
+            self._become_leader()
+        else:
+            self._connection_state = 'follower'
+            logger.info(f"Another process holds {self._leader_lock.path}; following its snapshots")
+        
+        # Start auto-refresh thread (refresh cycles as leader, snapshot polling as follower)
         self.start_auto_refresh()
+        self._record_startup_phase('construct', self._started_at)
+    
+    @staticmethod
+    def resolve_config(secret_path: Optional[str] = None, secret_paths: Optional[List[str]] = None,
+                       data_dir: Optional[str] = None):
+        """
+        Account secret files and data directory a DataService would use - explicit list, single legacy path,
+        KSIF_SECRET_FILES (os.pathsep separated), or every secretN.json generated by create_secret.py
+        """
+        if secret_paths is None:
+            if secret_path is not None:
+                secret_paths = [secret_path]
+            else:
+                secret_paths = (list(filter(None, os.getenv("KSIF_SECRET_FILES", "").split(os.pathsep)))
+                                or discover_secret_files() or ["secret1.json"])
+        return [Path(path) for path in secret_paths], Path(data_dir or os.getenv("KSIF_DATA_DIR", ".ksif_cache"))
+    
+    def _become_leader(self):
+        """Start refreshing from KIS and persisting snapshots for every process sharing the data directory"""
+        self._role = 'leader'
+        self._snapshot_store.start()
+        self._connection_state = 'connecting'
+        with self._refresh_request_lock:
+            self._refresh_future = self._refresh_executor.submit(self._startup)
+    
+    def _follow_leader(self):
+        """Follower: take over if the leader exited, otherwise load the newest snapshot it saved"""
+        if self._leader_lock.acquire():
+            logger.info("Shared refresher exited; this process takes over refreshing")
+            self._become_leader()
+            return
+        if self._snapshot_store.saved_version() > self._loaded_version:
+            self._restore_snapshot()
+            self._restored = False
+    
+    def get_role(self) -> str:
+        """'leader' if this process refreshes from KIS, 'follower' if it reads a shared refresher's snapshots"""
+        return self._role
+    
+    def _record_startup_phase(self, phase: str, started: float):
+        """Record how long a startup phase took (milliseconds)"""
+        self._startup_timings[phase] = round((time.perf_counter() - started) * 1000, 1)
+    
+    def get_startup_timings(self) -> Dict[str, float]:
+        """
+        Milliseconds per startup phase: sessions, restore, symbols and construct (blocking, in __init__);
+        history, connect and first_data (from construction to the first completed refresh) in the background
+        """
+        return dict(self._startup_timings)
+    
+    def _startup(self):
+        """Background startup: serve the local history, then connect every account"""
+        with self._refresh_run_lock:
+            # History already on disk; a restored snapshot keeps its P&L views if no series is stored yet
+            started = time.perf_counter()
+            history = {'transactions': self._load_transaction_history()}
+            history.update(self._team_datasets(history['transactions']))
+            pl_data = self._consolidated_pl_rollups()
+            if pl_data is not None:
+                history['pl_data'] = pl_data
+            # Benchmark comparison and risk history from the local caches, before any API call
+            history.update(self._refresh_benchmark_data(fetch=False, transactions=history['transactions']))
+            history.update(self._refresh_price_history(fetch=False))
+            self._publish(history)
+            self._record_startup_phase('history', started)
+            
+            started = time.perf_counter()
+            self.initialize_connection()
+            self._record_startup_phase('connect', started)
+    
+    def _restore_snapshot(self) -> bool:
+        """Publish the snapshot saved by the previous process and seed each account's last good data"""
+        started = time.perf_counter()
+        # After the first load only frames saved since are read back; the others stay as published
+        saved = self._snapshot_store.load(changed_only=self._loaded_version > 0)
+        if saved is None:
+            return False
+        
+        saved.pop('_saved_at', None)
+        version = saved.pop('version', 0) or 0
+        self._loaded_version = version
+        created_at = saved.pop('created_at', None)
+        with self._publish_lock:
+            # Continue the saved version sequence so versions never repeat across restarts
+            self._snapshot = replace(self._snapshot, version=max(version, self._snapshot.version))
+        current = self._snapshot
+        changes = {}
+        for key, value in saved.items():
+            if value is None:
+                continue
+            # Frames only come back when they changed; unchanged plain values keep their dataset version
+            if isinstance(value, pd.DataFrame) or key == 'pl_data' or value != getattr(current, key, None):
+                changes[key] = value
+        self._publish(changes)
+        self._last_update = created_at
+        
+        positions = self._snapshot.positions
+        account_balances = self._snapshot.account_balances or {}
+        for session in self._sessions:
+            if positions is not None and 'Account' in positions.columns:
+                session.positions = positions[positions['Account'] == session.label].reset_index(drop=True)
+            if session.label in account_balances:
+                session.balance = dict(account_balances[session.label])
+        
+        logger.info(f"Restored snapshot v{version} from {created_at} in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return True
+    
+    @property
+    def _market_session(self) -> AccountSession:
+        """Session used for account-independent market data (quotes, names, streaming): first connected one"""
+        return next((session for session in self._sessions if session.connected), self._sessions[0])
+    
+    @property
+    def _kis(self) -> Optional[Any]:
+        return self._market_session.kis
+    
+    @property
+    def _fetcher(self) -> FetchEngine:
+        return self._market_session.fetcher
     
     def initialize_connection(self) -> bool:
-        """Initialize PyKis connection with persistent token management"""
+        """Connect every account concurrently; the service is connected if any account is"""
+        self._connection_state = 'connecting'
+        results = list(self._account_executor.map(self._connect_session, self._sessions))
+        self._is_connected = any(results)
+        self._connection_state = 'connected' if self._is_connected else 'disconnected'
+        logger.info(f"{sum(results)}/{len(results)} KIS accounts connected")
+        return self._is_connected
+    
+    def _connect_session(self, session: AccountSession) -> bool:
+        """Initialize one account's PyKis connection with persistent token management"""
         try:
             if not PYKIS_AVAILABLE:
                 logger.info("PyKis not available - running in mock mode")
-                self._is_connected = False
+                session.connected = False
                 return False
             
             # Check if secret files exist
-            if not Path(self.secret_path).exists():
-                logger.error(f"Secret file not found: {self.secret_path}")
-                self._is_connected = False
+            if not session.secret_path.exists():
+                logger.error(f"Secret file not found: {session.secret_path}")
+                session.connected = False
                 return False
             
             # Initialize PyKis with token persistence (using actual API from demo.ipynb)
             # Real-world example: kis = PyKis(KisAuth.load("secret1.json"), keep_token=True)
-            auth = KisAuth.load(self.secret_path)
+            auth = KisAuth.load(session.secret_path)
             
             # For now, only use real authentication to avoid virtual trading setup issues
             # Virtual trading can be added later if needed
-            self._kis = PyKis(auth, keep_token=True)
-            logger.info("Initialized PyKis with real authentication only")
+            session.kis = PyKis(auth, keep_token=True)
+            logger.info(f"Initialized PyKis for {session.label} with real authentication only")
             
             # Test connection by getting account balance
-            account = self._kis.account()
-            balance = account.balance()
+            account = session.kis.account()
+            self._count_api_call('balance')
+            session.fetcher.call(account.balance)
             
-            self._is_connected = True
+            session.account_number = str(account.account_number)
+            session.connected = True
             logger.info(f"KIS API connection established successfully for account: {account.account_number}")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to initialize KIS connection: {e}")
-            self._is_connected = False
+            logger.error(f"Failed to initialize KIS connection for {session.label}: {e}")
+            session.connected = False
             return False
     
     def is_connected(self) -> bool:
@@ -102,6 +670,161 @@ class DataService:
         """Get last update timestamp"""
         return self._last_update
     
+    @staticmethod
+    def _load_krx_holidays():
+        """KRX holidays from KSIF_KRX_HOLIDAYS (comma-separated ISO dates)"""
+        holidays = set()
+        for value in filter(None, os.getenv("KSIF_KRX_HOLIDAYS", "").split(',')):
+            try:
+                holidays.add(datetime.strptime(value.strip(), "%Y-%m-%d").date())
+            except ValueError:
+                logger.warning(f"Ignoring invalid KRX holiday: {value}")
+        return holidays
+    
+    def get_refresh_interval(self) -> float:
+        """Get the base refresh interval in seconds"""
+        return self._scheduler.base_interval
+    
+    def set_refresh_interval(self, seconds: float):
+        """
+        Change the base refresh interval at runtime; every dataset's cadence scales with it.
+        Raises ValueError below MIN_BASE_INTERVAL (the KIS rate limits)
+        """
+        self._scheduler.set_base_interval(seconds)
+    
+    def get_data_status(self) -> DataStatus:
+        """Get freshness of the cached data without blocking"""
+        snapshot = self._snapshot
+        interval = self._scheduler.effective_interval('balance')
+        if self._last_update is None or self._restored:
+            state = 'empty' if snapshot.positions is None and snapshot.transactions is None else 'stale'
+        elif interval is not None and datetime.now() - self._last_update > timedelta(seconds=2 * interval):
+            state = 'stale'
+        else:
+            state = 'fresh'
+        return DataStatus(
+            state=state,
+            version=snapshot.version,
+            last_update=self._last_update,
+            refreshing=self.is_refreshing(),
+            connected=self._is_connected,
+            connection=self._connection_state,
+            accounts=MappingProxyType({session.label: session.connected for session in self._sessions}),
+            restored=self._restored
+        )
+    
+    def is_refreshing(self) -> bool:
+        """Check if a background refresh is in flight"""
+        future = self._refresh_future
+        return future is not None and not future.done()
+    
+    def request_refresh(self, force: bool = False) -> Future:
+        """
+        Schedule a background refresh; concurrent requests share the job already in flight
+        """
+        with self._refresh_request_lock:
+            if self._refresh_future is None or self._refresh_future.done():
+                self._refresh_future = self._refresh_executor.submit(self.refresh_all_data, force)
+            return self._refresh_future
+    
+    def _publish(self, changes: Optional[Dict[str, Any]] = None,
+                 update: Optional[Callable[[DataSnapshot], Dict[str, Any]]] = None) -> DataSnapshot:
+        """
+        Build the next snapshot off to the side and publish it with a single reference swap
+        `update` derives changes from the current snapshot under the publish lock (read-modify-write)
+        """
+        with self._publish_lock:
+            current = self._snapshot
+            changes = dict(changes or {})
+            if update is not None:
+                changes.update(update(current))
+            changes.pop('dataset_versions', None)  # derived below, never set directly
+            if not changes:
+                return current
+            version = current.version + 1
+            snapshot = replace(current, version=version, created_at=datetime.now(),
+                               dataset_versions=MappingProxyType({**current.dataset_versions,
+                                                                  **dict.fromkeys(changes, version)}),
+                               **{key: freeze_value(value) for key, value in changes.items()})
+            self._snapshot = snapshot
+        if self._role == 'leader':
+            self._snapshot_store.schedule(snapshot)
+        return snapshot
+    
+    @staticmethod
+    def _quote_changes(current: DataSnapshot, quotes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Polled quotes merged over the published ones - or no change if none differs (fetch time aside)"""
+        def quoted(quote):
+            return {key: value for key, value in (quote or {}).items() if key != 'timestamp'}
+        if not any(quoted(current.quotes.get(symbol)) != quoted(quote) for symbol, quote in quotes.items()):
+            return {}
+        return {'quotes': {**current.quotes, **quotes}}
+    
+    def _count_api_call(self, endpoint: str, n: int = 1):
+        """Record KIS REST round trips made during the current refresh cycle"""
+        with self._api_calls_lock:
+            self._api_calls[endpoint] += n
+    
+    def get_refresh_stats(self) -> Dict[str, int]:
+        """Get REST call counts per endpoint for the last completed refresh cycle (plus 'total')"""
+        return dict(self._last_cycle_api_calls)
+    
+    def _preload_symbol_master(self):
+        """Bulk-load KRX master files listed in KSIF_KRX_MASTER (os.pathsep separated), if any"""
+        for path in filter(None, os.getenv("KSIF_KRX_MASTER", "").split(os.pathsep)):
+            try:
+                self._symbols.preload_krx_master(Path(path))
+            except Exception as e:
+                logger.warning(f"Could not preload symbol master {path}: {e}")
+    
+    def _resolve_symbol_names(self, codes):
+        """Resolve a batch of symbol codes to names via the KIS API (runs on the symbol cache worker)"""
+        if not self._kis:
+            return {}
+        
+        def fetch_name(code):
+            self._count_api_call('stock_info')
+            return self._kis.stock(code).info.name
+        
+        names = {}
+        for code, result in self._fetcher.map(fetch_name, codes).items():
+            if isinstance(result, Exception):
+                logger.debug(f"Could not get name for stock {code}: {result}")
+            else:
+                names[code] = result
+        return names
+    
+    def _apply_symbol_names(self, names: Dict[str, str]):
+        """Patch freshly resolved names into cached frames that still show raw codes"""
+        def patch(current: DataSnapshot) -> Dict[str, Any]:
+            changes = {}
+            for key in ('positions', 'transactions'):
+                df = getattr(current, key)
+                if df is not None and len(df) > 0 and 'Code' in df.columns:
+                    df = df.copy()
+                    df['Symbol'] = df['Code'].map(names).fillna(df['Symbol'])
+                    changes[key] = df
+            return changes
+        
+        self._publish(update=patch)
+    
+    def _build_refresh_context(self, session: AccountSession, with_balance: bool = True) -> RefreshContext:
+        """Fetch one account and (when due) its balance once for the whole refresh cycle"""
+        account = session.kis.account()
+        balance = None
+        if with_balance:
+            self._count_api_call('balance')
+            balance = session.fetcher.call(account.balance)  # Returns KisIntegrationBalance
+        return RefreshContext(session=session, account=account, balance=balance, fetched_at=datetime.now())
+    
+    def _held_symbols(self, positions: Optional[pd.DataFrame] = None):
+        """Held symbol codes across every account - from this cycle's positions if rebuilt, else the published ones"""
+        if positions is None:
+            positions = self._snapshot.positions
+        if positions is None or 'Code' not in positions.columns:
+            return []
+        return list(dict.fromkeys(positions['Code']))
+    
     def start_auto_refresh(self):
         """Start background thread for auto-refreshing data"""
         if self._update_thread is None or not self._update_thread.is_alive():
@@ -114,19 +837,27 @@ class DataService:
         """Stop auto-refresh thread"""
         if self._update_thread and self._update_thread.is_alive():
             self._shutdown_event.set()
+            self._scheduler.changed.set()
             self._update_thread.join(timeout=5)
             logger.info("Auto-refresh thread stopped")
     
     def _auto_refresh_worker(self):
-        """Background worker for automatic data refresh"""
+        """Background worker running whichever datasets the scheduler says are due"""
         while not self._shutdown_event.is_set():
             try:
                 if self._auto_refresh_enabled:
-                    self.refresh_all_data()
+                    self.request_refresh().result()
                 
-                # Wait for next update or shutdown signal
-                if self._shutdown_event.wait(timeout=self._update_interval):
-                    break  # Shutdown requested
+                # Sleep until the next dataset is due (followers: until the next snapshot poll);
+                # a cadence change or shutdown wakes us early
+                self._scheduler.changed.clear()
+                if self._shutdown_event.is_set():
+                    break
+                if self._role == 'follower':
+                    timeout = FOLLOWER_POLL_INTERVAL
+                else:
+                    timeout = self._scheduler.seconds_until_next_due()
+                self._scheduler.changed.wait(timeout=timeout)
                     
             except Exception as e:
                 logger.error(f"Error in auto-refresh worker: {e}")
@@ -135,32 +866,88 @@ class DataService:
                     break
     
     def refresh_all_data(self, force: bool = False):
-        """Refresh all cached data from KIS API"""
+        """Refresh datasets that are due per the scheduler (every dataset when forced)"""
+        # One cycle at a time, whether called directly or through request_refresh()
+        with self._refresh_run_lock:
+            if self._role == 'follower':
+                # The shared refresher does the fetching; pick up whatever it saved last
+                self._follow_leader()
+            else:
+                self._refresh_all_data(force)
+    
+    def _refresh_all_data(self, force: bool):
         try:
-            # Skip if recently updated (unless forced) - avoid API rate limits
-            if not force and self._last_update and datetime.now() - self._last_update < timedelta(seconds=60):
+            # Each dataset has its own cadence - avoid API rate limits by only fetching what is due
+            datasets = self._scheduler.job_names() if force else self._scheduler.due_jobs()
+            if not datasets:
                 return
             
-            logger.info("Refreshing all data from KIS API...")
+            logger.info(f"Refreshing {', '.join(datasets)} from KIS API...")
+            
+            with self._api_calls_lock:
+                self._api_calls.clear()
+            
+            # Every stage writes into `pending`; a failed stage leaves its keys out so the
+            # previous values carry over instead of readers seeing None
+            pending: Dict[str, Any] = {}
+            quotes: Dict[str, Any] = {}
             
-            if self._is_connected and self._kis:
-                # Refresh positions and balance
-                self._refresh_positions_and_balance()
+            connected = [session for session in self._sessions if session.connected]
+            account_datasets = [name for name in ('balance', 'orders', 'profits') if name in datasets]
+            if connected and account_datasets:
+                # Accounts refresh concurrently on their own fetchers; each reports what it updated
+                updated = set().union(*self._account_executor.map(
+                    lambda session: self._refresh_account(session, account_datasets), connected
+                ))
                 
-                # Refresh stock quotes for held positions  
-                self._refresh_stock_quotes()
+                # Consolidate into the fund view - accounts that failed keep their last good data
+                if 'balance' in updated:
+                    pending.update(self._consolidate_positions_and_balance())
+                if 'orders' in updated:
+                    pending['transactions'] = self._load_transaction_history()
+                    pending.update(self._team_datasets(pending['transactions']))
+                if 'profits' in updated:
+                    pending['pl_data'] = (self._consolidated_pl_rollups()
+                                          or self._unrealized_pl_rollups(pending.get('balance') or self._snapshot.balance))
+            
+            if connected:
+                held = self._held_symbols(pending.get('positions'))
                 
-                # Refresh transaction history
-                self._refresh_transactions()
+                # Subscriptions follow the held symbols and the market session
+                if self._streaming_enabled and ('positions' in pending
+                                                or self._price_session is not self._market_session):
+                    self._sync_price_subscriptions(held)
+                
+                # Refresh stock quotes for held positions  
+                if 'quotes' in datasets:
+                    quotes = self._refresh_stock_quotes(held)
                 
-                # Refresh P&L data
-                self._refresh_pl_data()
+                # Re-queue symbol names whose cache entries expired
+                if 'symbols' in datasets:
+                    self._symbols.get_names(set(held) | self._transaction_codes())
             
-            # Always refresh benchmark data (from external sources)
-            self._refresh_benchmark_data()
+            # Benchmark data comes from external sources
+            if 'benchmark' in datasets:
+                pending.update(self._refresh_benchmark_data(positions=pending.get('positions'),
+                                                            transactions=pending.get('transactions')))
+                pending.update(self._refresh_price_history(positions=pending.get('positions')))
             
+            # Publish the whole cycle at once; polled quotes merge over streamed ones
+            snapshot = self._publish(pending, update=lambda current: self._quote_changes(current, quotes))
+            
+            self._scheduler.mark_run(datasets)
             self._last_update = datetime.now()
-            logger.info(f"Data refresh completed at {self._last_update}")
+            if 'positions' in pending:
+                # Live account data replaced what was restored from disk
+                self._restored = False
+            if 'first_data' not in self._startup_timings:
+                self._record_startup_phase('first_data', self._started_at)
+                logger.info(f"Startup timings (ms): {self._startup_timings}")
+            with self._api_calls_lock:
+                self._last_cycle_api_calls = dict(self._api_calls)
+                self._last_cycle_api_calls['total'] = sum(self._api_calls.values())
+            logger.info(f"Data refresh completed at {self._last_update} - snapshot v{snapshot.version} "
+                        f"({self._last_cycle_api_calls['total']} REST calls: {dict(self._api_calls)})")
             
         except Exception as e:
             logger.error(f"Error refreshing data: {e}")
@@ -169,110 +956,187 @@ class DataService:
                 logger.info("Token issue detected, attempting to reconnect...")
                 self.initialize_connection()
     
-    def _refresh_positions_and_balance(self):
-        """Refresh positions and balance data using actual PyKis API"""
-        if not self._kis:
-            return
+    def _refresh_account(self, session: AccountSession, datasets: List[str]) -> set:
+        """Run one account's due stages (on the account pool); returns the datasets it refreshed"""
+        updated = set()
+        try:
+            # One balance snapshot shared by every stage of this account's cycle
+            ctx = self._build_refresh_context(session, with_balance='balance' in datasets)
+            
+            # Refresh positions and balance
+            if 'balance' in datasets:
+                result = self._refresh_positions_and_balance(ctx)
+                if result:
+                    session.positions = result['positions']
+                    session.balance = result['balance']
+                    updated.add('balance')
+            
+            # Refresh transaction history
+            if 'orders' in datasets and self._refresh_transactions(ctx):
+                updated.add('orders')
+            
+            # Refresh P&L data
+            if 'profits' in datasets and self._refresh_pl_data(ctx):
+                updated.add('profits')
+        
+        except Exception as e:
+            logger.error(f"Error refreshing account {session.label}: {e}")
+            # Try to reconnect this account if its token expired
+            if "token" in str(e).lower() or "auth" in str(e).lower():
+                logger.info(f"Token issue detected for {session.label}, attempting to reconnect...")
+                self._connect_session(session)
+                self._is_connected = any(s.connected for s in self._sessions)
+                self._connection_state = 'connected' if self._is_connected else 'disconnected'
+        
+        return updated
+    
+    def _consolidate_positions_and_balance(self) -> Dict[str, Any]:
+        """Merge every account's last good positions and balance into the fund view"""
+        frames = [s.positions for s in self._sessions if s.positions is not None and len(s.positions) > 0]
+        positions = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=POSITION_COLUMNS)
+        
+        account_balances = {s.label: s.balance for s in self._sessions if s.balance is not None}
+        return {'positions': positions, 'balance': self._fund_balance(account_balances.values()),
+                'account_balances': account_balances}
+    
+    @staticmethod
+    def _fund_balance(balances: Iterable[Mapping[str, float]]) -> Dict[str, float]:
+        """Fund balance from per-account balances (a single account's is used as is)"""
+        balances = list(balances)
+        if len(balances) == 1:
+            return dict(balances[0])
+        
+        available_cash = sum(b['available_cash'] for b in balances)
+        total_assets = sum(b['total_assets'] for b in balances)
+        total_pl = sum(b['total_pl'] for b in balances)
+        # Fund-level return on cost basis (market value - P&L), not an average of account percentages
+        total_cost = total_assets - available_cash - total_pl
+        return {
+            'available_cash': available_cash,
+            'total_assets': total_assets,
+            'total_pl': total_pl,
+            'total_pl_percent': total_pl / total_cost * 100 if total_cost else 0.0
+        }
+    
+    @staticmethod
+    def _balance_at(balance: Mapping[str, float], positions: pd.DataFrame) -> Dict[str, float]:
+        """Balance with its totals recomputed from (repriced) positions; cash is unchanged"""
+        total_value = float(positions['Market_Value'].sum())
+        total_pl = float(positions['PL'].sum())
+        total_cost = total_value - total_pl
+        return {
+            **balance,
+            'total_assets': total_value + balance['available_cash'],
+            'total_pl': total_pl,
+            'total_pl_percent': total_pl / total_cost * 100 if total_cost else 0.0
+        }
+    
+    def _refresh_positions_and_balance(self, ctx: RefreshContext) -> Dict[str, Any]:
+        """Refresh one account's positions and balance data using actual PyKis API"""
+        if not ctx.session.kis:
+            return {}
             
         try:
-            account = self._kis.account()
-            balance = account.balance()  # Returns KisIntegrationBalance
+            balance = ctx.balance
             
             # Convert positions to DataFrame format expected by dashboard
             positions_data = []
             
+            # Names come from the symbol cache; misses resolve in the background
+            names = self._symbols.get_names(stock.symbol for stock in balance.stocks)
+            
             for stock in balance.stocks:  # List of KisDomesticBalanceStock
-                # Get stock info to get readable name using actual symbol code from API
-                stock_symbol_code = stock.symbol  # This is the 6-digit code like '005930', '079160'
-                try:
-                    stock_obj = self._kis.stock(stock_symbol_code)
-                    # Get the actual stock name (e.g., "삼성전자" for "005930")
-                    stock_name = stock_obj.info.name if hasattr(stock_obj.info, 'name') else stock_symbol_code
-                except Exception as stock_error:
-                    logger.warning(f"Could not get name for stock {stock_symbol_code}: {stock_error}")
-                    stock_name = stock_symbol_code
-                
                 positions_data.append({
-                    "Symbol": stock_name,
+                    "Symbol": names[stock.symbol],
+                    "Code": stock.symbol,  # 6-digit code like '005930'
                     "Quantity": float(stock.qty),
                     "Price": float(stock.price),
                     "Market_Value": float(stock.amount),
                     "PL": float(stock.profit),
-                    "PL_Percent": float(stock.profit_rate)
+                    "PL_Percent": float(stock.profit_rate),
+                    "Account": ctx.session.label,
+                    "Team": self._teams.team_for((ctx.session.label, ctx.session.account_number), stock.symbol)
                 })
             
-            self._cached_data['positions'] = pd.DataFrame(positions_data)
-            
             # Extract balance information (based on actual demo.ipynb API structure)
             krw_deposit = balance.deposits.get('KRW')
             available_cash = float(krw_deposit.amount) if krw_deposit else 0.0
             
-            self._cached_data['balance'] = {
-                'available_cash': available_cash,
-                'total_assets': float(balance.current_amount) + available_cash,
-                'total_pl': float(balance.profit),
-                'total_pl_percent': float(balance.profit_rate)
-            }
-            
-            logger.info(f"Updated positions data: {len(positions_data)} positions")
+            logger.info(f"Updated positions data for {ctx.session.label}: {len(positions_data)} positions")
             logger.info(f"Available cash: ₩{available_cash:,.0f}")
             logger.info(f"Total assets: ₩{float(balance.current_amount) + available_cash:,.0f}")
             logger.info(f"Total P&L: ₩{float(balance.profit):,.0f} ({float(balance.profit_rate):.2f}%)")
             
+            return {
+                'positions': pd.DataFrame(positions_data, columns=POSITION_COLUMNS),
+                'balance': {
+                    'available_cash': available_cash,
+                    'total_assets': float(balance.current_amount) + available_cash,
+                    'total_pl': float(balance.profit),
+                    'total_pl_percent': float(balance.profit_rate)
+                }
+            }
+            
         except Exception as e:
-            logger.error(f"Error refreshing positions and balance: {e}")
-            # Clear cached data on error so we don't serve stale data
-            self._cached_data['positions'] = None
-            self._cached_data['balance'] = None
+            logger.error(f"Error refreshing positions and balance for {ctx.session.label}: {e}")
+            return {}
     
-    def _refresh_stock_quotes(self):
+    def _refresh_stock_quotes(self, held) -> Dict[str, Dict[str, Any]]:
         """Refresh stock quotes for monitoring using actual PyKis API"""
-        if not self._kis or 'positions' not in self._cached_data or self._cached_data['positions'] is None:
-            return
+        quotes: Dict[str, Dict[str, Any]] = {}
+        if not self._kis:
+            return quotes
             
         try:
-            # Get quotes for held positions
+            # Get quotes for held positions concurrently
             # Note: We need to use the actual symbol codes, not the names
-            account = self._kis.account()
-            balance = account.balance()
+            def fetch_quote(symbol):
+                self._count_api_call('stock_info')
+                stock = self._kis.stock(symbol)
+                self._count_api_call('quote')
+                return stock.quote()  # Returns KisQuote object
             
-            for stock_position in balance.stocks:
-                symbol = stock_position.symbol  # Use actual symbol code
-                try:
-                    stock = self._kis.stock(symbol)
-                    quote = stock.quote()  # Returns KisQuote object
-                    
-                    self._cached_data['quotes'][symbol] = {
-                        'price': float(quote.price),
-                        'change': float(quote.change),
-                        'rate': float(quote.rate),
-                        'volume': int(quote.volume),
-                        'market_cap': float(quote.market_cap) if hasattr(quote, 'market_cap') else 0.0,
-                        'timestamp': datetime.now()
-                    }
-                    
-                except Exception as e:
-                    logger.warning(f"Could not fetch quote for {symbol}: {e}")
+            # Streamed symbols get their quotes from websocket ticks
+            symbols = [symbol for symbol in held if symbol not in self._price_tickets]
+            
+            for symbol, quote in self._fetcher.map(fetch_quote, symbols).items():
+                if isinstance(quote, Exception):
+                    logger.warning(f"Could not fetch quote for {symbol}: {quote}")
+                    continue
+                
+                quotes[symbol] = {
+                    'price': float(quote.price),
+                    'change': float(quote.change),
+                    'rate': float(quote.rate),
+                    'volume': int(quote.volume),
+                    'market_cap': float(quote.market_cap) if hasattr(quote, 'market_cap') else 0.0,
+                    'timestamp': datetime.now()
+                }
             
-            logger.info(f"Updated quotes for {len(self._cached_data['quotes'])} symbols")
+            logger.info(f"Updated quotes for {len(quotes)} symbols")
             
         except Exception as e:
             logger.error(f"Error refreshing quotes: {e}")
+        
+        return quotes
     
-    def _refresh_transactions(self):
-        """Refresh transaction history using actual PyKis API"""
-        if not self._kis:
-            return
+    def _refresh_transactions(self, ctx: RefreshContext) -> bool:
+        """Incrementally sync one account's executed orders into its local transaction store"""
+        if not ctx.session.kis:
+            return False
             
         try:
-            account = self._kis.account()
-            # Get recent daily orders (last 7 days) - based on demo.ipynb API
+            account = ctx.account
+            # Only fetch from the newest stored order date (today's fills still change);
+            # an empty store backfills the last 7 days - based on demo.ipynb API
             end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=7)
+            high_water_mark = ctx.session.transactions.high_water_mark()
+            start_date = min(high_water_mark, end_date) if high_water_mark else end_date - timedelta(days=7)
             
-            daily_orders = account.daily_orders(start=start_date, end=end_date)
+            self._count_api_call('daily_orders')
+            daily_orders = ctx.session.fetcher.call(account.daily_orders, start=start_date, end=end_date)
             
-            transactions_data = []
+            records = []
             
             # Process each order from the actual API response
             for order in daily_orders.orders:
@@ -281,14 +1145,6 @@ class DataService:
                     symbol_code = order.order_number.code if hasattr(order, 'order_number') and hasattr(order.order_number, 'code') else 'Unknown'
                     order_number = order.order_number.number if hasattr(order, 'order_number') and hasattr(order.order_number, 'number') else '000000'
                     
-                    # Get stock name for display
-                    try:
-                        stock = self._kis.stock(symbol_code)
-                        symbol_name = stock.info.name if hasattr(stock.info, 'name') else symbol_code
-                    except Exception as stock_error:
-                        logger.debug(f"Could not get name for stock {symbol_code}: {stock_error}")
-                        symbol_name = symbol_code
-                    
                     # Extract transaction details from actual API response structure
                     order_type = order.type.title() if hasattr(order, 'type') else 'Unknown'
                     executed_qty = int(order.executed_qty) if hasattr(order, 'executed_qty') else 0
@@ -302,254 +1158,363 @@ class DataService:
                         else:
                             transaction_date = datetime.now()
                         
-                        transactions_data.append({
-                            "Date": transaction_date.strftime("%Y.%m.%d"),
-                            "Time": transaction_date.strftime("%H:%M"),
-                            "TX_ID": f"TX{order_number}",
-                            "Symbol": symbol_name,
-                            "Type": order_type,
-                            "Quantity": executed_qty,
-                            "Price": price,
-                            "Total": price * executed_qty,
-                            "Team": "Team Alpha"  # TODO: Map to actual team from account or order data
+                        records.append({
+                            "time": transaction_date,
+                            "order_number": order_number,
+                            "code": symbol_code,
+                            "type": order_type,
+                            "quantity": executed_qty,
+                            "price": price,
+                            "team": self._teams.team_for((ctx.session.label, ctx.session.account_number),
+                                                         symbol_code, order_number)
                         })
                     
                 except Exception as order_error:
                     logger.warning(f"Error processing order {getattr(order, 'order_number', 'Unknown')}: {order_error}")
                     continue
             
-            self._cached_data['transactions'] = pd.DataFrame(transactions_data)
-            logger.info(f"Updated {len(transactions_data)} transactions for date range {start_date} to {end_date}")
+            merged = ctx.session.transactions.upsert(records)
+            logger.info(f"Merged {merged} transactions for {ctx.session.label}, "
+                        f"date range {start_date} to {end_date}")
+            return True
             
         except Exception as e:
-            logger.error(f"Error refreshing transactions: {e}")
-            # Clear cached data on error
-            self._cached_data['transactions'] = None
+            logger.error(f"Error refreshing transactions for {ctx.session.label}: {e}")
+            # Keep serving the stored history - it does not go stale on an API error
+            return False
     
-    def _refresh_pl_data(self):
-        """Refresh P&L data using actual PyKis API"""
-        if not self._kis:
-            return
+    def _transaction_codes(self) -> set:
+        """Distinct symbol codes across every account's transaction store"""
+        return set().union(*(session.transactions.codes() for session in self._sessions))
+    
+    def _load_transaction_history(self, start=None, end=None) -> pd.DataFrame:
+        """Build the consolidated transaction frame from every account's store with cached symbol names"""
+        names = self._symbols.get_names(self._transaction_codes())
+        frames = []
+        for session in self._sessions:
+            df = session.transactions.to_frame(names, start=start, end=end)
+            if len(df) > 0:
+                # Teams follow the current mapping, so config changes apply to the whole history
+                frames.append(df.assign(Account=session.label,
+                                        Team=self._teams.assign(df, (session.label, session.account_number))))
+        
+        if not frames:
+            return pd.DataFrame(columns=FUND_TRANSACTION_COLUMNS)
+        if len(frames) == 1:
+            return frames[0]
+        # Each store is already newest first; interleave the accounts the same way
+        return (pd.concat(frames, ignore_index=True)
+                .sort_values(['Date', 'Time', 'TX_ID'], ascending=False, kind='stable', ignore_index=True))
+    
+    def _team_datasets(self, transactions: pd.DataFrame) -> Dict[str, Any]:
+        """Attribution ledger after the newest fills (only unsettled days are replayed) and the team list"""
+        try:
+            holdings = self._attribution.update(transactions)
+            return {'team_holdings': holdings,
+                    'team_names': tuple(self._teams.names([*transactions['Team'].dropna(), *holdings['Team']]))}
+        except Exception as e:
+            logger.error(f"Error attributing transactions to teams: {e}")
+            return {}
+    
+    def _refresh_pl_data(self, ctx: RefreshContext) -> bool:
+        """Merge one account's realized profits into its persisted daily P&L series"""
+        if not ctx.session.kis:
+            return False
             
         try:
-            account = self._kis.account()
+            account = ctx.account
+            # Only days from the last stored one onward; an empty series backfills YTD (at least 30 days)
             end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=30)
+            start_date = ctx.session.pl_engine.backfill_start(end_date)
             
             # Get profit data - based on demo.ipynb API
-            profits = account.profits(start=start_date)  # Returns KisIntegrationOrderProfits
+            self._count_api_call('profits')
+            profits = ctx.session.fetcher.call(account.profits, start=start_date)  # Returns KisIntegrationOrderProfits
             
-            # Convert to time series data based on actual realized profits
-            pl_data = []
-            current_date = start_date
-            cumulative_pl = 0
-            
-            # If there are actual realized profits, use them
-            if profits.orders and len(profits.orders) > 0:
-                while current_date <= end_date:
-                    daily_pl = 0
-                    
-                    # Calculate daily P&L from actual realized profits
-                    for order in profits.orders:
-                        try:
-                            if hasattr(order, 'time_kst') and order.time_kst:
-                                order_date = order.time_kst.date()
-                                if order_date == current_date:
-                                    daily_pl += float(order.profit) if hasattr(order, 'profit') else 0.0
-                        except Exception as order_error:
-                            logger.debug(f"Error processing P&L order: {order_error}")
-                            continue
-                    
-                    cumulative_pl += daily_pl
-                    pl_data.append({
-                        'Date': pd.to_datetime(current_date),
-                        'Daily_PL': daily_pl,
-                        'PL': cumulative_pl
-                    })
-                    current_date += timedelta(days=1)
-                    
-                logger.info(f"Updated P&L data from realized profits: {len(pl_data)} days, total realized profit: ₩{profits.profit:,.0f}")
-                
-            else:
-                # No realized profits yet - create P&L based on unrealized gains from current balance
-                try:
-                    balance = account.balance()
-                    total_unrealized_pl = float(balance.profit)  # Current unrealized P&L
-                    
-                    # Distribute the unrealized P&L across the time period
-                    # This gives a view of how the portfolio has performed
-                    for i in range(30):
-                        # Simple linear distribution - in reality this would need historical data
-                        daily_unrealized_change = total_unrealized_pl / 30
-                        
-                        pl_data.append({
-                            'Date': pd.to_datetime(current_date + timedelta(days=i)),
-                            'Daily_PL': daily_unrealized_change,
-                            'PL': daily_unrealized_change * (i + 1)
-                        })
-                    
-                    logger.info(f"Updated P&L data from unrealized gains: 30 days, current unrealized P&L: ₩{total_unrealized_pl:,.0f}")
-                    
-                except Exception as balance_error:
-                    logger.error(f"Could not get balance for P&L calculation: {balance_error}")
-                    # Create empty P&L data
-                    for i in range(30):
-                        pl_data.append({
-                            'Date': pd.to_datetime(current_date + timedelta(days=i)),
-                            'Daily_PL': 0.0,
-                            'PL': 0.0
-                        })
-            
-            self._cached_data['pl_data'] = pd.DataFrame(pl_data)
+            # Aggregate realized profits per day in one vectorized pass and merge into the stored series
+            fills = profits_to_frame(profits.orders or [])
+            ctx.session.pl_engine.merge(aggregate_daily_pl(fills, start_date, end_date))
+            logger.info(f"Updated P&L data for {ctx.session.label} from realized profits since {start_date}: "
+                        f"₩{float(profits.profit):,.0f} realized in window")
+            return True
             
         except Exception as e:
-            logger.error(f"Error refreshing P&L data: {e}")
-            # Clear cached data on error
-            self._cached_data['pl_data'] = None
+            logger.error(f"Error refreshing P&L data for {ctx.session.label}: {e}")
+            # Keep serving the persisted series - only the newest days are missing
+            return False
+    
+    def _consolidated_pl_rollups(self) -> Optional[Dict[str, pd.DataFrame]]:
+        """Period views of the fund's realized P&L (sum of every account's daily series), None if there is none yet"""
+        series = [session.pl_engine.daily() for session in self._sessions if not session.pl_engine.is_empty()]
+        if not series:
+            return None
+        if len(series) == 1:
+            return build_pl_rollups(series[0], datetime.now().date())
+        daily = pd.concat(series, axis=1).fillna(0.0).sum(axis=1)
+        return build_pl_rollups(daily, datetime.now().date())
+    
+    def _unrealized_pl_rollups(self, balance: Optional[Mapping[str, float]]) -> Dict[str, pd.DataFrame]:
+        """No realized profits yet - create P&L based on unrealized gains from the fund balance"""
+        end_date = datetime.now().date()
+        total_unrealized_pl = float((balance or {}).get('total_pl', 0.0))
+        
+        # Distribute the unrealized P&L linearly across the last 30 days (not persisted)
+        # Simple linear distribution - in reality this would need historical data
+        days = 30
+        unrealized = pd.Series(np.full(days, total_unrealized_pl / days),
+                               index=pd.date_range(end=pd.Timestamp(end_date), periods=days, freq='D'))
+        
+        logger.info(f"Updated P&L data from unrealized gains: {days} days, current unrealized P&L: ₩{total_unrealized_pl:,.0f}")
+        return build_pl_rollups(unrealized, end_date)
     
-    def _refresh_benchmark_data(self):
-        """Refresh benchmark comparison data (mock for now)"""
-        # TODO: Integrate with actual market data providers (Yahoo Finance, etc.)
+    def _refresh_benchmark_data(self, fetch: bool = True, positions: Optional[pd.DataFrame] = None,
+                                transactions: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Bring the local benchmark cache up to date (only missing days are fetched), chain new days onto the
+        portfolio's TWR index and rebuild the comparison frame - republished only when a value changed,
+        so idle cycles cost no new snapshot. Positions/transactions default to the published ones.
+        """
         try:
-            days = 30
-            dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-            
-            # Mock benchmark data - replace with real market data API
-            import numpy as np
-            np.random.seed(int(time.time()) % 1000)  # Semi-random but stable for short periods
-            
-            benchmarks = {
-                "Portfolio": np.cumsum(np.random.normal(0.2, 1.2, days)),
-                "KOSPI": np.cumsum(np.random.normal(0.1, 1.0, days)),
-                "KOSPI 200": np.cumsum(np.random.normal(0.08, 0.9, days)),
-                "KOSDAQ": np.cumsum(np.random.normal(0.3, 1.5, days)),
-                "S&P 500": np.cumsum(np.random.normal(0.15, 0.8, days)),
-                "DJIA": np.cumsum(np.random.normal(0.12, 0.7, days)),
-                "USD/KRW": np.cumsum(np.random.normal(-0.05, 0.3, days))
-            }
+            end = datetime.now().date()
+            start = end - timedelta(days=BENCHMARK_WINDOW_DAYS)
+            risk_start = end - timedelta(days=RISK_WINDOW_DAYS)
+            changed = (self._benchmarks.update(start, end, today=end, starts={self._market_benchmark: risk_start})
+                       if fetch else 0)
+            changed += self._refresh_portfolio_returns(
+                start, end, fetch,
+                self._snapshot.positions if positions is None else positions,
+                self._snapshot.transactions if transactions is None else transactions
+            )
+            if not changed and self._benchmark_window == start and self._snapshot.benchmark_data is not None:
+                return {}
             
-            df = pd.DataFrame(benchmarks)
-            df['Date'] = dates
-            self._cached_data['benchmark_data'] = df
+            df = self._benchmarks.performance(start, end)
+            df.insert(1, 'Portfolio', self._portfolio_returns.performance_on(df['Date']))
+            self._benchmark_window = start
+            return {'benchmark_data': df}
             
         except Exception as e:
             logger.error(f"Error refreshing benchmark data: {e}")
+            return {}
     
-    # Data getter methods
-    def get_positions_data(self) -> pd.DataFrame:
-        """Get cached positions data"""
-        if self._cached_data['positions'] is not None and len(self._cached_data['positions']) > 0:
-            return self._cached_data['positions'].copy()
-        
-        # If no cached data and not connected, try to refresh once
-        if not self._is_connected or self._cached_data['positions'] is None:
-            logger.info("No cached positions data, attempting to refresh...")
-            self.refresh_all_data(force=True)
-            
-        # Return cached data if available after refresh, otherwise empty DataFrame
-        if self._cached_data['positions'] is not None:
-            return self._cached_data['positions'].copy()
-        else:
-            # Return empty DataFrame with correct structure
-            return pd.DataFrame(columns=['Symbol', 'Quantity', 'Price', 'Market_Value', 'PL', 'PL_Percent'])
+    def _refresh_portfolio_returns(self, start, end, fetch: bool, positions: Optional[pd.DataFrame],
+                                   transactions: Optional[pd.DataFrame]) -> int:
+        """Update the daily NAV/TWR of the consolidated holdings for the days not settled yet; returns days changed"""
+        if positions is None or transactions is None:
+            return 0
+        first, last = self._portfolio_returns.pending_range(start, end)
+        traded = transactions['Code'][transactions['Date'] >= first.strftime('%Y.%m.%d')]
+        codes = list(dict.fromkeys([*positions['Code'], *traded]))
+        lookback = first - timedelta(days=PRICE_LOOKBACK_DAYS)
+        if fetch:
+            self._bars.fill(codes, 'day', as_datetime(lookback), as_datetime(last))
+        closes = self._bars.closes(codes, lookback, as_datetime(last))
+        return self._portfolio_returns.update(positions, transactions, closes, start, end)
     
-    def get_balance_data(self) -> Dict[str, Any]:
-        """Get cached balance data"""
-        if self._cached_data['balance'] is not None:
-            return self._cached_data['balance'].copy()
-        
-        # If no cached data, try to refresh once
-        if not self._is_connected or self._cached_data['balance'] is None:
-            logger.info("No cached balance data, attempting to refresh...")
-            self.refresh_all_data(force=True)
+    def _refresh_price_history(self, fetch: bool = True, positions: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Fill the bar store with a year of daily bars for every held code and publish their closes plus the
+        market's (MARKET_PROXY column, read from the benchmark cache) for risk analytics - only when they changed
+        """
+        try:
+            positions = self._snapshot.positions if positions is None else positions
+            if positions is None:
+                return {}
+            end = datetime.now().date()
+            start = end - timedelta(days=RISK_WINDOW_DAYS)
+            codes = [code for code in dict.fromkeys(positions['Code']) if code != MARKET_PROXY]
+            if fetch:
+                self._bars.fill(codes, 'day', as_datetime(start), as_datetime(end))
             
-        # Return cached data if available after refresh, otherwise defaults
-        if self._cached_data['balance'] is not None:
-            return self._cached_data['balance'].copy()
-        else:
-            return {
-                'available_cash': 0.0,
-                'total_assets': 0.0,
-                'total_pl': 0.0,
-                'total_pl_percent': 0.0
-            }
+            # The market proxy's closes are already cached by the benchmark pipeline; never fetched twice
+            market = self._benchmarks.cache.closes([self._market_benchmark], start, end)[self._market_benchmark]
+            closes = self._bars.closes(codes, start, as_datetime(end)).reindex(columns=codes)
+            history = closes.join(market.rename(MARKET_PROXY), how='outer').rename_axis(index=None)
+            history.insert(0, 'Date', history.index)
+            history = history.reset_index(drop=True)
+            current = self._snapshot.price_history
+            if current is not None and history.equals(current):
+                return {}
+            return {'price_history': history}
+        
+        except Exception as e:
+            logger.error(f"Error refreshing price history: {e}")
+            return {}
     
-    def get_pl_data(self, period: str = "Daily") -> pd.DataFrame:
-        """Get cached P&L data"""
-        if self._cached_data['pl_data'] is not None and len(self._cached_data['pl_data']) > 0:
-            return self._cached_data['pl_data'].copy()
-        
-        # If no cached data, try to refresh once
-        if not self._is_connected or self._cached_data['pl_data'] is None:
-            logger.info("No cached P&L data, attempting to refresh...")
-            self.refresh_all_data(force=True)
-            
-        # Return cached data if available after refresh, otherwise create basic structure
-        if self._cached_data['pl_data'] is not None and len(self._cached_data['pl_data']) > 0:
-            return self._cached_data['pl_data'].copy()
-        else:
-            # Create minimal P&L data structure
-            days = 7 if period == "Daily" else (30 if period == "MTD" else 365)
-            dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-            return pd.DataFrame({
-                'Date': dates,
-                'Daily_PL': [0.0] * days,
-                'PL': [0.0] * days
-            })
+    # Real-time streaming
+    def is_streaming(self) -> bool:
+        """Check if real-time price subscriptions are active"""
+        return bool(self._price_tickets)
     
-    def get_transactions_data(self) -> pd.DataFrame:
-        """Get cached transactions data"""
-        if self._cached_data['transactions'] is not None and len(self._cached_data['transactions']) > 0:
-            return self._cached_data['transactions'].copy()
+    def _sync_price_subscriptions(self, symbols):
+        """Subscribe to real-time prices for held symbols and drop symbols no longer held"""
+        if not self._kis:
+            return
+        
+        wanted = list(dict.fromkeys(symbols))[:MAX_REALTIME_SUBSCRIPTIONS]
+        if len(symbols) > MAX_REALTIME_SUBSCRIPTIONS:
+            logger.warning(f"{len(symbols)} positions exceed the {MAX_REALTIME_SUBSCRIPTIONS} real-time slots; "
+                           f"the rest fall back to polling")
         
-        # If no cached data, try to refresh once
-        if not self._is_connected or self._cached_data['transactions'] is None:
-            logger.info("No cached transactions data, attempting to refresh...")
-            self.refresh_all_data(force=True)
+        with self._stream_lock:
+            if self._price_session is not self._market_session:
+                # The market session changed (reconnect, failover): tickets on the old one no longer stream
+                self._unsubscribe_all()
+                self._price_session = self._market_session
             
-        # Return cached data if available after refresh, otherwise empty DataFrame
-        if self._cached_data['transactions'] is not None:
-            return self._cached_data['transactions'].copy()
-        else:
-            return pd.DataFrame(columns=['Date', 'Time', 'TX_ID', 'Symbol', 'Type', 'Quantity', 'Price', 'Total', 'Team'])
-    
-    def get_benchmark_data(self) -> pd.DataFrame:
-        """Get cached benchmark data"""
-        if self._cached_data['benchmark_data'] is not None:
-            return self._cached_data['benchmark_data'].copy()
+            for symbol in set(self._price_tickets) - set(wanted):
+                try:
+                    self._price_tickets.pop(symbol).unsubscribe()
+                except Exception as e:
+                    logger.warning(f"Could not unsubscribe real-time price for {symbol}: {e}")
+            
+            for symbol in wanted:
+                if symbol in self._price_tickets:
+                    continue
+                try:
+                    self._price_tickets[symbol] = self._kis.stock(symbol).on("price", self._on_realtime_price)
+                except Exception as e:
+                    logger.warning(f"Could not subscribe real-time price for {symbol}: {e}")
         
-        # Refresh benchmark data if not available
-        self._refresh_benchmark_data()
+        logger.info(f"Streaming real-time prices for {len(self._price_tickets)} symbols")
+    
+    def _stop_streaming(self):
+        """Unsubscribe every real-time price ticket"""
+        with self._stream_lock:
+            self._unsubscribe_all()
+            self._price_session = None
+    
+    def _unsubscribe_all(self):
+        """Drop every real-time price ticket (caller holds _stream_lock)"""
+        for symbol, ticket in self._price_tickets.items():
+            try:
+                ticket.unsubscribe()
+            except Exception as e:
+                logger.debug(f"Could not unsubscribe real-time price for {symbol}: {e}")
+        self._price_tickets.clear()
+    
+    def _on_realtime_price(self, sender: "KisWebsocketClient", e: "KisSubscriptionEventArgs[KisRealtimePrice]"):
+        """Apply one real-time price tick to quotes, position market value and P&L"""
+        try:
+            tick = e.response
+            symbol = tick.symbol
+            price = float(tick.price)
+            
+            def apply_tick(current: DataSnapshot) -> Dict[str, Any]:
+                changes = {'quotes': {**current.quotes, symbol: {
+                    'price': price,
+                    'change': float(tick.change),
+                    'rate': float(tick.rate),
+                    'volume': int(tick.volume),
+                    'market_cap': current.quotes.get(symbol, {}).get('market_cap', 0.0),
+                    'timestamp': datetime.now()
+                }}}
+                
+                positions = current.positions
+                if positions is None or 'Code' not in positions.columns:
+                    return changes
+                mask = positions['Code'] == symbol
+                if not mask.any():
+                    return changes
+                
+                # Updated copy; the published frame is never written in place
+                positions = positions.copy()
+                cost = positions.loc[mask, 'Market_Value'] - positions.loc[mask, 'PL']
+                market_value = positions.loc[mask, 'Quantity'] * price
+                positions.loc[mask, 'Price'] = price
+                positions.loc[mask, 'Market_Value'] = market_value
+                positions.loc[mask, 'PL'] = market_value - cost
+                positions.loc[mask, 'PL_Percent'] = ((market_value - cost) / cost.where(cost != 0) * 100).fillna(0.0)
+                changes['positions'] = positions
+                
+                # Balances of the accounts holding the symbol follow the repriced positions, and the fund totals them
+                account_balances = current.account_balances
+                if account_balances and 'Account' in positions.columns:
+                    repriced = set(positions.loc[mask, 'Account'])
+                    account_balances = {
+                        label: self._balance_at(balance, positions[positions['Account'] == label])
+                        if label in repriced else balance
+                        for label, balance in account_balances.items()
+                    }
+                    changes['account_balances'] = account_balances
+                    changes['balance'] = self._fund_balance(account_balances.values())
+                elif current.balance is not None:
+                    changes['balance'] = self._balance_at(current.balance, positions)
+                return changes
+            
+            self._publish(update=apply_tick)
         
-        if self._cached_data['benchmark_data'] is not None:
-            return self._cached_data['benchmark_data'].copy()
-        else:
-            # Return minimal benchmark structure
-            days = 30
-            dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-            return pd.DataFrame({
-                'Date': dates,
-                'Portfolio': [0.0] * days,
-                'KOSPI': [0.0] * days,
-                'KOSPI 200': [0.0] * days,
-                'KOSDAQ': [0.0] * days,
-                'S&P 500': [0.0] * days,
-                'DJIA': [0.0] * days,
-                'USD/KRW': [0.0] * days
-            })
+        except Exception as err:
+            logger.debug(f"Error applying real-time price tick: {err}")
+    
+    def get_transaction_history(self, start=None, end=None) -> pd.DataFrame:
+        """Query the full local transaction history of every account (optionally date-bounded) without hitting the API"""
+        return self._load_transaction_history(start=start, end=end)
     
+    def get_price_bars(self, symbol: str, interval: str = 'day', start=None, end=None) -> Bars:
+        """
+        Stored OHLCV bars of a symbol ('day' or '1m') in start..end as read-only NumPy arrays - never blocks;
+        spans not stored yet are fetched in the background and show up on a later call
+        """
+        if start is not None and end is not None and self._role == 'leader':
+            start, end = as_datetime(start), as_datetime(end)
+            if interval == 'day':
+                end = end.replace(hour=0, minute=0, second=0, microsecond=0)
+            if self._bars.missing_ranges(symbol, interval, start, end, datetime.now()):
+                self._request_bars(symbol, interval, start, end)
+        return self._bars.read(symbol, interval, start, end)
+    
+    def _request_bars(self, symbol: str, interval: str, start: datetime, end: datetime):
+        """Schedule a deduplicated background fill of one symbol's bars"""
+        key = (symbol, interval, start, end)
+        with self._bar_requests_lock:
+            future = self._bar_requests.get(key)
+            if future is not None and not future.done():
+                return
+            future = self._bar_executor.submit(self._bars.fill, [symbol], interval, start, end)
+            self._bar_requests[key] = future
+        future.add_done_callback(lambda _: self._bar_requests.pop(key, None))
+    
+    def shutdown(self):
+        """Stop every background thread and release API sessions (safe to call more than once)"""
+        self.stop_auto_refresh()
+        self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+        self._stop_streaming()
+        self._symbols.stop()
+        self._snapshot_store.stop()
+        self._account_executor.shutdown(wait=False, cancel_futures=True)
+        self._bar_executor.shutdown(wait=False, cancel_futures=True)
+        for session in self._sessions:
+            session.shutdown()
+        if self._leader_lock is not None:
+            self._leader_lock.release()
     
     def __del__(self):
         """Cleanup when service is destroyed"""
-        self.stop_auto_refresh()
+        self.shutdown()
 
 
-# Global data service instance
-_data_service_instance = None
-
-def get_data_service() -> DataService:
-    """Get singleton DataService instance"""
-    global _data_service_instance
-    if _data_service_instance is None:
-        _data_service_instance = DataService()
-    return _data_service_instance
+def get_data_service(secret_paths: Optional[List[str]] = None, data_dir: Optional[str] = None) -> SnapshotReader:
+    """
+    Get the process-wide data service for an account configuration (default: every account found by
+    discover_secret_files). Concurrent first calls share one instance; an instance built before this
+    module was reloaded is shut down and replaced instead of leaving its threads running.
+    With KSIF_COLLECTOR_URL set, the dashboard only reads from a separate collector (app/collector.py).
+    """
+    collector_url = os.getenv("KSIF_COLLECTOR_URL")
+    if collector_url:
+        # Imported here: remote_data_service builds on this module's snapshot types
+        from remote_data_service import RemoteDataService
+        return process_registry().get_or_create(
+            ('collector', collector_url),
+            lambda: RemoteDataService(collector_url),
+            is_current=lambda service: type(service) is RemoteDataService
+        )
+    
+    paths, directory = DataService.resolve_config(secret_paths=secret_paths, data_dir=data_dir)
+    key = (tuple(str(path.resolve()) for path in paths), str(directory.resolve()))
+    return process_registry().get_or_create(
+        key,
+        lambda: DataService(secret_paths=paths, data_dir=directory),
+        is_current=lambda service: type(service) is DataService
+    )
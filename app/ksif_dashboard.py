@@ -13,7 +13,10 @@ from datetime import datetime, timedelta
 import random
 
 # Import data service
-from data_service import get_data_service
+from data_service import TRANSACTION_PAGE_SIZE, enable_copy_on_write, get_data_service
+from refresh_scheduler import MIN_BASE_INTERVAL
+
+enable_copy_on_write()
 
 # Page configuration
 st.set_page_config(
@@ -133,87 +136,161 @@ def create_sidebar():
         
         st.markdown("---")
         
-        # Additional sidebar info
+        # Additional sidebar info - precomputed team aggregates
+        report = get_team_report()
         st.markdown("### 📊 Quick Stats")
-        st.metric("Total Teams", "5")
-        st.metric("Active Positions", "12")
-        st.metric("Today's Trades", "23")
+        st.metric("Total Teams", f"{len(report.teams)}")
+        st.metric("Active Positions", f"{report.positions['Code'].nunique()}")
+        st.metric("Today's Trades", f"{int(report.summary['Trades_Today'].sum())}")
     
     return st.session_state.current_page
 
 # Header with filters
+# The header and every widget are Streamlit fragments: interacting with one reruns only that fragment, not main().
+# Live ones also rerun on their own timer; what they read is cached per snapshot/dataset version,
+# so a tick without new data only redraws.
+STATUS_REFRESH_EVERY = "2s"
+POSITIONS_REFRESH_EVERY = "5s"  # streamed quotes
+PL_REFRESH_EVERY = "30s"
+TRANSACTIONS_REFRESH_EVERY = "30s"
+
+# Pages whose content depends on the header's date range and team filters
+FILTERED_PAGES = {"Transactions", "Teams"}
+
 def create_header():
     st.markdown('<div class="main-header">', unsafe_allow_html=True)
     
-    col1, col2, col3, col4, col5 = st.columns([3, 2, 1.5, 1.5, 1])
+    col1, col2, col3 = st.columns([3, 5, 1])
     
     with col1:
         st.markdown("# 📊 KSIF Dashboard")
     
     with col2:
+        header_filters()
+    
+    with col3:
+        data_status()
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    return st.session_state.date_range, st.session_state.team_filter, st.session_state.currency_filter
+
+def mark_header_filters_changed():
+    st.session_state.header_filters_changed = True
+
+@st.fragment
+def header_filters():
+    """Date range, team and currency controls - a change reruns the page only if the page uses it"""
+    col1, col2, col3 = st.columns([2, 1.5, 1.5])
+    
+    with col1:
         # Date range picker
         default_start = datetime.now() - timedelta(days=30)
         default_end = datetime.now()
-        date_range = st.date_input(
+        st.date_input(
             "📅 Date Range",
             value=(default_start, default_end),
-            key="date_range"
+            key="date_range",
+            on_change=mark_header_filters_changed
         )
     
-    with col3:
+    with col2:
         # Team filter
-        teams = ["All Teams", "Team Alpha", "Team Beta", "Team Gamma", "Team Delta"]
-        selected_team = st.selectbox("👥 Team", teams, key="team_filter")
+        teams = ["All Teams"] + get_data_service().get_teams()
+        st.selectbox("👥 Team", teams, key="team_filter", on_change=mark_header_filters_changed)
     
-    with col4:
+    with col3:
         # Currency filter
         currencies = ["KRW", "USD", "EUR", "JPY"]
-        selected_currency = st.selectbox("💰 Currency", currencies, key="currency_filter")
+        st.selectbox("💰 Currency", currencies, key="currency_filter")
     
-    with col5:
-        # Refresh button and status
-        st.markdown("##### 🔄 Data")
-        
-        # Get data service instance
-        data_service = get_data_service()
-        
-        # Manual refresh button
-        if st.button("🔄 Refresh", key="manual_refresh", help="Click to refresh all data immediately"):
-            # Trigger data refresh
-            data_service.refresh_all_data(force=True)
-            st.success("Data refreshed!")
-            st.rerun()
-        
-        # Show last update time
-        last_update = data_service.get_last_update()
-        if last_update:
-            st.caption(f"Updated: {last_update.strftime('%H:%M:%S')}")
-        else:
-            st.caption("Not updated yet")
-        
-        # Connection status indicator
-        if data_service.is_connected():
-            st.success("🟢 Connected")
-        else:
-            st.error("🔴 Disconnected")
+    if st.session_state.pop("header_filters_changed", False) and st.session_state.current_page in FILTERED_PAGES:
+        st.rerun()
+
+@st.fragment(run_every=STATUS_REFRESH_EVERY)
+def data_status():
+    """Refresh button, freshness and connection status, updated on its own timer"""
+    st.markdown("##### 🔄 Data")
     
-    st.markdown('</div>', unsafe_allow_html=True)
+    # Get data service instance
+    data_service = get_data_service()
     
-    return date_range, selected_team, selected_currency
+    # Manual refresh button - runs in the background, the page keeps serving cached data
+    if st.button("🔄 Refresh", key="manual_refresh", help="Click to refresh all data immediately"):
+        data_service.request_refresh(force=True)
+        st.toast("Refreshing data in the background...")
+    
+    # Show last update time and freshness
+    status = data_service.get_data_status()
+    if status.last_update:
+        st.caption(f"Updated: {status.last_update.strftime('%H:%M:%S')}")
+    else:
+        st.caption("Not updated yet")
+    if status.refreshing:
+        st.caption("⏳ Refreshing...")
+    elif status.restored:
+        st.caption("💾 Showing data saved by the last session")
+    elif status.state == 'stale':
+        st.caption("⚠️ Showing stale data")
+    
+    # Connection status indicator
+    if status.connection == 'connecting':
+        st.warning("🟡 Connecting...")
+    elif status.connection == 'follower':
+        st.info("🔗 Shared refresher")
+    elif status.connected and len(status.accounts) > 1:
+        connected_accounts = sum(status.accounts.values())
+        st.success(f"🟢 Connected ({connected_accounts}/{len(status.accounts)} accounts)")
+    elif status.connected:
+        st.success("🟢 Connected")
+    else:
+        st.error("🔴 Disconnected")
 
 # Data access functions - now using DataService
+# Formatted views are cached per dataset version, so reruns (widget clicks, period switches) and unrelated
+# updates such as streamed quotes reuse them - formatting is paid once per change of that dataset. The cached frame is shared, not copied - don't modify it in place.
+# The transaction grid formats only the page it shows, so it needs no cache.
+FORMATTED_VIEW_CACHE_ENTRIES = 4
+
+def format_won(values):
+    """₩ amounts with thousands separators (bound str.format per value - no Python lambda)"""
+    return values.map("₩{:,}".format)
+
+def format_percent(values):
+    """Percentages with two decimals"""
+    return values.map("{:.2f}%".format)
+
+@st.cache_resource(max_entries=FORMATTED_VIEW_CACHE_ENTRIES, show_spinner=False)
+def _formatted_positions(service_id, version, frame_id, _positions):
+    # The entry keeps its source frame alive, so frame_id can't be reused while it is cached
+    return _positions, _positions.assign(
+        Price_Formatted=format_won(_positions['Price']),
+        Market_Value_Formatted=format_won(_positions['Market_Value']),
+        PL_Formatted=format_won(_positions['PL']),
+        PL_Percent_Formatted=format_percent(_positions['PL_Percent'])
+    )
+
 def get_position_data():
-    """Get position data from DataService"""
+    """Get position data from DataService, with display columns formatted once per published frame"""
     data_service = get_data_service()
-    df = data_service.get_positions_data()
-    
-    # Format display columns
-    df['Price_Formatted'] = df['Price'].apply(lambda x: f"₩{x:,}")
-    df['Market_Value_Formatted'] = df['Market_Value'].apply(lambda x: f"₩{x:,}")
-    df['PL_Formatted'] = df['PL'].apply(lambda x: f"₩{x:,}")
-    df['PL_Percent_Formatted'] = df['PL_Percent'].apply(lambda x: f"{x:.2f}%")
-    
-    return df
+    # Frame and version come from one snapshot; the key also names the service, so a reloaded one never collides
+    snapshot = data_service.get_snapshot()
+    positions, frame_id = snapshot.positions, id(snapshot.positions)
+    if positions is None:
+        # Empty placeholder (schedules the load); one cache entry however often it is asked for
+        positions, frame_id = data_service.get_positions_data(), None
+    return _formatted_positions(id(data_service), snapshot.dataset_versions.get('positions', 0), frame_id,
+                                positions)[1].copy(deep=False)
+
+def get_risk_report():
+    """Get position weights and risk figures from DataService (only symbols whose price moved are recomputed)"""
+    data_service = get_data_service()
+    return data_service.get_risk_report()
+
+def get_team_report():
+    """Get per-team positions, P&L and trade counts from DataService (precomputed, not scanned here)"""
+    data_service = get_data_service()
+    return data_service.get_team_report()
 
 def get_balance_data():
     """Get balance data from DataService"""
@@ -225,16 +302,20 @@ def get_pl_data(period="Daily"):
     data_service = get_data_service()
     return data_service.get_pl_data(period)
 
-def get_transaction_data():
-    """Get transaction data from DataService"""
+def get_transaction_page(search_term="", tx_type="All", team=None, start=None, end=None, page=0):
+    """Get one page of filtered transactions from DataService (filtering runs on its index, not here)"""
     data_service = get_data_service()
-    df = data_service.get_transactions_data()
-    
-    # Format display columns
-    df['Price_Formatted'] = df['Price'].apply(lambda x: f"₩{x:,}")
-    df['Total_Formatted'] = df['Total'].apply(lambda x: f"₩{x:,}")
-    
-    return df
+    return data_service.query_transactions(search=search_term, tx_type=tx_type, team=team,
+                                           start=start, end=end, page=page)
+
+def query_filters(date_range, selected_team):
+    """(team, start, end) for data queries from the header controls; None means unfiltered"""
+    team = None if selected_team == "All Teams" else selected_team
+    # While a range is being picked the date input holds only its first day
+    dates = tuple(date_range) if isinstance(date_range, (tuple, list)) else (date_range,)
+    start = dates[0] if dates else None
+    end = dates[1] if len(dates) > 1 else start
+    return team, start, end
 
 def get_benchmark_data():
     """Get benchmark data from DataService"""
@@ -242,6 +323,7 @@ def get_benchmark_data():
     return data_service.get_benchmark_data()
 
 # Widget components
+@st.fragment(run_every=POSITIONS_REFRESH_EVERY)
 def position_summary_widget():
     """Position Summary Widget - Large card showing current positions"""
     st.markdown("### 💼 Position Summary")
@@ -253,8 +335,13 @@ def position_summary_widget():
     
     # Display table
     display_columns = ['Symbol', 'Quantity', 'Price_Formatted', 'Market_Value_Formatted', 'PL_Formatted', 'PL_Percent_Formatted']
+    column_labels = ['Symbol', 'Quantity', 'Price', 'Market Value', 'P&L', 'P&L %']
+    # Consolidated fund view: say which account holds each row when there is more than one
+    if df['Account'].nunique() > 1:
+        display_columns.append('Account')
+        column_labels.append('Account')
     display_df = df[display_columns].copy()
-    display_df.columns = ['Symbol', 'Quantity', 'Price', 'Market Value', 'P&L', 'P&L %']
+    display_df.columns = column_labels
     
     st.dataframe(
         display_df,
@@ -266,10 +353,11 @@ def position_summary_widget():
         }
     )
     
-    # Summary metrics from balance data
-    total_market_value = df['Market_Value'].sum()
-    total_pl = df['PL'].sum()
-    total_pl_percent = (total_pl / (total_market_value - total_pl)) * 100 if total_market_value > total_pl else 0
+    # Summary metrics from the risk engine's valuation
+    summary = get_risk_report().summary
+    total_market_value = summary['total_value']
+    total_pl = summary['total_pl']
+    total_pl_percent = summary['total_pl_percent']
     
     st.markdown("---")
     
@@ -292,6 +380,53 @@ def position_summary_widget():
     with col3:
         st.metric("Total P&L %", f"{total_pl_percent:.2f}%")
 
+@st.fragment(run_every=POSITIONS_REFRESH_EVERY)
+def position_risk_widget():
+    """Position Risk Widget - weights and risk per holding, portfolio risk and concentration"""
+    st.markdown("### 🛡️ Position Risk")
+    st.markdown("*Daily closes over the last year; VaR is one-day historical at 95%*")
+    
+    report = get_risk_report()
+    summary = report.summary
+    
+    def figure(value, fmt):
+        return "—" if pd.isna(value) else fmt.format(value)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Market Value", f"₩{summary['total_value']:,.0f}")
+        st.metric("Total P&L %", f"{summary['total_pl_percent']:.2f}%")
+    with col2:
+        st.metric("Volatility (ann.)", figure(summary['volatility'], "{:.2f}%"))
+        st.metric("Beta vs KOSPI", figure(summary['beta'], "{:.2f}"))
+    with col3:
+        st.metric("VaR 95% (1 day)", figure(summary['var'], "₩{:,.0f}"))
+        st.metric("Max Drawdown", figure(summary['max_drawdown'], "{:.2f}%"),
+                  delta=figure(summary['drawdown'], "{:.2f}% now"), delta_color="off")
+    with col4:
+        st.metric("Concentration (HHI)", f"{summary['hhi']:.3f}")
+        st.metric("Effective Holdings", f"{summary['effective_holdings']:.1f}",
+                  delta=f"Top 5: {summary['top5_weight']:.1f}%", delta_color="off")
+    
+    if summary['history_days'] == 0:
+        st.caption("Price history is still loading; volatility, beta, VaR and drawdown appear once it is cached.")
+    
+    st.dataframe(
+        report.positions.sort_values('Weight', ascending=False),
+        width='stretch',
+        hide_index=True,
+        column_config={
+            "Price": st.column_config.NumberColumn("Price", format="₩%d"),
+            "Market_Value": st.column_config.NumberColumn("Market Value", format="₩%d"),
+            "Weight": st.column_config.ProgressColumn("Weight", format="%.2f%%", min_value=0.0, max_value=100.0),
+            "Volatility": st.column_config.NumberColumn("Volatility (ann.)", format="%.2f%%"),
+            "Beta": st.column_config.NumberColumn("Beta", format="%.2f"),
+            "VaR": st.column_config.NumberColumn("VaR 95% (1d)", format="₩%d"),
+            "Max_Drawdown": st.column_config.NumberColumn("Max Drawdown", format="%.2f%%"),
+        }
+    )
+
+@st.fragment(run_every=PL_REFRESH_EVERY)
 def pl_report_widget():
     """Profit & Loss Report Widget"""
     st.markdown("### 📈 Profit & Loss Report")
@@ -301,23 +436,29 @@ def pl_report_widget():
     periods = ["Daily", "Weekly", "MTD", "YTD"]
     selected_period = st.radio("Period", periods, horizontal=True, key="pl_period")
     
-    # Get P&L data from DataService
+    # Get P&L data from DataService - one precomputed view per period
     pl_data = get_pl_data(selected_period)
+    period_labels = {
+        "Daily": ("the last 7 days", "Daily P&L"),
+        "Weekly": ("the last 12 weeks", "Weekly P&L"),
+        "MTD": ("month to date", "Daily P&L (MTD)"),
+        "YTD": ("year to date", "Daily P&L (YTD)")
+    }
+    period_text, chart_title = period_labels.get(selected_period, period_labels["Daily"])
     
     # Main P&L figure
-    current_pl = pl_data['Daily_PL'].tail(7).sum()  # Last 7 days
+    current_pl = pl_data['Daily_PL'].sum()
     pl_color = "#7ED321" if current_pl >= 0 else "#D0021B"
     
     st.markdown(f'<p style="font-size: 3rem; color: {pl_color}; font-weight: bold; margin: 0;">₩{current_pl:,.0f}</p>', unsafe_allow_html=True)
-    st.markdown(f"*Total P&L for the last 7 days*")
+    st.markdown(f"*Total P&L for {period_text}*")
     
     # Bar chart
-    recent_data = pl_data.tail(7)
     fig = px.bar(
-        recent_data, 
+        pl_data, 
         x='Date', 
         y='Daily_PL',
-        title="Daily P&L",
+        title=chart_title,
         color_discrete_sequence=['#2C3E50']
     )
     fig.update_layout(
@@ -330,7 +471,8 @@ def pl_report_widget():
     
     st.plotly_chart(fig, width='stretch')
 
-def transaction_history_widget():
+@st.fragment(run_every=TRANSACTIONS_REFRESH_EVERY)
+def transaction_history_widget(team=None, start=None, end=None):
     """Transaction History Widget"""
     st.markdown("### 📋 Transaction History")
     st.markdown("*Recent trades for the selected period*")
@@ -348,45 +490,50 @@ def transaction_history_widget():
         tx_types = ["All", "Buy", "Sell"]
         selected_type = st.selectbox("Type", tx_types, key="tx_type_filter")
     
-    # Get transaction data from DataService
-    df = get_transaction_data()
-    
-    # Apply filters
-    if search_term:
-        df = df[df['Symbol'].str.contains(search_term, case=False, na=False)]
+    # A new filter (here or in the header) starts again from the first page
+    filters = (search_term, selected_type, team, start, end)
+    if st.session_state.get("tx_filters") != filters:
+        st.session_state.tx_filters = filters
+        st.session_state.tx_page = 1
     
-    if selected_type != "All":
-        df = df[df['Type'] == selected_type]
+    # One page of the filtered history - render cost depends on the page size, not the history length
+    result = get_transaction_page(search_term, selected_type, team=team, start=start, end=end,
+                                  page=st.session_state.get("tx_page", 1) - 1)
     
-    # Group by date and display
-    if len(df) == 0:
+    if result.total == 0:
         st.info("No transactions found matching the current filters.")
         return
     
-    for date in df['Date'].unique():
-        st.markdown(f"**{date}**")
-        date_transactions = df[df['Date'] == date]
-        
-        for _, tx in date_transactions.iterrows():
-            type_color = "#7ED321" if tx['Type'] == "Buy" else "#D0021B"
-            
-            col1, col2, col3, col4 = st.columns([1, 2, 2, 1])
-            
-            with col1:
-                st.text(f"{tx['TX_ID']}\n{tx['Time']}")
-            
-            with col2:
-                st.text(f"{tx['Symbol']}")
-                st.markdown(f'<span style="color: {type_color}; font-weight: bold;">{tx["Type"]}</span>', unsafe_allow_html=True)
-            
-            with col3:
-                st.text(f"Qty: {tx['Quantity']:,}\nPrice: {tx['Price_Formatted']}\nTotal: {tx['Total_Formatted']}")
-            
-            with col4:
-                st.text(tx['Team'])
-        
-        st.markdown("---")
+    # Rows are newest first, so each day's trades stay together in the grid
+    rows = result.rows
+    display_df = rows.assign(Price=format_won(rows['Price']), Total=format_won(rows['Total']))[
+        ['Date', 'Time', 'TX_ID', 'Symbol', 'Type', 'Quantity', 'Price', 'Total', 'Team', 'Account']
+    ]
+    
+    def type_color(tx_type):
+        return f"color: {'#7ED321' if tx_type == 'Buy' else '#D0021B'}; font-weight: bold"
+    
+    st.dataframe(
+        display_df.style.map(type_color, subset=['Type']),
+        width='stretch',
+        hide_index=True,
+        column_config={
+            "TX_ID": st.column_config.TextColumn("TX ID"),
+            "Quantity": st.column_config.NumberColumn("Qty", format="%d")
+        }
+    )
+    
+    # Pager - clamp first, in case the filtered history got shorter than the remembered page
+    st.session_state.tx_page = result.page + 1
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Page", min_value=1, max_value=result.page_count, step=1, key="tx_page")
+    with col2:
+        first_row = result.page * TRANSACTION_PAGE_SIZE + 1
+        st.caption(f"Showing {first_row:,}–{first_row + len(rows) - 1:,} of {result.total:,} transactions "
+                   f"(page {result.page + 1} of {result.page_count})")
 
+@st.fragment
 def benchmark_comparison_widget():
     """Benchmark Comparison Widget"""
     st.markdown("### 📊 Benchmark Comparison")
@@ -454,21 +601,19 @@ def dashboard_page():
             pl_report_widget()
 
 def positions_page():
-    """Positions page - detailed portfolio view"""
+    """Positions page - detailed portfolio view with risk analytics"""
     st.markdown("# 💼 Positions")
-    st.info("Detailed positions view would be implemented here")
     
-    # For now, show the position summary widget
     with st.container():
-        position_summary_widget()
+        position_risk_widget()
 
-def transactions_page():
-    """Transactions page with transaction history"""
+def transactions_page(team=None, start=None, end=None):
+    """Transactions page with transaction history for the header's team and date range"""
     st.markdown("# 📋 Transactions")
     
     # Transaction History (moved from dashboard)
     with st.container():
-        transaction_history_widget()
+        transaction_history_widget(team, start, end)
 
 def reports_page():
     """Reports page with benchmark comparison and other reports"""
@@ -478,31 +623,42 @@ def reports_page():
     with st.container():
         benchmark_comparison_widget()
 
-def teams_page():
-    """Teams page"""
+def teams_page(team=None):
+    """Teams page - per-team holdings, P&L and trading activity (the header's team filter narrows it)"""
     st.markdown("# 👥 Teams")
-    st.info("Team management interface would be implemented here")
     
-    # Placeholder content
-    col1, col2, col3 = st.columns(3)
+    report = get_team_report()
+    summary = report.summary if team is None else report.summary[report.summary['Team'] == team]
+    if summary.empty:
+        st.info("No team data yet - teams come from teams.json and the attributed transaction history")
+        return
     
-    with col1:
-        st.markdown("### Team Alpha")
-        st.metric("Members", "5")
-        st.metric("Active Positions", "8") 
-        st.metric("Total P&L", "₩15,200,000")
+    # One card per team, three per row
+    rows = summary.to_dict('records')
+    for start in range(0, len(rows), 3):
+        for col, row in zip(st.columns(3), rows[start:start + 3]):
+            with col:
+                st.markdown(f"### {row['Team']}")
+                st.metric("Active Positions", f"{row['Positions']}")
+                st.metric("Total P&L", f"₩{row['Total_PL']:,.0f}",
+                          delta=f"Realized ₩{row['Realized_PL']:,.0f}", delta_color="off")
+                st.metric("Unrealized P&L", f"₩{row['Unrealized_PL']:,.0f}", delta=f"{row['Return_Percent']:.2f}%")
+                st.metric("Trades", f"{row['Trades']:,}", delta=f"{row['Trades_Today']} today", delta_color="off")
     
-    with col2:
-        st.markdown("### Team Beta")
-        st.metric("Members", "4")
-        st.metric("Active Positions", "6")
-        st.metric("Total P&L", "₩-2,800,000")
-    
-    with col3:
-        st.markdown("### Team Gamma")
-        st.metric("Members", "3")
-        st.metric("Active Positions", "4")
-        st.metric("Total P&L", "₩8,900,000")
+    st.markdown("---")
+    st.markdown("### Team Holdings")
+    positions = report.positions if team is None else report.positions[report.positions['Team'] == team]
+    st.dataframe(
+        positions,
+        width='stretch',
+        hide_index=True,
+        column_config={
+            "Price": st.column_config.NumberColumn("Price", format="₩%d"),
+            "Market_Value": st.column_config.NumberColumn("Market Value", format="₩%d"),
+            "Cost": st.column_config.NumberColumn("Cost", format="₩%d"),
+            "Unrealized_PL": st.column_config.NumberColumn("Unrealized P&L", format="₩%d"),
+        }
+    )
 
 def settings_page():
     """Settings page"""
@@ -516,11 +672,17 @@ def settings_page():
     
     with col1:
         st.selectbox("Default Currency", ["KRW", "USD", "EUR", "JPY"], key="settings_currency")
-        st.selectbox("Default Team", ["All Teams", "Team Alpha", "Team Beta", "Team Gamma"], key="settings_team")
+        st.selectbox("Default Team", ["All Teams"] + get_data_service().get_teams(), key="settings_team")
         st.selectbox("Theme", ["Light", "Dark"], key="settings_theme")
     
     with col2:
-        st.number_input("Refresh Interval (seconds)", min_value=1, max_value=300, value=30, key="settings_refresh")
+        # Base cadence for live quotes; balance, orders and P&L refresh at multiples of it
+        data_service = get_data_service()
+        st.number_input(
+            "Refresh Interval (seconds)", min_value=int(MIN_BASE_INTERVAL), max_value=300,
+            value=int(data_service.get_refresh_interval()), key="settings_refresh",
+            on_change=lambda: data_service.set_refresh_interval(st.session_state.settings_refresh)
+        )
         st.checkbox("Enable Notifications", value=True, key="settings_notifications")
         st.checkbox("Show Advanced Features", value=False, key="settings_advanced")
 
@@ -538,11 +700,11 @@ def main():
     elif current_page == "Positions":
         positions_page()
     elif current_page == "Transactions":
-        transactions_page()
+        transactions_page(*query_filters(date_range, selected_team))
     elif current_page == "Reports":
         reports_page()
     elif current_page == "Teams":
-        teams_page()
+        teams_page(query_filters(date_range, selected_team)[0])
     elif current_page == "Settings":
         settings_page()
     
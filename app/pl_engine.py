@@ -0,0 +1,148 @@
+# ---
+# Purpose: P&L engine - turns realized-profit fills into daily P&L series and period rollups
+# Contents: profits_to_frame (one-pass columnar conversion), aggregate_daily_pl (vectorized groupby/reindex/cumsum),
+#           build_pl_rollups (Daily/Weekly/MTD/YTD views), PLEngine (persisted daily series per account)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import sqlite3
+import threading
+import logging
+from datetime import date, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PL_COLUMNS = ['Date', 'Daily_PL', 'PL']
+
+KST = timezone(timedelta(hours=9))
+
+PL_PERIODS = ("Daily", "Weekly", "MTD", "YTD")
+DAILY_WINDOW_DAYS = 7
+WEEKLY_WINDOW_WEEKS = 12
+
+
+def profits_to_frame(orders: Iterable[Any]) -> pd.DataFrame:
+    """
+    Convert KisOrderProfit-like objects to a columnar frame of (time, profit) in a single pass
+    """
+    times = []
+    profits = []
+    for order in orders:
+        order_time = getattr(order, 'time_kst', None)
+        if not order_time:
+            continue
+        # Bucket by KST trading day; keep naive timestamps so they line up with the date index
+        if order_time.tzinfo is not None:
+            order_time = order_time.astimezone(KST).replace(tzinfo=None)
+        times.append(order_time)
+        profits.append(getattr(order, 'profit', 0.0))
+
+    return pd.DataFrame({
+        'time': pd.to_datetime(pd.Series(times, dtype=object)),
+        'profit': pd.to_numeric(pd.Series(profits, dtype=object), errors='coerce').fillna(0.0).astype(float),
+    })
+
+
+def aggregate_daily_pl(fills: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+    """
+    Sum fills per calendar day over [start, end], filling empty days with 0 and adding cumulative P&L
+    """
+    days = pd.date_range(start, end, freq='D')
+    if fills.empty:
+        daily = pd.Series(0.0, index=days)
+    else:
+        daily = (
+            fills.groupby(fills['time'].dt.normalize())['profit'].sum()
+            .reindex(days, fill_value=0.0)
+        )
+
+    return pd.DataFrame({
+        'Date': days,
+        'Daily_PL': daily.to_numpy(dtype=float),
+        'PL': daily.cumsum().to_numpy(dtype=float),
+    })
+
+
+def build_pl_rollups(daily: pd.Series, today: date) -> Dict[str, pd.DataFrame]:
+    """
+    Precompute every period view from a daily P&L series indexed by day
+    Each view has Date, Daily_PL (P&L of the bucket) and PL (cumulative within the view)
+    """
+    today_ts = pd.Timestamp(today)
+    days = pd.date_range(min(daily.index.min(), today_ts) if len(daily) else today_ts, today_ts, freq='D')
+    daily = daily.reindex(days, fill_value=0.0).astype(float)
+
+    def view(series: pd.Series) -> pd.DataFrame:
+        return pd.DataFrame({
+            'Date': series.index,
+            'Daily_PL': series.to_numpy(),
+            'PL': series.cumsum().to_numpy(),
+        })
+
+    weekly = daily.resample('W-SUN').sum()
+    return {
+        "Daily": view(daily.loc[today_ts - pd.Timedelta(days=DAILY_WINDOW_DAYS - 1):]),
+        "Weekly": view(weekly.iloc[-WEEKLY_WINDOW_WEEKS:]),
+        "MTD": view(daily.loc[today_ts.replace(day=1):]),
+        "YTD": view(daily.loc[today_ts.replace(month=1, day=1):]),
+    }
+
+
+class PLEngine:
+    """
+    Persisted daily realized P&L series of one account; the fund's period rollups are built from the
+    consolidated series (build_pl_rollups)
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._init_db()
+        self._daily = self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        """Create the daily P&L table if needed"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS daily_pl (day TEXT PRIMARY KEY, pl REAL NOT NULL)")
+
+    def _load(self) -> pd.Series:
+        """Load the persisted daily series"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT day, pl FROM daily_pl ORDER BY day").fetchall()
+        if not rows:
+            return pd.Series(dtype=float)
+        return pd.Series([pl for _, pl in rows], index=pd.to_datetime([day for day, _ in rows]), dtype=float)
+
+    def is_empty(self) -> bool:
+        """True until any non-zero realized P&L has been recorded"""
+        return not (self._daily != 0).any()
+
+    def backfill_start(self, today: date) -> date:
+        """First day to request from the API: the last stored day (still changing) or the YTD/30-day horizon"""
+        if len(self._daily):
+            return min(self._daily.index.max().date(), today)
+        return min(today.replace(month=1, day=1), today - timedelta(days=30))
+
+    def merge(self, window: pd.DataFrame):
+        """Overwrite the days covered by a freshly aggregated window (Date, Daily_PL)"""
+        update = pd.Series(window['Daily_PL'].to_numpy(dtype=float), index=pd.DatetimeIndex(window['Date']))
+        with self._lock:
+            daily = update.combine_first(self._daily).sort_index()
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO daily_pl (day, pl) VALUES (?, ?)",
+                    [(day.strftime('%Y-%m-%d'), float(pl)) for day, pl in update.items()]
+                )
+            self._daily = daily
+
+    def daily(self) -> pd.Series:
+        """The persisted daily realized P&L series (for consolidating several accounts)"""
+        return self._daily
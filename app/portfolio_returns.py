@@ -0,0 +1,190 @@
+# ---
+# Purpose: Portfolio returns - daily NAV of the fund's holdings and its time-weighted return, updated day by day
+# Contents: holdings_by_day (current positions rolled back through fills), flow_weights (share of the session left
+#           after each fill), daily_twr (modified Dietz daily returns),
+#           PortfolioReturnEngine (persisted NAV/TWR index; recomputes only days not yet settled)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import sqlite3
+import threading
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from refresh_scheduler import KRX_CLOSE, KRX_OPEN
+
+logger = logging.getLogger(__name__)
+
+# Today's NAV moves with intraday closes, and fills of a day keep arriving until the next one
+SETTLING_DAYS = 1
+
+
+def _fill_days(transactions: pd.DataFrame) -> pd.Series:
+    """Trading day of each fill ('YYYY.MM.DD' in the dashboard layout)"""
+    return pd.to_datetime(transactions['Date'], format='%Y.%m.%d', errors='coerce')
+
+
+def holdings_by_day(positions: pd.DataFrame, fills: pd.DataFrame, days: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    End-of-day quantity per code on each day: today's positions minus every fill dated after that day.
+    `fills` needs Day (Timestamp), Code and signed Quantity (buys positive) for at least the days after days[0].
+    """
+    current = positions.groupby('Code')['Quantity'].sum()
+    fills = fills[fills['Day'] > days[0]]
+    net = (fills.pivot_table(index='Day', columns='Code', values='Quantity', aggfunc='sum')
+           .reindex(days, fill_value=0.0).fillna(0.0))
+    codes = current.index.union(net.columns)
+    net = net.reindex(columns=codes, fill_value=0.0)
+    # Fills strictly after each day: reverse cumulative sum, shifted by one day
+    after = net.iloc[::-1].cumsum().iloc[::-1].shift(-1, fill_value=0.0)
+    # Positions opened before the stored history began would go negative; they count as flat
+    return (current.reindex(codes, fill_value=0.0) - after).clip(lower=0.0)
+
+
+def flow_weights(times: pd.Series) -> np.ndarray:
+    """
+    Share of the KRX session still ahead at each fill time ('HH:MM'): 1 at the open, 0 at the close.
+    Fills without a usable time count as made at the close.
+    """
+    parsed = pd.to_datetime(times.astype(str), format='%H:%M', errors='coerce')
+    minutes = (parsed.dt.hour * 60 + parsed.dt.minute).to_numpy(dtype=float)
+    open_minutes = KRX_OPEN.hour * 60 + KRX_OPEN.minute
+    close_minutes = KRX_CLOSE.hour * 60 + KRX_CLOSE.minute
+    weights = np.clip((close_minutes - minutes) / (close_minutes - open_minutes), 0.0, 1.0)
+    return np.nan_to_num(weights, nan=0.0)
+
+
+def daily_twr(values: np.ndarray, buys: np.ndarray, sells: np.ndarray, previous_value: float,
+              weighted_flows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Daily time-weighted returns of a holdings NAV series (modified Dietz). Purchases are money put into
+    the holdings and sales money taken out, so trading itself is no return; each flow is invested for the
+    share of the day left after it (`weighted_flows` = sum of weight x amount, buys positive, sells negative;
+    None = every flow at the close): r = (V_t + sells_t - buys_t - V_t-1) / (V_t-1 + weighted_flows_t),
+    0 on days with nothing invested
+    """
+    previous = np.concatenate(([previous_value], values[:-1]))
+    invested = previous + (weighted_flows if weighted_flows is not None else 0.0)
+    gain = values + sells - buys - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(invested > 0, gain / invested, 0.0)
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class PortfolioReturnEngine:
+    """
+    Persisted daily NAV and cumulative TWR index (1.0 at the first day) of the consolidated holdings.
+    Each update recomputes only the days from the last unsettled one onwards and chains them onto the
+    stored index, so history is never replayed.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._init_db()
+        self._nav = self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        """Create the NAV table if needed"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS nav ("
+                "day TEXT PRIMARY KEY, value REAL NOT NULL, buys REAL NOT NULL, sells REAL NOT NULL, "
+                "twr_index REAL NOT NULL)"
+            )
+
+    def _load(self) -> pd.DataFrame:
+        """Load the persisted NAV series (indexed by day)"""
+        with self._connect() as conn:
+            nav = pd.read_sql_query("SELECT day, value, buys, sells, twr_index FROM nav ORDER BY day", conn)
+        nav.index = pd.to_datetime(nav.pop('day'))
+        return nav.rename_axis(None).astype(float)
+
+    def nav(self) -> pd.DataFrame:
+        """Stored series: value, buys, sells, twr_index per day"""
+        return self._nav
+
+    def pending_range(self, start: date, today: date) -> Tuple[date, date]:
+        """
+        Days the next update computes: from the first unsettled stored day through today, or from `start`
+        when nothing is stored or `start` is earlier than the stored history (a rebuild)
+        """
+        if self._nav.empty or pd.Timestamp(start) < self._nav.index[0]:
+            return start, today
+        last = self._nav.index[-1].date()
+        return min(last, today - timedelta(days=SETTLING_DAYS)), today
+
+    def update(self, positions: pd.DataFrame, transactions: pd.DataFrame, closes: pd.DataFrame,
+               start: date, today: date) -> int:
+        """
+        Recompute the pending days from positions, fills and daily closes (index day, one column per code,
+        including a few days before the range so gaps can carry the last close forward); returns how many
+        stored days changed
+        """
+        first, last = self.pending_range(start, today)
+        days = pd.date_range(first, last, freq='D')
+
+        fills = transactions.assign(Day=_fill_days(transactions))
+        fills = fills[fills['Day'] >= days[0]]
+        sign = np.where(fills['Type'] == 'Sell', -1.0, 1.0)
+        fills = fills.assign(Quantity=fills['Quantity'].astype(float) * sign)
+
+        holdings = holdings_by_day(positions, fills, days)
+        # Prefer the day's close; carry the last one over holidays; never-quoted codes use today's price
+        prices = (closes.reindex(columns=holdings.columns).sort_index().ffill()
+                  .reindex(days, method='ffill'))
+        latest = positions.groupby('Code')['Price'].last().reindex(holdings.columns)
+        prices = prices.fillna(latest)
+        values = (holdings * prices.fillna(0.0)).sum(axis=1).to_numpy()
+
+        amounts = fills['Total'].astype(float).abs()
+        buys = amounts.where(fills['Quantity'] > 0, 0.0).groupby(fills['Day']).sum().reindex(days, fill_value=0.0)
+        sells = amounts.where(fills['Quantity'] < 0, 0.0).groupby(fills['Day']).sum().reindex(days, fill_value=0.0)
+        times = fills['Time'] if 'Time' in fills else pd.Series('', index=fills.index)
+        weighted = ((amounts * np.sign(fills['Quantity']) * flow_weights(times)).groupby(fills['Day']).sum()
+                    .reindex(days, fill_value=0.0))
+
+        with self._lock:
+            rebuild = self._nav.empty or days[0] <= self._nav.index[0]
+            before = self._nav.iloc[0:0] if rebuild else self._nav[self._nav.index < days[0]]
+            previous_value = float(before['value'].iloc[-1]) if len(before) else 0.0
+            previous_index = float(before['twr_index'].iloc[-1]) if len(before) else 1.0
+
+            returns = daily_twr(values, buys.to_numpy(), sells.to_numpy(), previous_value, weighted.to_numpy())
+            computed = pd.DataFrame({
+                'value': values, 'buys': buys.to_numpy(), 'sells': sells.to_numpy(),
+                'twr_index': previous_index * np.cumprod(1.0 + returns),
+            }, index=days)
+
+            stored = self._nav.reindex(days)
+            changed = int((~np.isclose(stored.to_numpy(dtype=float), computed.to_numpy(), rtol=1e-12,
+                                       equal_nan=False)).any(axis=1).sum())
+            if changed:
+                with self._connect() as conn:
+                    if rebuild:
+                        conn.execute("DELETE FROM nav")
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO nav (day, value, buys, sells, twr_index) VALUES (?, ?, ?, ?, ?)",
+                        [(day.strftime('%Y-%m-%d'), *map(float, row)) for day, row in
+                         zip(days, computed.itertuples(index=False))]
+                    )
+                self._nav = pd.concat([before, computed]).astype(float)
+        return changed
+
+    def performance_on(self, dates: Iterable) -> np.ndarray:
+        """TWR in % since the first of `dates`, on those dates (last known day carried forward, NaN before any)"""
+        dates = pd.DatetimeIndex(pd.to_datetime(list(dates))).normalize()
+        index = self._nav['twr_index'].reindex(dates, method='ffill').to_numpy(dtype=float)
+        known = np.flatnonzero(~np.isnan(index))
+        if len(known) == 0:
+            return index
+        return (index / index[known[0]] - 1.0) * 100.0
@@ -0,0 +1,137 @@
+# ---
+# Purpose: Refresh scheduler - per-dataset polling cadences aware of KRX trading hours
+# Contents: RefreshJob, RefreshScheduler, is_krx_open (09:00-15:30 KST, weekends and configured holidays closed)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+KRX_OPEN = dt_time(9, 0)
+KRX_CLOSE = dt_time(15, 30)
+
+# Base cadence in seconds; with balance at 2x base the default matches the old 120s poll that kept
+# every account under the KIS rate limits, and the floor keeps runtime changes from exceeding them
+DEFAULT_BASE_INTERVAL = 60.0
+MIN_BASE_INTERVAL = 30.0
+
+
+def is_krx_open(now: Optional[datetime] = None, holidays: Iterable[date] = ()) -> bool:
+    """Check whether the KRX regular session is open at `now` (defaults to current KST time)"""
+    now = now.astimezone(KST) if now and now.tzinfo else (now or datetime.now(KST))
+    if now.weekday() >= 5 or now.date() in set(holidays):
+        return False
+    return KRX_OPEN <= now.time() <= KRX_CLOSE
+
+
+@dataclass
+class RefreshJob:
+    """
+    One dataset's cadence: `interval_factor` x the base interval while the market is open,
+    `off_hours_interval` seconds when closed (None = don't poll until the next open).
+    A job without interval_factor runs every `off_hours_interval` seconds regardless of the session.
+    """
+    name: str
+    interval_factor: Optional[float]
+    priority: int
+    off_hours_interval: Optional[float] = None
+    last_run: Optional[float] = None  # time.monotonic() of the last completed run
+
+
+# Quotes move tick by tick, balances and orders move with fills, realized P&L only on sells,
+# and symbol names almost never - so each gets its own share of the API budget
+DEFAULT_JOBS = (
+    RefreshJob('quotes', interval_factor=1, priority=0),
+    RefreshJob('balance', interval_factor=2, priority=1, off_hours_interval=3600),
+    RefreshJob('orders', interval_factor=4, priority=2, off_hours_interval=3600),
+    RefreshJob('profits', interval_factor=10, priority=3, off_hours_interval=3 * 3600),
+    RefreshJob('benchmark', interval_factor=10, priority=4, off_hours_interval=3 * 3600),
+    RefreshJob('symbols', interval_factor=None, priority=5, off_hours_interval=24 * 3600),
+)
+
+
+class RefreshScheduler:
+    """
+    Decides which datasets are due; the caller runs them and reports back with mark_run()
+    """
+
+    def __init__(self, base_interval: float = DEFAULT_BASE_INTERVAL, jobs: Iterable[RefreshJob] = DEFAULT_JOBS,
+                 holidays: Iterable[date] = ()):
+        self._lock = threading.Lock()
+        if float(base_interval) < MIN_BASE_INTERVAL:
+            logger.warning(f"Refresh base interval {float(base_interval):.0f}s is below the "
+                           f"{MIN_BASE_INTERVAL:.0f}s minimum; using the minimum")
+        self._base_interval = max(MIN_BASE_INTERVAL, float(base_interval))
+        self._jobs: Dict[str, RefreshJob] = {
+            job.name: RefreshJob(job.name, job.interval_factor, job.priority, job.off_hours_interval)
+            for job in jobs
+        }
+        self.holidays = set(holidays)
+        self.changed = threading.Event()  # set when the cadence changes so waiters re-plan
+
+    @property
+    def base_interval(self) -> float:
+        return self._base_interval
+
+    def set_base_interval(self, seconds: float):
+        """Change the base cadence at runtime (e.g. from the Settings page); below MIN_BASE_INTERVAL is rejected"""
+        seconds = float(seconds)
+        if not seconds >= MIN_BASE_INTERVAL:
+            raise ValueError(f"Refresh interval must be at least {MIN_BASE_INTERVAL:.0f}s (got {seconds:g}s)")
+        with self._lock:
+            if seconds == self._base_interval:
+                return
+            self._base_interval = seconds
+        logger.info(f"Refresh base interval set to {seconds:.0f}s")
+        self.changed.set()
+
+    def market_open(self, now: Optional[datetime] = None) -> bool:
+        return is_krx_open(now, self.holidays)
+
+    def effective_interval(self, name: str, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds between runs of a dataset right now, or None if it isn't polled at this time"""
+        job = self._jobs[name]
+        if job.interval_factor is not None and self.market_open(now):
+            return job.interval_factor * self._base_interval
+        return job.off_hours_interval
+
+    def due_jobs(self, now: Optional[datetime] = None) -> List[str]:
+        """Names of datasets due for refresh, highest priority first"""
+        clock = time.monotonic()
+        due = []
+        with self._lock:
+            for job in sorted(self._jobs.values(), key=lambda j: j.priority):
+                interval = self.effective_interval(job.name, now)
+                if job.last_run is None or (interval is not None and clock - job.last_run >= interval):
+                    due.append(job.name)
+        return due
+
+    def mark_run(self, names: Iterable[str]):
+        """Record that datasets were refreshed"""
+        clock = time.monotonic()
+        with self._lock:
+            for name in names:
+                self._jobs[name].last_run = clock
+
+    def seconds_until_next_due(self, now: Optional[datetime] = None, cap: float = 60.0) -> float:
+        """Time to sleep before the next dataset is due (capped so market open/close is noticed)"""
+        clock = time.monotonic()
+        wait = cap
+        with self._lock:
+            for job in self._jobs.values():
+                interval = self.effective_interval(job.name, now)
+                if job.last_run is None:
+                    return 0.0
+                if interval is not None:
+                    wait = min(wait, max(0.0, job.last_run + interval - clock))
+        return wait
+
+    def job_names(self) -> List[str]:
+        return [job.name for job in sorted(self._jobs.values(), key=lambda j: j.priority)]
@@ -0,0 +1,220 @@
+# ---
+# Purpose: Remote data service - dashboard-side reader of a separate collector process (app/collector.py)
+# Contents: RemoteDataService (polls the collector's manifest, downloads only changed frames, same getters as DataService)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import json
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from dataclasses import fields, replace
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.error import URLError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+from data_service import DataSnapshot, DataStatus, SnapshotReader, freeze_value
+from refresh_scheduler import DEFAULT_BASE_INTERVAL, MIN_BASE_INTERVAL
+from snapshot_store import decode_value, frame_from_ipc
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteDataService(SnapshotReader):
+    """
+    Thin reader for dashboards when a collector owns the KIS connection (set KSIF_COLLECTOR_URL).
+    A background thread polls the manifest and republishes a local snapshot whenever the collector's changes,
+    so getters are as cheap as with an in-process DataService and never wait on the network; refresh and
+    settings requests are queued and sent by a second thread.
+    """
+
+    def __init__(self, base_url: str, poll_interval: float = 1.0, timeout: float = 5.0):
+        self.base_url = base_url.rstrip("/")
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+        self._snapshot = DataSnapshot()
+        self._status = DataStatus(state='empty', version=0, last_update=None, refreshing=False,
+                                  connected=False, connection='connecting')
+        self._frames: Dict[str, Tuple[int, pd.DataFrame]] = {}  # frame name -> (token, frozen frame)
+        self._reachable = True
+        self._refresh_interval = DEFAULT_BASE_INTERVAL  # until the first manifest arrives
+
+        # Outgoing requests: (path, JSON payload, future); a pending refresh request is shared
+        self._outbox: "queue.Queue[Optional[Tuple[str, Optional[Dict[str, Any]], Future]]]" = queue.Queue()
+        self._outbox_lock = threading.Lock()
+        self._pending_refresh: Optional[Tuple[bool, Future]] = None  # (force, future)
+
+        self._wakeup = threading.Event()
+        self._shutdown_event = threading.Event()
+        self._poll_thread = threading.Thread(target=self._poll_worker, daemon=True)
+        self._poll_thread.start()
+        self._send_thread = threading.Thread(target=self._send_worker, daemon=True)
+        self._send_thread.start()
+
+    # Transport
+    def _request(self, path: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None) -> bytes:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = Request(f"{self.base_url}{path}", data=data, method=method,
+                          headers={"Content-Type": "application/json"} if data else {})
+        with urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def _request_frame(self, name: str) -> Tuple[int, pd.DataFrame]:
+        """(token, frozen frame) of one snapshot frame - the token the collector sent with these bytes"""
+        with urlopen(Request(f"{self.base_url}/frame/{quote(name)}"), timeout=self.timeout) as response:
+            token = int(response.headers["X-Frame-Token"])
+            return token, freeze_value(frame_from_ipc(response.read()))
+
+    def _request_json(self, path: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None) -> Any:
+        return json.loads(self._request(path, method, payload))
+
+    def _send_worker(self):
+        """POST queued requests in order; each future completes once the collector accepted it"""
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            path, payload, future = item
+            with self._outbox_lock:
+                if self._pending_refresh is not None and self._pending_refresh[1] is future:
+                    self._pending_refresh = None
+            try:
+                future.set_result(self._request_json(path, method="POST", payload=payload))
+            except Exception as e:
+                logger.warning(f"Could not send {path.split('?')[0]} to collector: {e}")
+                future.set_exception(e)
+            self._wakeup.set()
+
+    def _post(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Future:
+        future: Future = Future()
+        self._outbox.put((path, payload, future))
+        return future
+
+    # Polling
+    def _poll_worker(self):
+        while not self._shutdown_event.is_set():
+            self._poll_once()
+            self._wakeup.wait(timeout=self.poll_interval)
+            self._wakeup.clear()
+
+    def _poll_once(self):
+        """Fetch the manifest; if anything changed, download changed frames and publish a new local snapshot"""
+        try:
+            manifest = self._request_json("/manifest")
+        except (URLError, OSError, ValueError) as e:
+            if self._reachable:
+                logger.warning(f"Collector at {self.base_url} unreachable: {e}")
+            self._reachable = False
+            has_data = self._snapshot.positions is not None or self._snapshot.transactions is not None
+            self._status = replace(self._status, state='stale' if has_data else 'empty', refreshing=False,
+                                   connected=False, connection='disconnected')
+            return
+
+        if not self._reachable:
+            logger.info(f"Collector at {self.base_url} reachable again")
+        self._reachable = True
+
+        try:
+            frames = {}
+            changed = set(self._frames) != set(manifest['frames'])
+            for name, token in manifest['frames'].items():
+                known = self._frames.get(name)
+                if known is None or known[0] != token:
+                    # Keep the token served with the bytes: if the frame changed since the manifest,
+                    # it differs from the manifest's and the next poll downloads again
+                    known = self._request_frame(name)
+                    changed = True
+                frames[name] = known
+            self._frames = frames
+
+            if changed or manifest['version'] != self._snapshot.version:
+                self._snapshot = self._build_snapshot(manifest)
+
+            self._refresh_interval = float(manifest.get('refresh_interval', self._refresh_interval))
+            status = decode_value(manifest['status'])
+            self._status = DataStatus(**{field.name: status[field.name] for field in fields(DataStatus)
+                                         if field.name in status})
+        except Exception as e:
+            logger.warning(f"Could not update from collector: {e}")
+
+    def _build_snapshot(self, manifest: Dict[str, Any]) -> DataSnapshot:
+        """Assemble an immutable snapshot from the manifest values and the downloaded frames"""
+        values = {
+            field.name: decode_value(manifest[field.name])
+            for field in fields(DataSnapshot)
+            if field.name in manifest and field.name not in ('pl_data',)
+        }
+        for name in ('positions', 'transactions', 'benchmark_data', 'price_history', 'team_holdings'):
+            values[name] = self._frames[name][1] if name in self._frames else None
+        if manifest.get('pl_data') is not None:
+            values['pl_data'] = {period: self._frames[f"pl_data.{period}"][1] for period in manifest['pl_data']}
+        else:
+            values['pl_data'] = None
+        # Frames are already frozen; plain mappings become read-only like a locally published snapshot
+        return DataSnapshot(**{key: value if isinstance(value, pd.DataFrame) else freeze_value(value)
+                               for key, value in values.items()})
+
+    # Service interface used by the dashboard
+    def get_data_status(self) -> DataStatus:
+        """Freshness as reported by the collector ('disconnected' if it can't be reached)"""
+        return self._status
+
+    def is_refreshing(self) -> bool:
+        return self._status.refreshing
+
+    def _revalidate_missing(self, dataset: str):
+        """The collector refreshes on its own schedule; just poll it sooner"""
+        self._wakeup.set()
+
+    def request_refresh(self, force: bool = False) -> Future:
+        """Queue a refresh request to the collector; the returned future completes once it is accepted"""
+        with self._outbox_lock:
+            pending = self._pending_refresh
+            if pending is not None and (pending[0] or not force):
+                return pending[1]
+            future = self._post(f"/refresh?{urlencode({'force': int(force)})}")
+            self._pending_refresh = (force, future)
+            return future
+
+    def get_last_update(self) -> Optional[datetime]:
+        return self._status.last_update
+
+    def is_connected(self) -> bool:
+        return self._status.connected
+
+    def get_refresh_interval(self) -> float:
+        """Get the collector's base refresh interval in seconds (as of the last manifest)"""
+        return self._refresh_interval
+
+    def set_refresh_interval(self, seconds: float):
+        """Change the collector's base refresh interval (sent in the background); the collector's minimum applies"""
+        if not float(seconds) >= MIN_BASE_INTERVAL:
+            raise ValueError(f"Refresh interval must be at least {MIN_BASE_INTERVAL:.0f}s (got {float(seconds):g}s)")
+        self._refresh_interval = float(seconds)
+        self._post("/settings", {"refresh_interval": float(seconds)})
+
+    def get_refresh_stats(self) -> Dict[str, int]:
+        return self._request_json("/stats")["refresh"]
+
+    def get_startup_timings(self) -> Dict[str, float]:
+        return self._request_json("/stats")["startup"]
+
+    def get_transaction_history(self, start=None, end=None) -> pd.DataFrame:
+        """Query the collector's local transaction history (optionally date-bounded)"""
+        params = {key: value.isoformat() for key, value in (("start", start), ("end", end)) if value is not None}
+        return frame_from_ipc(self._request(f"/transactions?{urlencode(params)}"))
+
+    def shutdown(self):
+        """Stop polling"""
+        self._shutdown_event.set()
+        self._wakeup.set()
+        self._outbox.put(None)
+        for thread in (self._poll_thread, self._send_thread):
+            if thread.is_alive():
+                thread.join(timeout=5)
@@ -0,0 +1,238 @@
+# ---
+# Purpose: Risk analytics - position valuation and portfolio risk on NumPy arrays, updated as prices tick
+# Contents: RiskReport, RiskEngine (weights, volatility, beta vs KOSPI, historical VaR, drawdown, concentration;
+#           per-symbol history moments cached, only symbols whose price or quantity changed are recomputed)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import threading
+import warnings
+from dataclasses import dataclass
+from datetime import date
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+VAR_CONFIDENCE = 0.95
+# Daily closes of the KOSPI line come from this ETF (see benchmark_pipeline.DEFAULT_BENCHMARKS)
+MARKET_PROXY = "226490"
+
+RISK_COLUMNS = ['Symbol', 'Code', 'Account', 'Quantity', 'Price', 'Market_Value', 'Weight',
+                'Volatility', 'Beta', 'VaR', 'Max_Drawdown']
+
+
+@dataclass(frozen=True)
+class RiskReport:
+    """
+    Risk of the current holdings: one row per position (RISK_COLUMNS; Weight, Volatility and Max_Drawdown
+    in %, VaR in ₩ for one day) and portfolio-level figures in `summary`
+    """
+    positions: pd.DataFrame
+    summary: Mapping[str, float]
+
+
+def _empty_summary() -> dict:
+    return {
+        'total_value': 0.0, 'total_pl': 0.0, 'total_pl_percent': 0.0, 'holdings': 0,
+        'volatility': np.nan, 'beta': np.nan, 'var': np.nan, 'var_percent': np.nan,
+        'max_drawdown': np.nan, 'drawdown': np.nan,
+        'hhi': 0.0, 'effective_holdings': 0.0, 'top5_weight': 0.0, 'history_days': 0,
+    }
+
+
+class RiskEngine:
+    """
+    Holds the daily return matrix of every symbol in the price history (days x symbols) with per-symbol
+    moments precomputed once per history. Each update values the positions at their live prices; today's
+    return (live price over the last close) is folded into the cached moments only for symbols whose price
+    or quantity changed, and the portfolio's historical P&L vector is adjusted by those columns alone.
+    """
+
+    def __init__(self, confidence: float = VAR_CONFIDENCE, market: str = MARKET_PROXY):
+        self.confidence = confidence
+        self.market = market
+        self.history: Optional[pd.DataFrame] = None  # the frame the arrays below were built from
+        self._lock = threading.Lock()
+        self._reset(pd.Index([]), np.empty((0, 0)), np.empty(0))
+
+    def _reset(self, codes: pd.Index, closes: np.ndarray, market: np.ndarray):
+        """Rebuild every per-symbol array from a closes matrix (days x codes, NaN where no bar)"""
+        self._codes = codes
+        self._columns = pd.Series(np.arange(len(codes)), index=codes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = closes[1:] / closes[:-1] - 1.0
+            market_returns = market[1:] / market[:-1] - 1.0
+        self._returns = returns
+        self._filled_returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        self._market_returns = market_returns
+
+        valid = np.isfinite(returns)
+        self._count = valid.sum(axis=0)
+        self._sum = np.where(valid, returns, 0.0).sum(axis=0)
+        self._sum_squares = np.where(valid, returns * returns, 0.0).sum(axis=0)
+
+        # Beta uses days on which both the symbol and the market have a return
+        paired = valid & np.isfinite(market_returns)[:, None]
+        m = np.where(paired, market_returns[:, None], 0.0)
+        r = np.where(paired, returns, 0.0)
+        n = paired.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = (r * m).sum(axis=0) / n - r.sum(axis=0) / n * m.sum(axis=0) / n
+            market_variance = (m * m).sum(axis=0) / n - (m.sum(axis=0) / n) ** 2
+            self._beta = np.where(n > 1, covariance / market_variance, np.nan)
+
+        filled = pd.DataFrame(closes).ffill().to_numpy()
+        if len(filled):
+            self._last_close = filled[-1]
+            self._peak = np.fmax.reduce(filled, axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._history_drawdown = np.fmin.reduce(filled / np.fmax.accumulate(filled, axis=0) - 1.0, axis=0)
+        else:
+            self._last_close = self._peak = self._history_drawdown = np.full(len(codes), np.nan)
+
+        # Per-code live state and derived stats (NaN until first valued)
+        self._price = np.full(len(codes), np.nan)
+        self._quantity = np.zeros(len(codes))
+        self._exposure = np.zeros(len(codes))  # quantity x last close: what each day's return applied to
+        self._pnl = np.zeros(len(returns))  # historical daily P&L of today's holdings
+        self._volatility = np.full(len(codes), np.nan)
+        self._var_percent = np.full(len(codes), np.nan)
+        self._drawdown = np.full(len(codes), np.nan)
+
+    def set_history(self, history: Optional[pd.DataFrame], today: Optional[date] = None):
+        """
+        Use a price history (Date plus one daily close column per code, the market proxy included);
+        a bar dated today is dropped because the live price stands in for it
+        """
+        with self._lock:
+            self.history = history
+            if history is None or history.empty:
+                self._reset(pd.Index([]), np.empty((0, 0)), np.empty(0))
+                return
+            today = pd.Timestamp(today or date.today())
+            history = history[pd.to_datetime(history['Date']) < today].sort_values('Date')
+            closes = history.drop(columns='Date')
+            market = closes[self.market] if self.market in closes else pd.Series(np.nan, index=closes.index)
+            self._reset(closes.columns, closes.to_numpy(dtype=float), market.to_numpy(dtype=float))
+
+    def _recompute(self, columns: np.ndarray, prices: np.ndarray):
+        """Fold today's live return into the cached moments of the given history columns"""
+        last = self._last_close[columns]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            live = prices / last - 1.0
+        has_live = np.isfinite(live)
+        live_term = np.where(has_live, live, 0.0)
+        n = self._count[columns] + has_live
+        total = self._sum[columns] + live_term
+        squares = self._sum_squares[columns] + live_term ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (squares - total * total / n) / (n - 1)
+            self._volatility[columns] = np.where(n > 1, np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS), np.nan)
+
+        # Historical VaR: the (1 - confidence) quantile of the symbol's daily returns, live one included
+        sample = np.vstack([self._returns[:, columns], np.where(has_live, live, np.nan)[None, :]])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # symbols without any return yet stay NaN
+            self._var_percent[columns] = -np.nanquantile(sample, 1.0 - self.confidence, axis=0)
+
+        peak = np.fmax(self._peak[columns], prices)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._drawdown[columns] = np.fmin(self._history_drawdown[columns], prices / peak - 1.0)
+
+    def update(self, positions: pd.DataFrame) -> RiskReport:
+        """Value the positions (Code, Quantity, Price, Market_Value, PL, ...) and report their risk"""
+        with self._lock:
+            return self._update(positions)
+
+    def _update(self, positions: pd.DataFrame) -> RiskReport:
+        summary = _empty_summary()
+        if positions is None or positions.empty:
+            return RiskReport(positions=pd.DataFrame(columns=RISK_COLUMNS), summary=summary)
+
+        values = positions['Market_Value'].to_numpy(dtype=float)
+        total_value = values.sum()
+        total_pl = positions['PL'].to_numpy(dtype=float).sum()
+        cost = total_value - total_pl
+        by_code = positions.groupby('Code', sort=False).agg(Quantity=('Quantity', 'sum'), Price=('Price', 'last'),
+                                                            Market_Value=('Market_Value', 'sum'))
+
+        # Symbols in the history whose live price or held quantity moved since the last update
+        columns = self._columns.reindex(by_code.index)
+        covered = columns.notna().to_numpy()
+        columns = columns[covered].to_numpy(dtype=np.intp)
+        prices = by_code['Price'].to_numpy(dtype=float)[covered]
+        quantities = by_code['Quantity'].to_numpy(dtype=float)[covered]
+        held = np.zeros(len(self._codes), dtype=bool)
+        held[columns] = True
+        new_quantity = np.zeros(len(self._codes))
+        new_quantity[columns] = quantities
+        new_price = self._price.copy()
+        new_price[columns] = prices
+        changed = np.flatnonzero((new_quantity != self._quantity) | (held & (new_price != self._price)))
+
+        if len(changed):
+            touched = changed[held[changed]]
+            self._recompute(touched, new_price[touched])
+            exposure = np.nan_to_num(new_quantity[changed] * self._last_close[changed], nan=0.0)
+            self._pnl += self._filled_returns[:, changed] @ (exposure - self._exposure[changed])
+            self._exposure[changed] = exposure
+            self._quantity[changed] = new_quantity[changed]
+            self._price[changed] = np.where(held[changed], new_price[changed], np.nan)
+
+        # Per-position rows: weights over the whole book, stats of the row's symbol
+        position_columns = self._columns.reindex(positions['Code']).to_numpy()
+        known = ~np.isnan(position_columns)
+        index = np.where(known, position_columns, 0).astype(np.intp)
+
+        def per_position(stat: np.ndarray) -> np.ndarray:
+            return np.where(known, stat[index], np.nan) if len(stat) else np.full(len(positions), np.nan)
+
+        weights = values / total_value if total_value else np.zeros(len(values))
+        rows = pd.DataFrame({
+            'Symbol': positions['Symbol'].to_numpy(), 'Code': positions['Code'].to_numpy(),
+            'Account': positions['Account'].to_numpy() if 'Account' in positions else '',
+            'Quantity': positions['Quantity'].to_numpy(), 'Price': positions['Price'].to_numpy(dtype=float),
+            'Market_Value': values, 'Weight': weights * 100.0,
+            'Volatility': per_position(self._volatility) * 100.0, 'Beta': per_position(self._beta),
+            'VaR': per_position(self._var_percent) * values, 'Max_Drawdown': per_position(self._drawdown) * 100.0,
+        }, columns=RISK_COLUMNS)
+
+        # Concentration over symbols (a symbol held in several accounts is one exposure)
+        code_weights = by_code['Market_Value'].to_numpy(dtype=float) / total_value if total_value else np.zeros(0)
+        hhi = float((code_weights ** 2).sum())
+        summary.update({
+            'total_value': float(total_value), 'total_pl': float(total_pl),
+            'total_pl_percent': float(total_pl / cost * 100.0) if cost > 0 else 0.0,
+            'holdings': int(len(by_code)), 'hhi': hhi, 'effective_holdings': 1.0 / hhi if hhi else 0.0,
+            'top5_weight': float(np.sort(code_weights)[::-1][:5].sum() * 100.0),
+            'history_days': int(len(self._returns)),
+        })
+        summary.update(self._portfolio_risk())
+        return RiskReport(positions=rows, summary=summary)
+
+    def _portfolio_risk(self) -> dict:
+        """Volatility, beta, VaR and drawdown of today's holdings replayed over the history plus today"""
+        base = self._exposure.sum()
+        if base <= 0 or len(self._pnl) == 0:
+            return {}
+        live_pnl = np.nansum(self._quantity * (self._price - self._last_close))
+        returns = np.append(self._pnl, live_pnl) / base
+        value = float(np.nansum(self._quantity * self._price))
+
+        market = self._market_returns
+        paired = np.isfinite(market)
+        beta = np.nan
+        if paired.sum() > 1:
+            covariance = np.cov(returns[:-1][paired], market[paired])
+            beta = covariance[0, 1] / covariance[1, 1] if covariance[1, 1] else np.nan
+
+        var_percent = -np.quantile(returns, 1.0 - self.confidence)
+        index = np.cumprod(1.0 + returns)
+        drawdowns = index / np.maximum.accumulate(np.maximum(index, 1.0)) - 1.0
+        return {
+            'volatility': float(returns.std(ddof=1) * np.sqrt(TRADING_DAYS) * 100.0) if len(returns) > 1 else np.nan,
+            'beta': float(beta), 'var_percent': float(var_percent * 100.0), 'var': float(var_percent * value),
+            'max_drawdown': float(min(drawdowns.min(), 0.0) * 100.0), 'drawdown': float(drawdowns[-1] * 100.0),
+        }
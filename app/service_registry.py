@@ -0,0 +1,145 @@
+# ---
+# Purpose: Service registry - one long-lived service per config per process, and one refresher per machine
+# Contents: ServiceRegistry (lock-guarded, kept in sys.modules so Streamlit module reloads reuse it),
+#           process_registry, InterProcessLock (non-blocking file lock used for leader election)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import os
+import sys
+import atexit
+import threading
+import types
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Module name of the holder placed in sys.modules; reloading this file does not replace it
+_HOLDER_NAME = "_ksif_service_registry"
+
+
+class ServiceRegistry:
+    """
+    Process-wide instances keyed by configuration. Creation happens under a lock, so concurrent
+    first requests share one instance instead of each starting its own threads and API sessions.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._instances: Dict[Hashable, Any] = {}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any],
+                      is_current: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the instance for `key`, building it with `factory` if missing. An instance failing
+        `is_current` (e.g. built by a module version that has since been reloaded) is shut down and replaced.
+        """
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is not None and (is_current is None or is_current(instance)):
+                return instance
+            if instance is not None:
+                logger.info(f"Replacing outdated service instance for {key}")
+                self._shutdown(instance)
+            instance = factory()
+            self._instances[key] = instance
+            return instance
+
+    def remove(self, key: Hashable):
+        """Shut down and forget one instance"""
+        with self._lock:
+            instance = self._instances.pop(key, None)
+        if instance is not None:
+            self._shutdown(instance)
+
+    def shutdown_all(self):
+        """Shut down every instance (registered with atexit)"""
+        with self._lock:
+            instances, self._instances = list(self._instances.values()), {}
+        for instance in instances:
+            self._shutdown(instance)
+
+    @staticmethod
+    def _shutdown(instance: Any):
+        shutdown = getattr(instance, "shutdown", None)
+        if shutdown is None:
+            return
+        try:
+            shutdown()
+        except Exception as e:
+            logger.warning(f"Error shutting down {type(instance).__name__}: {e}")
+
+
+def process_registry() -> ServiceRegistry:
+    """The registry shared by every import (and reload) of the modules in this process"""
+    holder = sys.modules.setdefault(_HOLDER_NAME, types.ModuleType(_HOLDER_NAME))
+    registry = holder.__dict__.get("registry")
+    if registry is None:
+        # setdefault on the module dict is atomic, so racing first callers agree on one registry
+        candidate = ServiceRegistry()
+        registry = holder.__dict__.setdefault("registry", candidate)
+        if registry is candidate:
+            atexit.register(registry.shutdown_all)
+    return registry
+
+
+class InterProcessLock:
+    """
+    Non-blocking exclusive lock on a file, held until release() or process exit (the OS drops it
+    if the holder dies, so another process can take over)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Try to take the lock without waiting"""
+        if self._file is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return False
+
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._file = handle
+        return True
+
+    def release(self):
+        """Give the lock up"""
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError as e:
+            logger.debug(f"Could not unlock {self.path}: {e}")
+        finally:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,265 @@
+# ---
+# Purpose: Snapshot store - persists published DataSnapshots so a restarted dashboard starts warm
+# Contents: SnapshotStore (Arrow IPC frame files, JSON manifest swapped atomically, superseded files kept a generation,
+#           coalescing background writer), encode_value/decode_value, frame_to_ipc/frame_from_ipc
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import os
+import json
+import threading
+import time
+import logging
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Set
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    logger.warning("pyarrow not available - snapshots will not be persisted")
+    PYARROW_AVAILABLE = False
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+
+def encode_value(value: Any) -> Any:
+    """JSON-encode plain payloads, tagging datetimes so they round-trip"""
+    if isinstance(value, Mapping):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if hasattr(value, "item"):  # NumPy scalars
+        return value.item()
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of encode_value"""
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+        return {k: decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+def frame_to_ipc(df: pd.DataFrame) -> bytes:
+    """Serialize a frame as an Arrow IPC stream (for sending to another process)"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_from_ipc(data: bytes) -> pd.DataFrame:
+    """Read a frame sent with frame_to_ipc"""
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+
+class SnapshotStore:
+    """
+    Last published snapshot on disk. Each frame is one Arrow IPC file named after the version its dataset
+    last changed at, so a save writes only frames that changed and a reader reloads only those;
+    the manifest is replaced atomically, so a reader never sees a half-written snapshot, and the files of
+    the manifest it replaced stay for one more save, so a reader still loading them isn't cut off.
+    Saves go through a background writer that keeps only the newest snapshot and writes at most
+    once per `min_interval` seconds (streamed ticks republish many times a second).
+    """
+
+    def __init__(self, directory: Path, min_interval: float = 5.0):
+        self.directory = Path(directory)
+        self.min_interval = min_interval
+        self.enabled = PYARROW_AVAILABLE
+
+        self._lock = threading.Lock()
+        self._pending: Optional[Any] = None
+        self._wakeup = threading.Event()
+        self._shutdown_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._last_write = 0.0
+        self._loaded_files: Dict[str, Any] = {}  # field -> frame file(s) of the last load()
+        self._saved_files: Set[str] = set()  # frame files this store wrote and the manifest still references
+
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    # Reading
+    def load(self, changed_only: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read the last saved snapshot as {field: value} plus '_saved_at'; None if nothing usable is on disk.
+        With changed_only, frame fields whose files are the ones the previous load() read are left out.
+        """
+        manifest_path = self.directory / MANIFEST_NAME
+        if not self.enabled or not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("format") != MANIFEST_FORMAT:
+                logger.info(f"Ignoring snapshot with format {manifest.get('format')}")
+                return None
+
+            values: Dict[str, Any] = {"_saved_at": decode_value(manifest["saved_at"])}
+            loaded_files = {}
+            for name, entry in manifest["fields"].items():
+                kind = entry["kind"]
+                if kind in ("frame", "frames"):
+                    files = entry["file"] if kind == "frame" else entry["files"]
+                    loaded_files[name] = files
+                    if changed_only and self._loaded_files.get(name) == files:
+                        continue
+                if kind == "frame":
+                    values[name] = self._read_frame(entry["file"])
+                elif kind == "frames":
+                    values[name] = {key: self._read_frame(file) for key, file in entry["files"].items()}
+                else:
+                    values[name] = decode_value(entry["value"])
+            self._loaded_files = loaded_files
+            return values
+        except Exception as e:
+            logger.warning(f"Could not load snapshot from {self.directory}: {e}")
+            return None
+
+    def saved_version(self) -> int:
+        """Version of the snapshot on disk (0 if none) - cheap enough to poll"""
+        try:
+            manifest = json.loads((self.directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+            return int(manifest["fields"]["version"]["value"] or 0)
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+
+    def _read_frame(self, file: str) -> pd.DataFrame:
+        """Read one Arrow IPC file into a frame (the file is mapped, the columns are copied into pandas)"""
+        source = pa.memory_map(str(self.directory / file), "r")
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+    # Writing
+    def save(self, snapshot: Any):
+        """Write a snapshot dataclass synchronously (frames already on disk at their dataset version are kept)"""
+        if not self.enabled or not is_dataclass(snapshot):
+            return
+        version = getattr(snapshot, "version", 0)
+        dataset_versions = getattr(snapshot, "dataset_versions", None) or {}
+        entries: Dict[str, Any] = {}
+        written = set()
+
+        for field in fields(snapshot):
+            value = getattr(snapshot, field.name)
+            changed_at = dataset_versions.get(field.name, version)
+            if isinstance(value, pd.DataFrame):
+                file = self._write_frame(value, f"{field.name}.v{changed_at}")
+                entries[field.name] = {"kind": "frame", "file": file}
+                written.add(file)
+            elif isinstance(value, Mapping) and value and all(isinstance(v, pd.DataFrame) for v in value.values()):
+                files = {str(key): self._write_frame(df, f"{field.name}.{key}.v{changed_at}")
+                         for key, df in value.items()}
+                entries[field.name] = {"kind": "frames", "files": files}
+                written.update(files.values())
+            else:
+                entries[field.name] = {"kind": "value", "value": encode_value(value)}
+
+        manifest = {"format": MANIFEST_FORMAT, "saved_at": encode_value(datetime.now()), "fields": entries}
+        previous = self._manifest_files()
+        tmp = self.directory / f"{MANIFEST_NAME}.tmp"
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, self.directory / MANIFEST_NAME)
+        self._saved_files = written
+
+        # Frame files referenced by neither this manifest nor the one it replaced are unused now
+        for path in self.directory.glob("*.arrow"):
+            if path.name not in written and path.name not in previous:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.debug(f"Could not remove old snapshot file {path}: {e}")
+
+    def _manifest_files(self) -> Set[str]:
+        """Frame files referenced by the manifest currently on disk"""
+        try:
+            manifest = json.loads((self.directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return set()
+        files = set()
+        for entry in manifest.get("fields", {}).values():
+            if entry.get("kind") == "frame":
+                files.add(entry["file"])
+            elif entry.get("kind") == "frames":
+                files.update(entry["files"].values())
+        return files
+
+    def _write_frame(self, df: pd.DataFrame, stem: str) -> str:
+        """Write one frame file unless this store already saved this dataset version"""
+        file = f"{stem}.arrow"
+        path = self.directory / file
+        if file in self._saved_files:
+            return file
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp = self.directory / f"{file}.tmp"
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+        return file
+
+    def schedule(self, snapshot: Any):
+        """Queue a snapshot for the background writer; an unwritten older one is simply replaced"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending = snapshot
+        self._wakeup.set()
+
+    def flush(self):
+        """Write the queued snapshot now, if any"""
+        with self._lock:
+            snapshot, self._pending = self._pending, None
+        if snapshot is None:
+            return
+        try:
+            self.save(snapshot)
+            self._last_write = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Could not persist snapshot v{getattr(snapshot, 'version', '?')}: {e}")
+
+    def start(self):
+        """Start the background writer"""
+        if self.enabled and (self._worker is None or not self._worker.is_alive()):
+            self._shutdown_event.clear()
+            self._worker = threading.Thread(target=self._write_worker, daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """Stop the background writer, writing whatever is still queued"""
+        self._shutdown_event.set()
+        self._wakeup.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout=5)
+        self.flush()
+
+    def _write_worker(self):
+        while not self._shutdown_event.is_set():
+            self._wakeup.wait()
+            if self._shutdown_event.is_set():
+                break
+            # Rate-limit writes; snapshots published meanwhile coalesce into the pending one
+            delay = self._last_write + self.min_interval - time.monotonic()
+            if delay > 0 and self._shutdown_event.wait(timeout=delay):
+                break
+            self._wakeup.clear()
+            self.flush()
@@ -0,0 +1,199 @@
+# ---
+# Purpose: Symbol master cache - resolves 6-digit KRX codes to display names without per-refresh REST calls
+# Contents: SymbolCache (SQLite-backed, TTL, KRX master preload, batched background resolution of misses,
+#           unresolved codes retried only after a negative-cache TTL)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Resolver receives a batch of codes and returns the names it could resolve
+SymbolResolver = Callable[[List[str]], Dict[str, str]]
+
+# Trailing fixed-width section of each line in the KIS/KRX master files
+# (see KIS open-trading-api samples for kospi_code.mst / kosdaq_code.mst)
+_MASTER_TAIL_LENGTHS = {
+    'kospi': 228,
+    'kosdaq': 222,
+}
+
+
+class SymbolCache:
+    """
+    Persistent code -> name cache shared by every refresh path
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: float = 7 * 24 * 3600,
+                 resolver: Optional[SymbolResolver] = None,
+                 batch_size: int = 20, batch_delay: float = 0.5, negative_ttl_seconds: float = 15 * 60):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._resolver = resolver
+        self._on_resolved: List[Callable[[Dict[str, str]], None]] = []
+
+        self._lock = threading.Lock()
+        self._names: Dict[str, Tuple[str, float]] = {}  # code -> (name, updated_at)
+        self._pending: set = set()
+        self._unresolved: Dict[str, float] = {}  # code -> time its last resolution failed
+        self._wakeup = threading.Event()
+        self._shutdown_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self._init_db()
+        self.load()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        """Create the symbols table if needed"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS symbols ("
+                "code TEXT PRIMARY KEY, name TEXT NOT NULL, market TEXT, updated_at REAL NOT NULL)"
+            )
+
+    def load(self) -> int:
+        """Load every stored symbol into memory"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT code, name, updated_at FROM symbols").fetchall()
+        with self._lock:
+            self._names = {code: (name, updated_at) for code, name, updated_at in rows}
+        logger.info(f"Loaded {len(rows)} symbols from {self.db_path}")
+        return len(rows)
+
+    def set_resolver(self, resolver: SymbolResolver):
+        """Set the callable used to resolve cache misses"""
+        self._resolver = resolver
+
+    def add_listener(self, callback: Callable[[Dict[str, str]], None]):
+        """Register a callback invoked with newly resolved names"""
+        self._on_resolved.append(callback)
+
+    def put_many(self, names: Dict[str, str], market: Optional[str] = None):
+        """Store resolved names in memory and on disk"""
+        if not names:
+            return
+        now = time.time()
+        with self._lock:
+            for code, name in names.items():
+                self._names[code] = (name, now)
+                self._pending.discard(code)
+                self._unresolved.pop(code, None)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO symbols (code, name, market, updated_at) VALUES (?, ?, ?, ?)",
+                [(code, name, market, now) for code, name in names.items()]
+            )
+
+    def get_name(self, code: str) -> str:
+        """Get display name for a code; misses return the code and are queued for background resolution"""
+        return self.get_names([code])[code]
+
+    def get_names(self, codes: Iterable[str]) -> Dict[str, str]:
+        """Get display names for several codes without blocking on the API"""
+        now = time.time()
+        result = {}
+        queued = False
+        with self._lock:
+            for code in codes:
+                entry = self._names.get(code)
+                if entry is None:
+                    result[code] = code
+                else:
+                    result[code] = entry[0]
+                    if now - entry[1] < self.ttl_seconds:
+                        continue
+                # Missing or expired - serve what we have and refresh in the background,
+                # unless the resolver recently failed on it
+                failed_at = self._unresolved.get(code)
+                if failed_at is not None and now - failed_at < self.negative_ttl_seconds:
+                    continue
+                if code not in self._pending:
+                    self._pending.add(code)
+                    queued = True
+        if queued:
+            self._wakeup.set()
+        return result
+
+    def preload_krx_master(self, path: Path, market: Optional[str] = None) -> int:
+        """
+        Bulk-load names from a KIS/KRX master file (kospi_code.mst, kosdaq_code.mst)
+        """
+        path = Path(path)
+        market = market or path.stem.split('_')[0].lower()
+        tail = _MASTER_TAIL_LENGTHS.get(market, _MASTER_TAIL_LENGTHS['kospi'])
+
+        names = {}
+        with open(path, encoding='cp949', errors='replace') as f:
+            for row in f:
+                head = row.rstrip('\r\n')[:-tail]
+                code = head[0:9].rstrip()
+                name = head[21:].strip()
+                if code and name:
+                    names[code] = name
+
+        self.put_many(names, market=market)
+        logger.info(f"Preloaded {len(names)} symbols from {path}")
+        return len(names)
+
+    def start(self):
+        """Start background worker that resolves queued misses in batches"""
+        if self._worker is None or not self._worker.is_alive():
+            self._shutdown_event.clear()
+            self._worker = threading.Thread(target=self._resolve_worker, daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """Stop background worker"""
+        self._shutdown_event.set()
+        self._wakeup.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout=5)
+
+    def _resolve_worker(self):
+        """Drain pending codes in batches through the resolver"""
+        while not self._shutdown_event.is_set():
+            self._wakeup.wait()
+            if self._shutdown_event.is_set():
+                break
+            # Give concurrent lookups a moment to pile into the same batch
+            time.sleep(self.batch_delay)
+
+            with self._lock:
+                batch = sorted(self._pending)[:self.batch_size]
+                if len(batch) == len(self._pending):
+                    self._wakeup.clear()
+            if not batch or self._resolver is None:
+                continue
+
+            try:
+                resolved = self._resolver(batch)
+            except Exception as e:
+                logger.warning(f"Symbol resolution failed for {len(batch)} codes: {e}")
+                resolved = {}
+
+            self.put_many(resolved)
+            failed_at = time.time()
+            with self._lock:
+                # Unresolvable codes are dropped so they don't spin; a lookup re-queues them once the negative TTL passes
+                self._pending.difference_update(batch)
+                self._unresolved.update((code, failed_at) for code in batch if code not in resolved)
+
+            if resolved:
+                for callback in self._on_resolved:
+                    try:
+                        callback(resolved)
+                    except Exception as e:
+                        logger.warning(f"Symbol listener failed: {e}")
@@ -0,0 +1,182 @@
+# ---
+# Purpose: Team attribution - per-team holdings, realized/unrealized P&L and trade counts from attributed fills
+# Contents: AttributionEngine (average-cost ledger per team/account/code; settled days applied once, recent days
+#           replayed each update), team_report (values the ledger at live position prices), TeamReport
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+# A day's fills keep arriving until the next one (same as the portfolio NAV)
+SETTLING_DAYS = 1
+
+HOLDING_COLUMNS = ['Team', 'Account', 'Code', 'Quantity', 'Cost', 'Realized_PL', 'Trades', 'Trades_Today']
+TEAM_POSITION_COLUMNS = ['Team', 'Account', 'Symbol', 'Code', 'Quantity', 'Price', 'Market_Value', 'Cost',
+                         'Unrealized_PL']
+TEAM_SUMMARY_COLUMNS = ['Team', 'Positions', 'Market_Value', 'Unrealized_PL', 'Realized_PL', 'Total_PL',
+                        'Return_Percent', 'Trades', 'Trades_Today']
+
+_Key = Tuple[str, str, str]  # (team, account, code)
+
+
+class AttributionEngine:
+    """
+    Ledger of each team's holdings per account and code, built from fills already stamped with a Team:
+    open quantity, its average cost, realized P&L and trade count. Fills of settled days are applied
+    once and kept; each update replays only the still-settling days on top of them, and a fill arriving
+    late for a settled day rebuilds the ledger. Sells beyond the quantity the ledger knows (bought before
+    the stored history began) realize nothing here - the account's own P&L series covers them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._settled: Dict[_Key, np.ndarray] = {}  # key -> [quantity, cost, realized, trades]
+        self._settled_before: Optional[str] = None  # fills dated before this 'YYYY.MM.DD' are in _settled
+        self._settled_ids: Set[Tuple[str, str, str]] = set()  # (account, date, TX_ID) of the fills in _settled
+        self._first_day: Optional[str] = None
+
+    @staticmethod
+    def _apply(ledger: Dict[_Key, np.ndarray], fills: pd.DataFrame):
+        """Apply fills in time order (average cost method)"""
+        if fills.empty:
+            return
+        fills = fills.sort_values(['Date', 'Time', 'TX_ID'], kind='stable')
+        accounts = fills['Account'] if 'Account' in fills else pd.Series('', index=fills.index)
+        for team, account, code, kind, quantity, price in zip(
+                fills['Team'], accounts, fills['Code'], fills['Type'],
+                fills['Quantity'].to_numpy(dtype=float), fills['Price'].to_numpy(dtype=float)):
+            entry = ledger.get((team, account, code))
+            if entry is None:
+                entry = ledger[(team, account, code)] = np.zeros(4)
+            if kind == 'Sell':
+                sold = min(quantity, entry[0])
+                if sold > 0:
+                    average = entry[1] / entry[0]
+                    entry[2] += sold * (price - average)
+                    entry[1] -= sold * average
+                    entry[0] -= sold
+            else:
+                entry[0] += quantity
+                entry[1] += quantity * price
+            entry[3] += 1
+
+    def update(self, transactions: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+        """Ledger after every fill in `transactions` (Date, Time, TX_ID, Code, Type, Quantity, Price, Team, Account)"""
+        today = today or date.today()
+        with self._lock:
+            if transactions is None or transactions.empty:
+                return pd.DataFrame(columns=HOLDING_COLUMNS)
+            cutoff = (today - timedelta(days=SETTLING_DAYS)).strftime('%Y.%m.%d')
+            dates = transactions['Date'].astype(str)
+            owners = transactions['Account'] if 'Account' in transactions else pd.Series('', index=transactions.index)
+            fill_ids = pd.MultiIndex.from_arrays([owners.astype(str), dates, transactions['TX_ID'].astype(str)])
+            first_day = dates.min()
+            late = (self._settled_before is not None
+                    and not fill_ids[(dates < self._settled_before).to_numpy()].isin(self._settled_ids).all())
+            if self._first_day is None or first_day < self._first_day or late:
+                # Older history (backfill, new account) or a late fill of a settled day appeared: the ledger
+                # restarts so every fill is applied in time order
+                self._settled, self._settled_ids, self._settled_before = {}, set(), None
+                self._first_day = first_day
+
+            newly_settled = dates < cutoff
+            if self._settled_before is not None:
+                newly_settled &= dates >= self._settled_before
+            self._apply(self._settled, transactions[newly_settled])
+            self._settled_ids.update(fill_ids[newly_settled.to_numpy()])
+            self._settled_before = max(cutoff, self._settled_before or cutoff)
+
+            ledger = {key: entry.copy() for key, entry in self._settled.items()}
+            self._apply(ledger, transactions[dates >= self._settled_before])
+
+            today_fills = transactions[dates == today.strftime('%Y.%m.%d')]
+            accounts = today_fills['Account'] if 'Account' in today_fills else ''
+            trades_today = today_fills.groupby([today_fills['Team'], accounts, today_fills['Code']]).size() \
+                if len(today_fills) else pd.Series(dtype=int)
+
+        if not ledger:
+            return pd.DataFrame(columns=HOLDING_COLUMNS)
+        keys = list(ledger)
+        values = np.vstack([ledger[key] for key in keys])
+        holdings = pd.DataFrame({
+            'Team': [key[0] for key in keys], 'Account': [key[1] for key in keys], 'Code': [key[2] for key in keys],
+            'Quantity': values[:, 0], 'Cost': values[:, 1], 'Realized_PL': values[:, 2],
+            'Trades': values[:, 3].astype(np.int64),
+        })
+        holdings['Trades_Today'] = (trades_today.reindex(pd.MultiIndex.from_tuples(keys)).fillna(0)
+                                    .to_numpy(dtype=np.int64))
+        return holdings[HOLDING_COLUMNS]
+
+
+@dataclass(frozen=True)
+class TeamReport:
+    """
+    Precomputed team aggregates: `summary` one row per team (TEAM_SUMMARY_COLUMNS), `positions` each
+    team's open holdings at live prices (TEAM_POSITION_COLUMNS)
+    """
+    teams: List[str]
+    summary: pd.DataFrame
+    positions: pd.DataFrame
+
+
+def team_report(holdings: Optional[pd.DataFrame], positions: Optional[pd.DataFrame],
+                teams: Iterable[str], default_team: str) -> TeamReport:
+    """
+    Value the ledger at the live positions. Each account/code's real quantity is split across the teams
+    that bought it (scaled down if the ledger holds more than the account does); quantity the ledger
+    can't explain goes to the position's own team (its Team column) at the position's average cost.
+    """
+    teams = list(teams)
+    holdings = holdings if holdings is not None else pd.DataFrame(columns=HOLDING_COLUMNS)
+    positions = positions if positions is not None else pd.DataFrame(columns=['Symbol', 'Code', 'Quantity', 'Price',
+                                                                                'Market_Value', 'PL', 'Account'])
+    held = positions.assign(Account=positions['Account'] if 'Account' in positions else '',
+                            Team=positions['Team'] if 'Team' in positions else default_team)
+    held = held.groupby(['Account', 'Code'], sort=False).agg(
+        Symbol=('Symbol', 'first'), Team=('Team', 'first'), Actual=('Quantity', 'sum'), Price=('Price', 'last'),
+        Position_Cost=('Market_Value', 'sum'), PL=('PL', 'sum'))
+    held['Position_Cost'] -= held.pop('PL')
+
+    open_lots = holdings[holdings['Quantity'] > 0]
+    attributed = open_lots.groupby(['Account', 'Code'])['Quantity'].sum()
+    lots = open_lots.join(held[['Symbol', 'Actual', 'Price']], on=['Account', 'Code'])
+    lots['Actual'] = lots['Actual'].fillna(0.0)
+    scale = np.minimum(1.0, lots['Actual'] / attributed.reindex(pd.MultiIndex.from_frame(lots[['Account', 'Code']]))
+                       .to_numpy())
+    lots['Cost'] *= scale
+    lots['Quantity'] *= scale
+
+    residual = held.assign(Quantity=(held['Actual'] - attributed.reindex(held.index).fillna(0.0)).clip(lower=0.0))
+    residual = residual[residual['Quantity'] > 0]
+    residual['Cost'] = residual['Position_Cost'] * residual['Quantity'] / residual['Actual']
+
+    team_positions = pd.concat([lots[lots['Quantity'] > 0], residual.reset_index()], ignore_index=True)
+    team_positions['Market_Value'] = team_positions['Quantity'] * team_positions['Price'].fillna(0.0)
+    team_positions['Unrealized_PL'] = team_positions['Market_Value'] - team_positions['Cost']
+    team_positions = (team_positions.groupby(['Team', 'Account', 'Code'], as_index=False, sort=False)
+                      .agg(Symbol=('Symbol', 'first'), Quantity=('Quantity', 'sum'), Price=('Price', 'last'),
+                           Market_Value=('Market_Value', 'sum'), Cost=('Cost', 'sum'),
+                           Unrealized_PL=('Unrealized_PL', 'sum')))[TEAM_POSITION_COLUMNS]
+
+    names = list(dict.fromkeys([*teams, *team_positions['Team'], *holdings['Team']]))
+    by_team = team_positions.groupby('Team')
+    activity = holdings.groupby('Team')[['Realized_PL', 'Trades', 'Trades_Today']].sum()
+    summary = pd.DataFrame(index=pd.Index(names, name='Team'))
+    summary['Positions'] = by_team['Code'].nunique().reindex(names).fillna(0).astype(np.int64)
+    summary['Market_Value'] = by_team['Market_Value'].sum().reindex(names).fillna(0.0)
+    summary['Unrealized_PL'] = by_team['Unrealized_PL'].sum().reindex(names).fillna(0.0)
+    summary = summary.join(activity.reindex(names).fillna(0))
+    summary['Total_PL'] = summary['Unrealized_PL'] + summary['Realized_PL']
+    cost = by_team['Cost'].sum().reindex(names).fillna(0.0).to_numpy(dtype=float)
+    unrealized = summary['Unrealized_PL'].to_numpy(dtype=float)
+    summary['Return_Percent'] = np.where(cost > 0, unrealized / np.where(cost > 0, cost, 1.0) * 100.0, 0.0)
+    summary[['Trades', 'Trades_Today']] = summary[['Trades', 'Trades_Today']].astype(np.int64)
+    return TeamReport(teams=names, summary=summary.reset_index()[TEAM_SUMMARY_COLUMNS],
+                      positions=team_positions.sort_values(['Team', 'Market_Value'], ascending=[True, False],
+                                                           ignore_index=True))
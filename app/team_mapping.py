@@ -0,0 +1,100 @@
+# ---
+# Purpose: Team mapping - which fund team a trade or holding belongs to, from a teams.json config
+# Contents: TeamMapping (order > account > symbol rules, default team), load_team_mapping (KSIF_TEAMS_FILE)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEAM = "Unassigned"
+TEAM_RULES = ('orders', 'accounts', 'symbols')
+
+
+class TeamMapping:
+    """
+    Team of each trade and holding. Config layout (teams.json):
+
+        {"default": "Unassigned",
+         "teams": {"Team Alpha": {"accounts": ["secret1", "12345678-01"]},
+                   "Team Beta": {"symbols": ["005930", "000660"], "orders": ["0000123456"]}}}
+
+    An order number listed under a team wins, then the account (secret file label or account number),
+    then the symbol code; anything else goes to the default team. A key listed under two teams keeps
+    the first one.
+    """
+
+    def __init__(self, teams: Optional[Mapping[str, Mapping[str, Iterable[str]]]] = None,
+                 default: str = DEFAULT_TEAM):
+        self.default = default
+        self._rules: Dict[str, Dict[str, str]] = {rule: {} for rule in TEAM_RULES}
+        for team, rules in (teams or {}).items():
+            for rule in TEAM_RULES:
+                for key in rules.get(rule, []):
+                    key = self._order_key(key) if rule == 'orders' else str(key)
+                    owner = self._rules[rule].setdefault(key, team)
+                    if owner != team:
+                        logger.warning(f"{rule[:-1].title()} {key} is listed for {owner} and {team}; keeping {owner}")
+        self.teams: Tuple[str, ...] = tuple(teams or ())
+
+    @staticmethod
+    def _order_key(order_number) -> str:
+        """Order numbers as stored (TX_IDs carry a 'TX' prefix, KIS pads with zeros)"""
+        return str(order_number).removeprefix("TX").lstrip("0") or "0"
+
+    def account_team(self, account_keys: Iterable[str]) -> Optional[str]:
+        """Team an account is assigned to, if any (keys: label, account number)"""
+        for key in account_keys:
+            if key and str(key) in self._rules['accounts']:
+                return self._rules['accounts'][str(key)]
+        return None
+
+    def team_for(self, account_keys: Iterable[str], code: str, order_number: Optional[str] = None) -> str:
+        """Team of one trade (with its order number) or holding (without)"""
+        if order_number is not None:
+            team = self._rules['orders'].get(self._order_key(order_number))
+            if team:
+                return team
+        return self.account_team(account_keys) or self._rules['symbols'].get(str(code), self.default)
+
+    def assign(self, frame: pd.DataFrame, account_keys: Iterable[str]) -> pd.Series:
+        """Team of every row of one account's frame (Code, and TX_ID for transactions) - one map per rule"""
+        account = self.account_team(account_keys)
+        if account is not None:
+            teams = pd.Series(account, index=frame.index, dtype=object)
+        else:
+            teams = frame['Code'].astype(str).map(self._rules['symbols']).fillna(self.default)
+        if 'TX_ID' in frame and self._rules['orders']:
+            orders = frame['TX_ID'].map(self._order_key).map(self._rules['orders'])
+            teams = orders.fillna(teams)
+        return teams.astype(object)
+
+    def names(self, seen: Iterable[str] = ()) -> List[str]:
+        """Configured teams in config order, then any other team seen in the data (the default one last)"""
+        names = list(dict.fromkeys([*self.teams, *sorted(set(seen) - set(self.teams) - {self.default})]))
+        if self.default in set(seen) or not names:
+            names.append(self.default)
+        return names
+
+
+def load_team_mapping(path: Union[str, Path, None] = None) -> TeamMapping:
+    """Mapping from KSIF_TEAMS_FILE (default teams.json); without a usable file every trade is the default team's"""
+    path = Path(path or os.getenv("KSIF_TEAMS_FILE", "teams.json"))
+    if not path.exists():
+        logger.info(f"No team mapping at {path}; attributing everything to {DEFAULT_TEAM}")
+        return TeamMapping()
+    try:
+        config = json.loads(path.read_text(encoding="utf-8"))
+        mapping = TeamMapping(config.get('teams', {}), default=config.get('default', DEFAULT_TEAM))
+        logger.info(f"Loaded {len(mapping.teams)} teams from {path}")
+        return mapping
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Could not load team mapping {path}: {e}")
+        return TeamMapping()
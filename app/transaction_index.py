@@ -0,0 +1,139 @@
+# ---
+# Purpose: Transaction index - millisecond filtering over years of fills without scanning the frame
+# Contents: TransactionIndex (date range by binary search on the date-sorted frame, per-team/type sorted row
+#           positions, symbol search over distinct normalized names/codes incl. Hangul initials),
+#           normalize_symbol, hangul_initials
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import re
+import unicodedata
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Initial consonants of precomposed Hangul syllables, in Unicode order (U+AC00 + 588 * index)
+HANGUL_INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+# NFKC turns the jamo users type (ㅅ, U+3145) into conjoining ones (U+1109); compare in that form
+_NORMALIZED_INITIALS = unicodedata.normalize("NFKC", HANGUL_INITIALS)
+_HANGUL_FIRST, _HANGUL_LAST, _INITIAL_SPAN = 0xAC00, 0xD7A3, 588
+
+# Separators users type inconsistently ("SK 하이닉스", "LG-에너지솔루션")
+_SEPARATORS = re.compile(r"[\s\-_.&()]+")
+# KRX short codes are sometimes written with the 'A' prefix (A005930)
+_PREFIXED_CODE = re.compile(r"^a(\d{6})$")
+
+EMPTY_POSITIONS = np.empty(0, dtype=np.intp)
+
+
+def normalize_symbol(text: str) -> str:
+    """Search form of a name, code or query: NFKC (full-width digits/letters), casefolded, no separators"""
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", str(text)).casefold())
+
+
+def hangul_initials(text: str) -> str:
+    """Initial consonants (NFKC form) of the Hangul syllables in text (삼성전자 -> ㅅㅅㅈㅈ); other characters are kept"""
+    return "".join(
+        _NORMALIZED_INITIALS[(ord(c) - _HANGUL_FIRST) // _INITIAL_SPAN] if _HANGUL_FIRST <= ord(c) <= _HANGUL_LAST else c
+        for c in text
+    )
+
+
+def _date_key(value) -> int:
+    """YYYYMMDD integer of a date or a 'YYYY.MM.DD' string"""
+    if isinstance(value, date):
+        return value.year * 10000 + value.month * 100 + value.day
+    return int(str(value).replace(".", "").replace("-", ""))
+
+
+class TransactionIndex:
+    """
+    Read-only index over one published transactions frame, built once and queried on every keystroke.
+    Rows are kept newest first (the dashboard order), so a date range is one contiguous slice found by
+    binary search; team/type filters are sorted row positions clipped to that slice by binary search;
+    symbol search matches the few hundred distinct symbols, not every fill.
+    """
+
+    def __init__(self, transactions: pd.DataFrame):
+        self.source = transactions  # the frame as published, to tell when the index is out of date
+        # Thousands of fills share each date - convert the distinct dates only
+        date_ids, distinct_dates = pd.factorize(transactions['Date'])
+        date_keys = pd.to_numeric(pd.Series(distinct_dates, dtype=str).str.replace(r"\D", "", regex=True),
+                                  errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        dates = np.append(date_keys, 0)[date_ids]  # missing dates (id -1) sort last
+        if len(dates) > 1 and not (dates[:-1] >= dates[1:]).all():
+            order = np.argsort(-dates, kind='stable')
+            transactions, dates = transactions.iloc[order], dates[order]
+        self.frame = transactions
+        # Ascending copy for searchsorted; position i here is row (n - 1 - i) of the frame
+        self._ascending_dates = dates[::-1].copy()
+
+        self._teams = self._positions_by(transactions['Team'])
+        self._types = self._positions_by(transactions['Type'])
+
+        # One entry per distinct code (its name is the same on every row); rows map to it through symbol ids
+        self._symbol_ids, codes = pd.factorize(transactions['Code'], use_na_sentinel=False)
+        # factorize numbers codes in order of appearance, so the running max steps up at each code's first row
+        first_rows = np.flatnonzero(np.diff(np.maximum.accumulate(self._symbol_ids), prepend=-1) > 0)
+        names = transactions['Symbol'].to_numpy()[first_rows]
+        self._symbol_keys: List[str] = [f"{normalize_symbol(name)} {normalize_symbol(code)}"
+                                        for name, code in zip(names, codes)]
+        self._symbol_initials: List[str] = [hangul_initials(normalize_symbol(name)) for name in names]
+
+    @staticmethod
+    def _positions_by(column: pd.Series) -> Dict[str, np.ndarray]:
+        """Ascending row positions per distinct value"""
+        return {str(value): positions for value, positions in column.groupby(column, sort=False).indices.items()}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def teams(self) -> List[str]:
+        """Distinct teams present in the frame"""
+        return sorted(self._teams)
+
+    def date_slice(self, start: Optional[date] = None, end: Optional[date] = None) -> slice:
+        """Row positions (one slice, newest first) of transactions dated start..end inclusive"""
+        n = len(self._ascending_dates)
+        low = 0 if start is None else np.searchsorted(self._ascending_dates, _date_key(start), side='left')
+        high = n if end is None else np.searchsorted(self._ascending_dates, _date_key(end), side='right')
+        return slice(int(n - high), int(n - low))
+
+    def match_symbols(self, term: str) -> np.ndarray:
+        """Ids of distinct symbols whose name or code contains the query (A-prefixed codes and initials too)"""
+        query = normalize_symbol(term)
+        prefixed = _PREFIXED_CODE.match(query)
+        if prefixed:
+            query = prefixed.group(1)
+        if not query:
+            return np.arange(len(self._symbol_keys))
+        keys = self._symbol_initials if all(c in _NORMALIZED_INITIALS for c in query) else self._symbol_keys
+        return np.array([i for i, key in enumerate(keys) if query in key], dtype=np.intp)
+
+    @staticmethod
+    def _clip(positions: np.ndarray, window: slice) -> np.ndarray:
+        """Sorted positions inside a slice, by binary search"""
+        return positions[np.searchsorted(positions, window.start):np.searchsorted(positions, window.stop)]
+
+    def query(self, search: str = "", tx_type: Optional[str] = None, team: Optional[str] = None,
+              start: Optional[date] = None, end: Optional[date] = None) -> np.ndarray:
+        """Ascending row positions of self.frame matching every given filter (None/'' means no filter)"""
+        window = self.date_slice(start, end)
+        candidates = [self._clip(self._types.get(tx_type, EMPTY_POSITIONS), window) if tx_type else None,
+                      self._clip(self._teams.get(team, EMPTY_POSITIONS), window) if team else None]
+        candidates = sorted((c for c in candidates if c is not None), key=len)
+
+        if candidates:
+            positions = candidates[0]
+            for other in candidates[1:]:
+                positions = np.intersect1d(positions, other, assume_unique=True)
+        else:
+            positions = np.arange(window.start, window.stop)
+
+        if search.strip():
+            matched = np.zeros(len(self._symbol_keys), dtype=bool)
+            matched[self.match_symbols(search)] = True
+            positions = positions[matched[self._symbol_ids[positions]]]
+        return positions
@@ -0,0 +1,115 @@
+# ---
+# Purpose: Transaction store - append-only local history of executed orders
+# Contents: TransactionStore (SQLite, keyed by order date + order number, high-water mark for incremental sync)
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import sqlite3
+import threading
+import time
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_COLUMNS = ['Date', 'Time', 'TX_ID', 'Symbol', 'Code', 'Type', 'Quantity', 'Price', 'Total', 'Team']
+
+
+class TransactionStore:
+    """
+    Append-only store of executed orders; rows are upserted (fills grow intraday) but never deleted
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        """Create the transactions table if needed"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS transactions ("
+                "order_date TEXT NOT NULL, order_number TEXT NOT NULL, order_time TEXT NOT NULL, "
+                "code TEXT NOT NULL, type TEXT NOT NULL, quantity INTEGER NOT NULL, price REAL NOT NULL, "
+                "team TEXT, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (order_date, order_number))"
+            )
+
+    def high_water_mark(self) -> Optional[date]:
+        """Date of the newest stored order, or None if the store is empty"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(order_date) FROM transactions").fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def upsert(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge executed orders; each record needs time (datetime), order_number, code, type, quantity, price, team
+        """
+        now = time.time()
+        rows = [
+            (r['time'].strftime('%Y-%m-%d'), str(r['order_number']), r['time'].strftime('%H:%M'),
+             r['code'], r['type'], int(r['quantity']), float(r['price']), r.get('team'), now)
+            for r in records
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO transactions "
+                "(order_date, order_number, order_time, code, type, quantity, price, team, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (order_date, order_number) DO UPDATE SET "
+                "order_time = excluded.order_time, quantity = excluded.quantity, price = excluded.price, "
+                "type = excluded.type, team = excluded.team, updated_at = excluded.updated_at",
+                rows
+            )
+        return len(rows)
+
+    def to_frame(self, names: Optional[Dict[str, str]] = None, start: Optional[date] = None,
+                 end: Optional[date] = None) -> pd.DataFrame:
+        """Full (or date-bounded) history in the dashboard's transaction layout, newest first"""
+        query = "SELECT order_date, order_time, order_number, code, type, quantity, price, team FROM transactions"
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("order_date >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("order_date <= ?")
+            params.append(end.isoformat())
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY order_date DESC, order_time DESC, order_number DESC"
+
+        with self._connect() as conn:
+            raw = pd.read_sql_query(query, conn, params=params)
+
+        if raw.empty:
+            return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+
+        names = names or {}
+        return pd.DataFrame({
+            'Date': raw['order_date'].str.replace('-', '.', regex=False),
+            'Time': raw['order_time'],
+            'TX_ID': 'TX' + raw['order_number'],
+            'Symbol': raw['code'].map(names).fillna(raw['code']),
+            'Code': raw['code'],
+            'Type': raw['type'],
+            'Quantity': raw['quantity'],
+            'Price': raw['price'],
+            'Total': raw['price'] * raw['quantity'],
+            'Team': raw['team'],
+        })[TRANSACTION_COLUMNS]
+
+    def codes(self) -> set:
+        """Distinct symbol codes present in the store"""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT DISTINCT code FROM transactions")}
@@ -0,0 +1,110 @@
+# ---
+# Purpose: Benchmark - DataService getter cost under many concurrent dashboard sessions
+# Contents: Deep-copy getters vs shallow copies over read-only snapshot frames (latency + allocation)
+# Mod Date: 2026-10-17 - Initial implementation
+# Usage: python benchmarks/bench_read_path.py [sessions] [reruns]
+# ---
+
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+from data_service import DataService  # noqa: E402
+
+
+def synthetic_data(n_positions: int = 300, n_transactions: int = 50_000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    codes = [f"{i:06d}" for i in rng.choice(999_999, n_positions, replace=False)]
+    positions = pd.DataFrame({
+        'Symbol': codes, 'Code': codes,
+        'Quantity': rng.integers(1, 1000, n_positions).astype(float),
+        'Price': rng.uniform(1_000, 500_000, n_positions).round(),
+        'Market_Value': rng.uniform(1e5, 1e8, n_positions).round(),
+        'PL': rng.normal(0, 1e6, n_positions).round(),
+        'PL_Percent': rng.normal(0, 10, n_positions),
+    })
+    days = pd.date_range(end='2026-10-16', periods=n_transactions // 20, freq='D').strftime('%Y.%m.%d')
+    tx_codes = rng.choice(codes, n_transactions)
+    transactions = pd.DataFrame({
+        'Date': rng.choice(days, n_transactions), 'Time': '09:00',
+        'TX_ID': [f"TX{i:07d}" for i in range(n_transactions)],
+        'Symbol': tx_codes, 'Code': tx_codes,
+        'Type': rng.choice(['Buy', 'Sell'], n_transactions),
+        'Quantity': rng.integers(1, 100, n_transactions),
+        'Price': rng.uniform(1_000, 500_000, n_transactions).round(),
+        'Total': rng.uniform(1e4, 1e7, n_transactions).round(),
+        'Team': 'Team Alpha',
+    })
+    return positions, transactions
+
+
+def rerun(service: DataService, deep: bool):
+    """One dashboard rerun's worth of getter calls (header, widgets)"""
+    snapshot = service.get_snapshot()
+    for _ in range(2):
+        if deep:
+            snapshot.positions.copy()
+            snapshot.transactions.copy()
+        else:
+            service.get_positions_data()
+            service.get_transactions_data()
+    service.get_balance_data()
+
+
+def run(service: DataService, sessions: int, reruns: int, deep: bool):
+    latencies = []
+    lock = threading.Lock()
+
+    def session():
+        local = []
+        for _ in range(reruns):
+            t0 = time.perf_counter()
+            rerun(service, deep)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    tracemalloc.start()
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = np.array(latencies) * 1000
+    return wall, np.median(latencies), np.percentile(latencies, 99), peak / 2**20
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = DataService(secret_path="__missing__.json", data_dir=data_dir, streaming=False)
+        service.stop_auto_refresh()
+        service.request_refresh().result()  # let background startup finish before seeding the cache
+        positions, transactions = synthetic_data()
+        service._publish({'positions': positions, 'transactions': transactions,
+                          'balance': {'available_cash': 0.0, 'total_assets': 0.0,
+                                      'total_pl': 0.0, 'total_pl_percent': 0.0}})
+
+        print(f"{sessions} sessions x {reruns} reruns, {len(positions)} positions, {len(transactions):,} transactions")
+        print(f"{'read path':>22} {'wall (s)':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'peak alloc (MiB)':>17}")
+        for label, deep in [("deep copy (previous)", True), ("read-only shallow", False)]:
+            wall, p50, p99, peak = run(service, sessions, reruns, deep)
+            print(f"{label:>22} {wall:>9.2f} {p50:>9.3f} {p99:>9.3f} {peak:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+# ---
+# Purpose: Test setup - app modules import each other by bare name, so put app/ on the path
+# Contents: sys.path setup
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
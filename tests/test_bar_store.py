@@ -0,0 +1,102 @@
+# ---
+# Purpose: Tests - memory-mapped bar store
+# Contents: fill, backfill before the stored span, refetch of unsettled bars, one rate-limit token per request,
+#           no descriptors held by idle series
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_store import BarSource, BarStore
+from fetch_engine import FetchEngine
+
+
+class FakeSource(BarSource):
+    """Daily bars with a close per day; `closes` can be edited between fills"""
+
+    def __init__(self, closes, fetcher=None):
+        self.closes = closes
+        self.fetcher = fetcher
+        self.requests = []
+
+    def fetch(self, symbol, interval, start, end):
+        self.requests.append((symbol, start, end))
+        days = [day for day in self.closes if start <= day <= end]
+        values = np.array([self.closes[day] for day in days], dtype=float)
+        return pd.DataFrame({'Time': pd.to_datetime(days), 'Open': values, 'High': values, 'Low': values,
+                             'Close': values, 'Volume': np.ones(len(days))})
+
+
+def business_days(start: datetime, end: datetime):
+    return [day.to_pydatetime() for day in pd.bdate_range(start, end)]
+
+
+def test_fill_fetches_only_missing_days_and_backfills(tmp_path):
+    days = business_days(datetime(2026, 3, 2), datetime(2026, 3, 31))
+    source = FakeSource({day: 100.0 + i for i, day in enumerate(days)})
+    store = BarStore(tmp_path, source)
+    now = datetime(2026, 4, 10, 12, 0)
+
+    assert store.fill(['A'], 'day', datetime(2026, 3, 16), datetime(2026, 3, 31), now=now) == 12
+    assert store.fill(['A'], 'day', datetime(2026, 3, 16), datetime(2026, 3, 31), now=now) == 0
+    assert len(source.requests) == 1
+
+    # An earlier start fetches only the days before the stored span
+    assert store.fill(['A'], 'day', datetime(2026, 3, 2), datetime(2026, 3, 31), now=now) == 10
+    assert source.requests[-1][1:] == (datetime(2026, 3, 2), datetime(2026, 3, 15))
+    bars = store.read('A', 'day', datetime(2026, 3, 2), datetime(2026, 3, 31))
+    assert bars.close.tolist() == [100.0 + i for i in range(len(days))]
+    assert np.array_equal(bars.time, np.array(days, dtype='datetime64[s]'))
+
+    # A reopened store serves the same bars from disk
+    assert BarStore(tmp_path).read('A', 'day').close.tolist() == bars.close.tolist()
+
+
+def test_bar_fetched_mid_session_is_refetched_on_the_next_fill(tmp_path):
+    friday, monday = datetime(2026, 3, 6), datetime(2026, 3, 9)
+    source = FakeSource({datetime(2026, 3, 5): 100.0, friday: 101.0})  # Friday's intraday close
+    store = BarStore(tmp_path, source)
+    store.fill(['A'], 'day', datetime(2026, 3, 5), friday, now=friday.replace(hour=11))
+
+    source.closes[friday] = 105.0  # the real close
+    source.closes[monday] = 106.0
+    store.fill(['A'], 'day', datetime(2026, 3, 5), monday, now=monday.replace(hour=11))
+
+    assert store.read('A', 'day').close.tolist() == [100.0, 105.0, 106.0]
+
+
+def test_fetcher_takes_one_token_per_request(tmp_path):
+    fetcher = FetchEngine(max_workers=2)
+    calls = []
+    call = fetcher.call
+    fetcher.call = lambda fn, *args, **kwargs: calls.append(fn) or call(fn, *args, **kwargs)
+    day = datetime(2026, 3, 2)
+    source = FakeSource({day: 100.0}, fetcher=fetcher)
+    try:
+        BarStore(tmp_path, source).fill(['A', 'B'], 'day', day, day, now=day + timedelta(days=7))
+    finally:
+        fetcher.shutdown()
+
+    assert len(calls) == len(source.requests) == 2
+
+
+def test_series_hold_no_file_descriptors_between_reads(tmp_path):
+    resource = pytest.importorskip("resource")  # POSIX only
+    days = business_days(datetime(2026, 3, 2), datetime(2026, 3, 6))
+    store = BarStore(tmp_path, FakeSource({day: 100.0 for day in days}))
+    symbols = [f"S{i:03d}" for i in range(200)]
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    open_now = len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc/self/fd') else 64
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(open_now + 32, hard), hard))
+    try:
+        assert store.fill(symbols, 'day', days[0], days[-1], now=datetime(2026, 3, 10)) == 5 * len(symbols)
+        bars = [store.read(symbol, 'day') for symbol in symbols]
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert all(b.close.tolist() == [100.0] * 5 for b in bars)
@@ -0,0 +1,100 @@
+# ---
+# Purpose: Tests - portfolio NAV and time-weighted return index
+# Contents: buy at the close, incremental updates vs one full update, float dtype of the stored series
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio_returns import PortfolioReturnEngine
+
+CODE = "005930"
+
+
+def fill(day: date, time: str, kind: str, quantity: float, price: float) -> dict:
+    return {'Date': day.strftime('%Y.%m.%d'), 'Time': time, 'Code': CODE, 'Type': kind,
+            'Quantity': quantity, 'Price': price, 'Total': quantity * price}
+
+
+def positions(quantity: float, price: float) -> pd.DataFrame:
+    return pd.DataFrame({'Code': [CODE], 'Quantity': [quantity], 'Price': [price]})
+
+
+def closes(prices: dict) -> pd.DataFrame:
+    return pd.DataFrame({CODE: list(prices.values())}, index=pd.to_datetime(list(prices)))
+
+
+def test_buy_at_the_close_earns_nothing_that_day(tmp_path):
+    # One share held at 96; a second bought at the close of 110; both sold at 120 -> the stock's 120 / 96
+    day0 = date(2026, 3, 2)
+    day1, day2 = day0 + timedelta(days=1), day0 + timedelta(days=2)
+    transactions = pd.DataFrame([fill(day1, '15:30', 'Buy', 1, 110.0), fill(day2, '15:30', 'Sell', 2, 120.0)])
+    engine = PortfolioReturnEngine(tmp_path / "portfolio.sqlite")
+
+    engine.update(positions(0, 120.0), transactions, closes({day0: 96.0, day1: 110.0, day2: 120.0}),
+                  start=day0, today=day2)
+
+    assert engine.nav()['twr_index'].iloc[-1] == pytest.approx(1.25)
+
+
+def test_buy_at_the_open_earns_the_day(tmp_path):
+    # Nothing held before; bought at the open at 100, closes at 110 -> the day's 10% counts
+    day0 = date(2026, 3, 2)
+    day1 = day0 + timedelta(days=1)
+    transactions = pd.DataFrame([fill(day1, '09:00', 'Buy', 1, 100.0)])
+    engine = PortfolioReturnEngine(tmp_path / "portfolio.sqlite")
+
+    engine.update(positions(1, 110.0), transactions, closes({day0: 100.0, day1: 110.0}), start=day0, today=day1)
+
+    assert engine.nav()['twr_index'].iloc[-1] == pytest.approx(1.1)
+
+
+def test_incremental_updates_match_one_full_update(tmp_path):
+    rng = np.random.default_rng(7)
+    start = date(2026, 1, 5)
+    days = [start + timedelta(days=i) for i in range(40)]
+    prices = dict(zip(days, 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.02, len(days)))))
+
+    held, rows, held_by_day = 10.0, [], {}
+    for day in days[1:]:
+        quantity = float(rng.integers(1, 5))
+        if rng.random() < 0.5:
+            rows.append(fill(day, f"{rng.integers(9, 15):02d}:{rng.integers(0, 60):02d}", 'Buy', quantity,
+                             prices[day]))
+            held += quantity
+        elif held > quantity:
+            rows.append(fill(day, '15:00', 'Sell', quantity, prices[day]))
+            held -= quantity
+        held_by_day[day] = held
+    transactions = pd.DataFrame(rows)
+    all_closes = closes(prices)
+
+    incremental = PortfolioReturnEngine(tmp_path / "incremental.sqlite")
+    for today in days[1:]:
+        known = transactions[transactions['Date'] <= today.strftime('%Y.%m.%d')]
+        incremental.update(positions(held_by_day[today], prices[today]), known,
+                           all_closes[all_closes.index <= pd.Timestamp(today)], start=start, today=today)
+
+    full = PortfolioReturnEngine(tmp_path / "full.sqlite")
+    full.update(positions(held_by_day[days[-1]], prices[days[-1]]), transactions, all_closes,
+                start=start, today=days[-1])
+
+    pd.testing.assert_frame_equal(incremental.nav(), full.nav(), check_freq=False, check_index_type=False)
+    # The series reloaded from disk is the same one
+    pd.testing.assert_frame_equal(PortfolioReturnEngine(tmp_path / "incremental.sqlite").nav(), full.nav(),
+                                  check_freq=False, check_index_type=False)
+
+
+def test_stored_series_is_float(tmp_path):
+    day = date(2026, 3, 2)
+    engine = PortfolioReturnEngine(tmp_path / "portfolio.sqlite")
+    assert (engine.nav().dtypes == float).all()
+
+    engine.update(positions(1, 100.0), pd.DataFrame([fill(day, '10:00', 'Buy', 1, 100.0)]),
+                  closes({day: 100.0}), start=day, today=day)
+
+    assert (engine.nav().dtypes == float).all()
@@ -0,0 +1,81 @@
+# ---
+# Purpose: Tests - position risk analytics
+# Contents: an engine updated tick by tick reports the same risk as a fresh engine on the final positions
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_analytics import MARKET_PROXY, RiskEngine
+
+TODAY = date(2026, 6, 1)
+CODES = ["005930", "000660", "035420", "051910"]
+
+
+def price_history(rng: np.random.Generator) -> pd.DataFrame:
+    days = pd.bdate_range(end=pd.Timestamp(TODAY) - pd.Timedelta(days=1), periods=120)
+    columns = [*CODES, MARKET_PROXY]
+    closes = 1000.0 * np.cumprod(1.0 + rng.normal(0.0, 0.02, (len(days), len(columns))), axis=0)
+    history = pd.DataFrame(closes, columns=columns)
+    history.iloc[:30, 2] = np.nan  # listed later than the others
+    history.insert(0, 'Date', days)
+    return history
+
+
+def positions(quantities: dict, prices: dict, accounts=('A',)) -> pd.DataFrame:
+    rows = []
+    for account in accounts:
+        for code, quantity in quantities.items():
+            if quantity:
+                rows.append({'Symbol': code, 'Code': code, 'Account': account, 'Quantity': quantity,
+                             'Price': prices[code], 'Market_Value': quantity * prices[code],
+                             'PL': quantity * prices[code] * 0.1})
+    return pd.DataFrame(rows)
+
+
+def assert_same_report(actual, expected):
+    pd.testing.assert_frame_equal(actual.positions, expected.positions, rtol=1e-9)
+    assert actual.summary.keys() == expected.summary.keys()
+    for key, value in expected.summary.items():
+        assert actual.summary[key] == pytest.approx(value, rel=1e-9, nan_ok=True), key
+
+
+def test_incremental_updates_match_a_fresh_engine():
+    rng = np.random.default_rng(3)
+    history = price_history(rng)
+    last = history.iloc[-1]
+    quantities = {code: 10.0 for code in CODES}
+    prices = {code: float(last[code]) for code in CODES}
+
+    engine = RiskEngine()
+    engine.set_history(history, today=TODAY)
+    engine.update(positions(quantities, prices))
+    for _ in range(50):
+        code = CODES[rng.integers(len(CODES))]
+        if rng.random() < 0.8:
+            prices[code] *= 1.0 + rng.normal(0.0, 0.01)  # a tick
+        else:
+            quantities[code] = float(rng.integers(0, 20))  # a fill, possibly closing the position
+        incremental = engine.update(positions(quantities, prices, accounts=('A', 'B')))
+
+    fresh = RiskEngine()
+    fresh.set_history(history, today=TODAY)
+    assert_same_report(incremental, fresh.update(positions(quantities, prices, accounts=('A', 'B'))))
+
+
+def test_bar_dated_today_is_replaced_by_the_live_price():
+    rng = np.random.default_rng(5)
+    history = price_history(rng)
+    with_today = pd.concat([history, history.tail(1).assign(Date=pd.Timestamp(TODAY))], ignore_index=True)
+    last = history.iloc[-1]
+    held = positions({code: 5.0 for code in CODES}, {code: float(last[code]) * 1.01 for code in CODES})
+
+    engine, reference = RiskEngine(), RiskEngine()
+    engine.set_history(with_today, today=TODAY)
+    reference.set_history(history, today=TODAY)
+
+    assert_same_report(engine.update(held), reference.update(held))
@@ -0,0 +1,89 @@
+# ---
+# Purpose: Tests - one refresher per machine (KSIF_SHARED_REFRESH)
+# Contents: file lock exclusivity across processes, follower picking up the leader's snapshots and taking over
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from service_registry import InterProcessLock
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+HOLD_LOCK = """
+import sys
+sys.path.insert(0, {app!r})
+from service_registry import InterProcessLock
+lock = InterProcessLock({path!r})
+print('held' if lock.acquire() else 'busy', flush=True)
+sys.stdin.read()
+"""
+
+LEADER = """
+import sys, time
+sys.path.insert(0, {app!r})
+from data_service import DataService
+service = DataService(data_dir={data_dir!r}, shared=True)
+while service._snapshot_store.saved_version() == 0:
+    time.sleep(0.05)
+print(service.get_role(), service.get_data_version(), flush=True)
+sys.stdin.read()
+"""
+
+
+def spawn(script: str, **values) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", script.format(app=str(APP_DIR), **values)],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=APP_DIR)
+
+
+def wait_for(condition, timeout: float = 15.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_lock_is_held_by_one_process_until_it_exits(tmp_path):
+    path = tmp_path / "refresher.lock"
+    holder = spawn(HOLD_LOCK, path=str(path))
+    try:
+        assert holder.stdout.readline().strip() == "held"
+        assert not InterProcessLock(path).acquire()
+    finally:
+        holder.kill()
+        holder.wait()
+    lock = InterProcessLock(path)
+    assert lock.acquire()
+    lock.release()
+
+
+def test_follower_reads_the_leaders_snapshots_and_takes_over(tmp_path):
+    from data_service import DataService
+
+    data_dir = tmp_path / "data"
+    leader = spawn(LEADER, data_dir=str(data_dir))
+    follower = None
+    try:
+        role, version = leader.stdout.readline().split()
+        assert role == "leader"
+
+        follower = DataService(data_dir=str(data_dir), shared=True)
+        assert follower.get_role() == "follower"
+        assert follower.get_data_status().connection == "follower"
+        assert wait_for(lambda: follower.get_snapshot().transactions is not None)
+        assert follower.get_data_version() >= int(version)
+
+        leader.kill()
+        leader.wait()
+        assert wait_for(lambda: follower.get_role() == "leader")
+    finally:
+        if leader.poll() is None:
+            leader.kill()
+            leader.wait()
+        if follower is not None:
+            follower.shutdown()
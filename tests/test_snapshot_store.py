@@ -0,0 +1,66 @@
+# ---
+# Purpose: Tests - snapshot persistence
+# Contents: unchanged frames are neither rewritten nor reloaded, superseded files kept one save, round trip of values
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+from dataclasses import replace
+from types import MappingProxyType
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data_service import DataSnapshot  # noqa: E402
+from snapshot_store import SnapshotStore  # noqa: E402
+
+
+def snapshot(version: int, **changes) -> DataSnapshot:
+    return replace(DataSnapshot(), version=version, **changes)
+
+
+def test_save_writes_and_load_reads_only_changed_frames(tmp_path):
+    transactions = pd.DataFrame({'TX_ID': ['TX1', 'TX2'], 'Quantity': [1.0, 2.0]})
+    first = snapshot(1, transactions=transactions, positions=pd.DataFrame({'Code': ['A'], 'Price': [100.0]}),
+                     balance={'total_assets': 1.0},
+                     dataset_versions=MappingProxyType({'transactions': 1, 'positions': 1, 'balance': 1}))
+    writer, reader = SnapshotStore(tmp_path), SnapshotStore(tmp_path)
+    writer.save(first)
+
+    loaded = reader.load(changed_only=True)
+    pd.testing.assert_frame_equal(loaded['transactions'], transactions)
+    assert loaded['balance'] == {'total_assets': 1.0}
+    transactions_file = tmp_path / "transactions.v1.arrow"
+    written_at = transactions_file.stat().st_mtime_ns
+
+    second = replace(first, version=2, positions=pd.DataFrame({'Code': ['A'], 'Price': [101.0]}),
+                     dataset_versions=MappingProxyType({**first.dataset_versions, 'positions': 2}))
+    writer.save(second)
+
+    assert transactions_file.stat().st_mtime_ns == written_at
+    assert (tmp_path / "positions.v1.arrow").exists()  # a reader may still be loading the previous manifest
+    loaded = reader.load(changed_only=True)
+    assert 'transactions' not in loaded
+    assert loaded['positions']['Price'].tolist() == [101.0]
+    assert loaded['version'] == 2
+
+    # A full load still returns every frame
+    assert 'transactions' in reader.load()
+
+    writer.save(replace(second, version=3, positions=pd.DataFrame({'Code': ['A'], 'Price': [102.0]}),
+                        dataset_versions=MappingProxyType({**second.dataset_versions, 'positions': 3})))
+    assert not (tmp_path / "positions.v1.arrow").exists()
+    assert (tmp_path / "positions.v2.arrow").exists()
+    assert transactions_file.exists()
+
+
+def test_new_store_rewrites_frames_it_did_not_save(tmp_path):
+    positions = pd.DataFrame({'Code': ['A'], 'Price': [100.0]})
+    SnapshotStore(tmp_path).save(snapshot(3, positions=positions, dataset_versions=MappingProxyType({'positions': 3})))
+    # Same name left by an earlier process: a new writer must not trust it
+    replacement = pd.DataFrame({'Code': ['B'], 'Price': [5.0]})
+    SnapshotStore(tmp_path).save(snapshot(3, positions=replacement,
+                                          dataset_versions=MappingProxyType({'positions': 3})))
+
+    assert SnapshotStore(tmp_path).load()['positions']['Code'].tolist() == ['B']
@@ -0,0 +1,55 @@
+# ---
+# Purpose: Tests - symbol name cache
+# Contents: background resolution of misses, unresolved codes retried only after the negative TTL
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+import threading
+import time
+
+from symbol_cache import SymbolCache
+
+
+class FakeResolver:
+    """Knows `names`; records every batch it is asked for"""
+
+    def __init__(self, names):
+        self.names = names
+        self.batches = []
+        self.called = threading.Event()
+
+    def __call__(self, codes):
+        self.batches.append(list(codes))
+        self.called.set()
+        return {code: self.names[code] for code in codes if code in self.names}
+
+
+def resolve(cache: SymbolCache, resolver: FakeResolver, codes):
+    """Look codes up and wait for the worker to finish the batch they queued"""
+    resolver.called.clear()
+    cache.get_names(codes)
+    assert resolver.called.wait(5)
+    for _ in range(500):
+        with cache._lock:
+            if not cache._pending:
+                return
+        time.sleep(0.01)
+
+
+def test_unresolved_codes_are_retried_after_the_negative_ttl(tmp_path):
+    resolver = FakeResolver({'005930': 'Samsung Electronics'})
+    cache = SymbolCache(tmp_path / "symbols.sqlite", resolver=resolver, batch_delay=0, negative_ttl_seconds=3600)
+    cache.start()
+    try:
+        resolve(cache, resolver, ['005930', '999999'])
+        assert cache.get_names(['005930', '999999']) == {'005930': 'Samsung Electronics', '999999': '999999'}
+        assert resolver.batches == [['005930', '999999']]  # the miss is not queued again
+
+        # Once the negative entry expires the code is asked for again
+        cache.negative_ttl_seconds = 0
+        resolver.names['999999'] = 'New Listing'
+        resolve(cache, resolver, ['999999'])
+        assert resolver.batches[-1] == ['999999']
+        assert cache.get_name('999999') == 'New Listing'
+    finally:
+        cache.stop()
@@ -0,0 +1,46 @@
+# ---
+# Purpose: Tests - team attribution ledger
+# Contents: settled days applied once, late fills of a settled day
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+from datetime import date
+
+import pandas as pd
+
+from team_attribution import AttributionEngine
+
+
+def fills(*rows):
+    return pd.DataFrame([dict(zip(['Date', 'Time', 'TX_ID', 'Code', 'Type', 'Quantity', 'Price'], row),
+                              Team='Alpha', Account='A1') for row in rows])
+
+
+def test_settled_days_match_a_fresh_ledger():
+    history = fills(('2026.03.02', '09:00:00', 'TX1', '005930', 'Buy', 10, 100.0),
+                    ('2026.03.03', '09:00:00', 'TX1', '005930', 'Sell', 4, 120.0),
+                    ('2026.03.05', '10:00:00', 'TX2', '005930', 'Buy', 2, 110.0))
+    engine = AttributionEngine()
+    engine.update(history.iloc[:2], today=date(2026, 3, 4))
+    holdings = engine.update(history, today=date(2026, 3, 6))
+
+    expected = AttributionEngine().update(history, today=date(2026, 3, 6))
+    pd.testing.assert_frame_equal(holdings, expected)
+    assert holdings.loc[0, 'Quantity'] == 8 and holdings.loc[0, 'Realized_PL'] == 80.0
+
+
+def test_late_fill_of_a_settled_day_is_applied():
+    early = fills(('2026.03.02', '09:00:00', 'TX1', '005930', 'Buy', 10, 100.0),
+                  ('2026.03.03', '09:00:00', 'TX1', '005930', 'Sell', 5, 120.0))
+    late = fills(('2026.03.02', '14:00:00', 'TX7', '005930', 'Buy', 10, 130.0))
+    engine = AttributionEngine()
+    engine.update(early, today=date(2026, 3, 5))
+
+    # A fill dated before the settled cutoff shows up only now (e.g. a late broker sync)
+    both = pd.concat([early, late], ignore_index=True)
+    holdings = engine.update(both, today=date(2026, 3, 6))
+
+    pd.testing.assert_frame_equal(holdings, AttributionEngine().update(both, today=date(2026, 3, 6)))
+    row = holdings.iloc[0]
+    assert row['Quantity'] == 15 and row['Trades'] == 3
+    assert row['Realized_PL'] == 5 * (120.0 - 115.0)
@@ -0,0 +1,80 @@
+# ---
+# Purpose: Tests - transaction index filters
+# Contents: every filter combination against a plain pandas scan, symbol search forms, unsorted input
+# Mod Date: 2026-10-17 - Initial implementation
+# ---
+
+from datetime import date, timedelta
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from transaction_index import TransactionIndex, hangul_initials, normalize_symbol
+
+SYMBOLS = {"005930": "삼성전자", "000660": "SK하이닉스", "035420": "NAVER", "373220": "LG에너지솔루션"}
+
+
+@pytest.fixture(scope="module")
+def transactions() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    n = 2000
+    days = [date(2025, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 400, n)]
+    codes = rng.choice(list(SYMBOLS), n)
+    frame = pd.DataFrame({
+        'Date': [day.strftime('%Y.%m.%d') for day in days],
+        'Time': [f"{h:02d}:{m:02d}" for h, m in zip(rng.integers(9, 16, n), rng.integers(0, 60, n))],
+        'TX_ID': [f"TX{i}" for i in range(n)],
+        'Symbol': [SYMBOLS[code] for code in codes], 'Code': codes,
+        'Type': rng.choice(['Buy', 'Sell'], n), 'Quantity': rng.integers(1, 100, n),
+        'Team': rng.choice(['Alpha', 'Beta', 'Gamma'], n),
+    })
+    return frame.sort_values(['Date', 'Time'], ascending=False, ignore_index=True)
+
+
+def scan(frame: pd.DataFrame, search: str, tx_type, team, start, end) -> pd.DataFrame:
+    """Reference: the filters as a full scan"""
+    mask = pd.Series(True, index=frame.index)
+    if tx_type:
+        mask &= frame['Type'] == tx_type
+    if team:
+        mask &= frame['Team'] == team
+    if start:
+        mask &= frame['Date'] >= start.strftime('%Y.%m.%d')
+    if end:
+        mask &= frame['Date'] <= end.strftime('%Y.%m.%d')
+    if search:
+        query = normalize_symbol(search)
+        mask &= (frame['Symbol'].map(normalize_symbol).str.contains(query, regex=False)
+                 | frame['Code'].str.contains(query, regex=False))
+    return frame[mask]
+
+
+@pytest.mark.parametrize("search, tx_type, team, window", list(product(
+    ["", "삼성", "naver", "0006"], [None, "Sell"], [None, "Beta", "Nobody"],
+    [(None, None), (date(2025, 3, 1), None), (None, date(2025, 6, 30)), (date(2025, 5, 1), date(2025, 5, 1))])))
+def test_query_matches_a_full_scan(transactions, search, tx_type, team, window):
+    index = TransactionIndex(transactions)
+    rows = index.frame.iloc[index.query(search=search, tx_type=tx_type, team=team, start=window[0], end=window[1])]
+    expected = scan(transactions, search, tx_type, team, *window)
+    assert rows['TX_ID'].tolist() == expected['TX_ID'].tolist()
+
+
+def test_symbol_search_forms(transactions):
+    index = TransactionIndex(transactions)
+    samsung = set(transactions.index[transactions['Code'] == "005930"])
+    for term in ["A005930", "005930", "ㅅㅅㅈㅈ", "삼성 전자", "ＳＫ하이닉스"]:
+        found = set(index.query(search=term))
+        expected = samsung if term != "ＳＫ하이닉스" else set(transactions.index[transactions['Code'] == "000660"])
+        assert found == expected, term
+    assert hangul_initials("삼성전자") == normalize_symbol("ㅅㅅㅈㅈ")
+
+
+def test_unsorted_input_is_served_newest_first(transactions):
+    shuffled = transactions.sample(frac=1.0, random_state=0)
+    index = TransactionIndex(shuffled)
+    assert index.source is shuffled
+    assert index.frame['Date'].is_monotonic_decreasing
+    rows = index.frame.iloc[index.query(team="Alpha", start=date(2025, 2, 1), end=date(2025, 2, 28))]
+    assert set(rows['TX_ID']) == set(scan(transactions, "", None, "Alpha", date(2025, 2, 1), date(2025, 2, 28))['TX_ID'])